@@ -1,18 +1,27 @@
-from utils.gemini_client import get_gemini_client
+from utils.gemini_client import get_gemini_pool
 from google.genai import types
 from utils.config import config
 from models.schemas import Message
-from models.analysis_schema import InterviewAnalysisReport
+from models.analysis_schema import InterviewAnalysisReport, QuestionFeedback, ReportSummary
 from utils.prompts import ANTI_HALLUCINATION_RULES
-from typing import Any
+from utils.model_scheduler import model_scheduler, Priority
+from utils.token_budget import fit_history, record_usage, BudgetedPrompt, estimate_tokens
+from utils.prompt_cache import prompt_cache
+from utils.model_cascade import ModelCascade
+from utils.speech_metrics import compute_speech_metrics, describe_for_prompt, apply_speech_metrics
+from typing import TypeVar
+from pydantic import BaseModel
 import json
-import asyncio
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
 
 
 class FeedbackAgent:
     def __init__(self):
-        self.client = get_gemini_client()
+        self.client = get_gemini_pool()
         self.model = config.FEEDBACK_MODEL
+        self.cascade = ModelCascade.from_config("feedback.report")
+        self.question_cascade = ModelCascade.from_config("feedback.question")
 
         # Groq fallback client (initialized lazily)
         self._groq_client = None
@@ -34,10 +43,12 @@ ANALYSIS FOCUS:
 1. **Technical Content** — Accuracy, depth, and problem-solving approach of what was ACTUALLY said.
 2. **Communication Style** — Clarity, conciseness, confidence, and fluency.
 
-SPEECH PATTERN ANALYSIS (inferred from transcript text):
+SPEECH PATTERN ANALYSIS:
+- pace, filled_pauses_count and long_pauses_count are MEASURED from the recording and given
+  above the transcript. Copy them exactly; do not estimate them. If pace or long_pauses_count
+  is not given, infer it from the text (short, choppy or long, rambling sentences).
 - Repetitions (e.g., "I... I think") indicate stammering.
-- Filler words (e.g., "um", "uh", "like") indicate hesitation.
-- Short, choppy sentences or long, rambling sentences indicate pacing issues.
+- Use the measured filler words and pauses as evidence for clarity, conciseness and confidence.
 
 {ANTI_HALLUCINATION_RULES}
 
@@ -84,25 +95,40 @@ Output MUST be a valid JSON object:
 
 Return ONLY the JSON object. No markdown, no code blocks, no additional text."""
 
-    def _format_history(self, history: list[Message]) -> str:
-        return "\n".join([f"[{msg.role.upper()}]: {msg.content}" for msg in history])
-
-    async def _call_gemini(self, system_prompt: str, formatted_history: str) -> InterviewAnalysisReport:
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=f"{system_prompt}\n\nTRANSCRIPT:\n{formatted_history}",
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=InterviewAnalysisReport,
-                thinking_config=types.ThinkingConfig(thinking_level="low")
-            ),
+    def _format_history(self, history: list[Message], system_prompt: str) -> BudgetedPrompt:
+        return fit_history(
+            "feedback", history,
+            line_format=lambda msg: f"[{msg.role.upper()}]: {msg.content}",
+            fixed_text=system_prompt,
         )
 
-        if hasattr(response, 'parsed') and response.parsed:
-            return response.parsed
-        return InterviewAnalysisReport.model_validate_json(response.text)
+    def _report_contents(self, measured: str, transcript: BudgetedPrompt) -> str:
+        return f"MEASURED SPEECH METRICS:\n{measured}\n\nTRANSCRIPT:\n{transcript.text}"
+
+    async def _call_gemini(self, system_prompt: str, contents: str, transcript: BudgetedPrompt) -> InterviewAnalysisReport:
+        async def call(model: str) -> str:
+            response = await model_scheduler.run(
+                Priority.REPORT,
+                self.client.models.generate_content,
+                model=model,
+                contents=contents,
+                config=types.GenerateContentConfig(
+                    **await prompt_cache.system_kwargs(model, system_prompt),
+                    response_mime_type="application/json",
+                    response_schema=InterviewAnalysisReport,
+                    # thinking_level is Gemini 3 only; older tiers think by default
+                    thinking_config=(
+                        types.ThinkingConfig(thinking_level="low") if model.startswith("gemini-3") else None
+                    ),
+                ),
+            )
+            record_usage("feedback", transcript.estimated_tokens, response)
+            return response.text
 
-    async def _call_groq(self, system_prompt: str, formatted_history: str) -> InterviewAnalysisReport:
+        # Escalates to the next tier (if configured) when the report fails schema validation
+        return await self.cascade.run(call, InterviewAnalysisReport.model_validate_json)
+
+    async def _call_groq(self, system_prompt: str, contents: str, transcript: BudgetedPrompt) -> InterviewAnalysisReport:
         if not self.groq_client:
             raise ValueError("Groq API key not configured.")
 
@@ -111,34 +137,167 @@ Return ONLY the JSON object. No markdown, no code blocks, no additional text."""
                 model=config.GROQ_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"TRANSCRIPT:\n{formatted_history}"}
+                    {"role": "user", "content": contents}
                 ],
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
+            record_usage("feedback", transcript.estimated_tokens, completion)
             return completion.choices[0].message.content
 
-        response_text = await asyncio.to_thread(_sync_groq_call)
+        response_text = await model_scheduler.run(Priority.REPORT, _sync_groq_call)
         return InterviewAnalysisReport.model_validate_json(response_text)
 
     async def generate_detailed_analysis(self, history: list[Message], role: str) -> InterviewAnalysisReport:
         """
         Generate detailed interview analysis.
         Primary: Gemini API | Fallback: Groq API (on rate limit)
+        Timing and filler counts are measured locally and written over the model's values.
         """
         system_prompt = self._build_system_prompt(role)
-        formatted_history = self._format_history(history)
+        speech = compute_speech_metrics(history)
+        measured = describe_for_prompt(speech)
+        transcript = self._format_history(history, system_prompt + measured)
+        contents = self._report_contents(measured, transcript)
+        report = await self._analyze(system_prompt, contents, transcript)
+        return report.model_copy(update={"speech_analysis": apply_speech_metrics(report.speech_analysis, speech)})
 
+    async def _analyze(self, system_prompt: str, contents: str, transcript: BudgetedPrompt) -> InterviewAnalysisReport:
         try:
-            return await self._call_gemini(system_prompt, formatted_history)
+            return await self._call_gemini(system_prompt, contents, transcript)
         except Exception as gemini_error:
             error_str = str(gemini_error).lower()
             is_rate_limit = any(k in error_str for k in ["429", "resource_exhausted", "quota", "rate"])
 
             if is_rate_limit and config.GROQ_API_KEY:
                 try:
-                    return await self._call_groq(system_prompt, formatted_history)
+                    return await self._call_groq(system_prompt, contents, transcript)
                 except Exception as groq_error:
                     raise groq_error
 
             raise gemini_error
+
+    # ---------- Incremental grading (one question at a time, then aggregate) ----------
+
+    def _build_question_prompt(self, role: str) -> str:
+        return f"""You are an expert technical interviewer grading ONE question of a live interview
+for a candidate applying for: {role}.
+
+{ANTI_HALLUCINATION_RULES}
+
+Grade only the candidate's answer to this question. Output MUST be a valid JSON object:
+{{
+    "question_text": "<the question, condensed>",
+    "user_response_summary": "<string — what they ACTUALLY said, verbatim essence>",
+    "score": <0-100>,
+    "feedback": "<string>",
+    "better_response_suggestion": "<string>"
+}}"""
+
+    def _build_aggregate_prompt(self, role: str) -> str:
+        return f"""You are an expert technical interviewer and communication coach.
+Each question of this interview for a candidate applying for: {role} has already been graded.
+Using those grades and the candidate's own words, write the overall assessment.
+
+{ANTI_HALLUCINATION_RULES}
+
+Do not re-grade individual questions; base overall_score and final_verdict on the per-question
+scores and the communication patterns in the candidate's answers. pace, filled_pauses_count and
+long_pauses_count are MEASURED and given with the grades: copy them exactly (infer pace or
+long_pauses_count from the text only if they are not given).
+Output MUST be a valid JSON object matching the schema: overall_score (0-100), summary,
+speech_analysis (pace, clarity, conciseness, stammering_frequency, filled_pauses_count,
+long_pauses_count), content_analysis (technical_accuracy, relevance, problem_solving_skills,
+key_strengths, areas_for_improvement), actionable_tips, and final_verdict
+("Strong Hire", "Hire", "Weak Hire" or "No Hire")."""
+
+    async def _structured_call(
+        self,
+        request_class: str,
+        cascade: ModelCascade,
+        system_prompt: str,
+        contents: str,
+        schema: type[SchemaT],
+    ) -> SchemaT:
+        """Gemini through `cascade`, falling back to Groq on rate limits."""
+        estimated_tokens = estimate_tokens(system_prompt) + estimate_tokens(contents)
+
+        async def call(model: str) -> str:
+            response = await model_scheduler.run(
+                Priority.REPORT,
+                self.client.models.generate_content,
+                model=model,
+                contents=contents,
+                config=types.GenerateContentConfig(
+                    **await prompt_cache.system_kwargs(model, system_prompt),
+                    response_mime_type="application/json",
+                    response_schema=schema,
+                ),
+            )
+            record_usage(request_class, estimated_tokens, response)
+            return response.text
+
+        try:
+            return await cascade.run(call, schema.model_validate_json)
+        except Exception as gemini_error:
+            error_str = str(gemini_error).lower()
+            is_rate_limit = any(k in error_str for k in ["429", "resource_exhausted", "quota", "rate"])
+            if not (is_rate_limit and self.groq_client):
+                raise
+
+            def _sync_groq_call():
+                completion = self.groq_client.chat.completions.create(
+                    model=config.GROQ_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": contents},
+                    ],
+                    temperature=0.3,
+                    response_format={"type": "json_object"},
+                )
+                record_usage(request_class, estimated_tokens, completion)
+                return completion.choices[0].message.content
+
+            return schema.model_validate_json(await model_scheduler.run(Priority.REPORT, _sync_groq_call))
+
+    async def grade_question(self, question: str, answer: str, role: str) -> QuestionFeedback:
+        """Grades a single question/answer pair (run in the background during the interview)."""
+        system_prompt = self._build_question_prompt(role)
+        exchange = fit_history(
+            "question",
+            [Message(role="interviewer", content=question), Message(role="user", content=answer)],
+            line_format=lambda msg: f"[{msg.role.upper()}]: {msg.content}",
+            fixed_text=system_prompt,
+        )
+        return await self._structured_call(
+            "question", self.question_cascade, system_prompt, f"EXCHANGE:\n{exchange.text}", QuestionFeedback
+        )
+
+    async def aggregate_report(
+        self, history: list[Message], role: str, breakdown: list[QuestionFeedback]
+    ) -> InterviewAnalysisReport:
+        """
+        Final report from questions graded during the interview: a small call that only
+        writes the overall assessment; the breakdown is attached as-is.
+        """
+        system_prompt = self._build_aggregate_prompt(role)
+        speech = compute_speech_metrics(history)
+        measured = describe_for_prompt(speech)
+        grades = json.dumps(
+            [{"question": q.question_text, "answer": q.user_response_summary, "score": q.score} for q in breakdown],
+            ensure_ascii=False,
+        )
+        answers = fit_history(
+            "aggregate",
+            [msg for msg in history if msg.role == "user"],
+            line_format=lambda msg: f"- {msg.content}",
+            fixed_text=system_prompt + grades + measured,
+        )
+        summary = await self._structured_call(
+            "aggregate", self.cascade, system_prompt,
+            f"QUESTION GRADES:\n{grades}\n\nMEASURED SPEECH METRICS:\n{measured}\n\n"
+            f"CANDIDATE ANSWERS:\n{answers.text}",
+            ReportSummary,
+        )
+        summary.speech_analysis = apply_speech_metrics(summary.speech_analysis, speech)
+        return InterviewAnalysisReport(**summary.model_dump(), question_breakdown=breakdown)
@@ -1,18 +1,22 @@
-from utils.gemini_client import get_gemini_client
+from utils.gemini_client import get_gemini_pool
 from google.genai import types
 from utils.config import config
 from models.schemas import Message, Feedback
+from utils.model_cascade import ModelCascade
 from utils.prompts import INSTRUCTOR_SYSTEM_PROMPT
+from utils.model_scheduler import model_scheduler, Priority
+from utils.token_budget import fit_history, record_usage, BudgetedPrompt
+from utils.prompt_cache import prompt_cache
 from typing import Optional
 import json
-import asyncio
 
 
 class InstructorAgent:
     def __init__(self):
-        self.client = get_gemini_client()
+        self.client = get_gemini_pool()
         self.model = config.INSTRUCTOR_MODEL
-        
+        self.cascade = ModelCascade.from_config("instructor.coach")
+
         # Groq fallback client
         self._groq_client = None
 
@@ -23,7 +27,7 @@ class InstructorAgent:
             self._groq_client = Groq(api_key=config.GROQ_API_KEY)
         return self._groq_client
 
-    async def _call_groq(self, formatted_history: str) -> Optional[str]:
+    async def _call_groq(self, prompt: BudgetedPrompt) -> Optional[str]:
         if not self.groq_client:
             raise ValueError("Groq API key not configured.")
 
@@ -32,41 +36,53 @@ class InstructorAgent:
                 model=config.GROQ_MODEL,
                 messages=[
                     {"role": "system", "content": f"{INSTRUCTOR_SYSTEM_PROMPT}\n\nRespond ONLY with a valid JSON matching the Feedback schema."},
-                    {"role": "user", "content": formatted_history}
+                    {"role": "user", "content": prompt.text}
                 ],
                 temperature=0.5,
                 response_format={"type": "json_object"}
             )
+            record_usage("instructor", prompt.estimated_tokens, completion)
             return completion.choices[0].message.content
 
-        response_text = await asyncio.to_thread(_sync_groq)
+        response_text = await model_scheduler.run(Priority.INSTRUCTOR, _sync_groq)
         return response_text or None
 
     async def analyze_and_coach(self, history: list[Message]) -> Optional[str]:
         if not history or history[-1].role != "user":
             return None
 
-        formatted_history = "\n".join([f"{msg.role}: {msg.content}" for msg in history])
+        prompt = fit_history(
+            "instructor", history,
+            line_format=lambda msg: f"{msg.role}: {msg.content}",
+            fixed_text=INSTRUCTOR_SYSTEM_PROMPT,
+        )
 
-        try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=formatted_history,
+        async def call(model: str) -> str:
+            response = await model_scheduler.run(
+                Priority.INSTRUCTOR,
+                self.client.models.generate_content,
+                model=model,
+                contents=prompt.text,
                 config=types.GenerateContentConfig(
-                    system_instruction=INSTRUCTOR_SYSTEM_PROMPT,
+                    **await prompt_cache.system_kwargs(model, INSTRUCTOR_SYSTEM_PROMPT),
                     temperature=0.5,
                     response_mime_type="application/json",
                     response_schema=Feedback
                 )
             )
-            return response.text or None
+            record_usage("instructor", prompt.estimated_tokens, response)
+            return response.text
+
+        try:
+            feedback = await self.cascade.run(call, Feedback.model_validate_json)
+            return feedback.model_dump_json()
         except Exception as e:
             error_str = str(e).lower()
             is_rate_limit = any(k in error_str for k in ["429", "resource_exhausted", "quota", "rate"])
 
             if is_rate_limit and config.GROQ_API_KEY:
                 try:
-                    return await self._call_groq(formatted_history)
+                    return await self._call_groq(prompt)
                 except Exception as groq_error:
                     print(f"[InstructorAgent] Groq Fallback Error: {groq_error}")
                     return None
@@ -1,28 +1,64 @@
-from utils.gemini_client import get_gemini_client
+from utils.gemini_client import get_gemini_pool
 from google.genai import types
 from utils.config import config
 from models.schemas import Message
 from utils.prompts import get_interviewer_prompt, build_live_system_instruction, ANTI_HALLUCINATION_RULES
-import asyncio
+from utils.model_scheduler import model_scheduler, Priority
+from utils.metrics import record_latency
+from utils.token_budget import fit_history, record_usage, BudgetedPrompt
+from utils.prompt_cache import prompt_cache
+from utils.resume_index import get_resume_index
+from typing import AsyncIterator
+import re
+import time
+import uuid
+
+# A sentence ends at . ! or ? followed by whitespace ("3.5" stays whole; "e.g. x" does split).
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
 
 
 class InterviewerAgent:
     def __init__(self, scenario: str = "url_shortener", resume_context: str = ""):
-        self.client = get_gemini_client()
+        self.client = get_gemini_pool()
         self.model = config.INTERVIEWER_MODEL
 
         # Groq fallback client
         self._groq_client = None
 
-        if resume_context:
-            self.system_prompt = build_live_system_instruction(
-                role=scenario,
-                resume_text=resume_context,
+        self.scenario = scenario
+        self.resume_context = resume_context
+        # Built once per session and never changed, so a resume-bearing prompt (large enough
+        # to cache) is registered with the provider once; per-turn focus goes in the contents.
+        self.system_prompt = self._build_system_prompt()
+        # Sessions with the same resume share one cache entry; each holds its own reference
+        self._cache_holder = uuid.uuid4().hex
+
+    def _build_system_prompt(self) -> str:
+        if self.resume_context:
+            return build_live_system_instruction(
+                role=self.scenario,
+                resume_text=self.resume_context,
                 persona="friendly",
                 difficulty="medium",
             )
-        else:
-            self.system_prompt = get_interviewer_prompt(scenario)
+        return get_interviewer_prompt(self.scenario)
+
+    def _resume_focus(self, history: list[Message]) -> str:
+        """Resume sections matching what the candidate just talked about, for this turn only."""
+        if not self.resume_context:
+            return ""
+        topic = next((m.content for m in reversed(history) if m.role == "user"), "")
+        sections = get_resume_index(self.resume_context).select(
+            topic=topic, budget_tokens=config.RESUME_FOCUS_TOKEN_BUDGET, matching_only=True,
+        )
+        if not sections:
+            return ""
+        return f"RESUME SECTIONS RELATED TO THE CANDIDATE'S LAST ANSWER:\n{sections}\n\nCONVERSATION:\n"
+
+    async def close(self):
+        """Releases this session's hold on its resume-bearing prefix in the provider cache."""
+        if self.resume_context:
+            await prompt_cache.forget(self.model, self.system_prompt, self._cache_holder)
 
     @property
     def groq_client(self):
@@ -31,7 +67,17 @@ class InterviewerAgent:
             self._groq_client = Groq(api_key=config.GROQ_API_KEY)
         return self._groq_client
 
-    async def _call_groq(self, formatted_history: str) -> str:
+    def _budget_history(self, history: list[Message]) -> BudgetedPrompt:
+        focus = self._resume_focus(history)
+        prompt = fit_history(
+            "interviewer", history,
+            line_format=lambda msg: f"{msg.role}: {msg.content}",
+            fixed_text=self.system_prompt + focus,
+        )
+        prompt.text = focus + prompt.text
+        return prompt
+
+    async def _call_groq(self, prompt: BudgetedPrompt) -> str:
         if not self.groq_client:
             raise ValueError("Groq API key not configured.")
 
@@ -40,27 +86,31 @@ class InterviewerAgent:
                 model=config.GROQ_MODEL,
                 messages=[
                     {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": formatted_history}
+                    {"role": "user", "content": prompt.text}
                 ],
                 temperature=0.7,
             )
+            record_usage("interviewer", prompt.estimated_tokens, completion)
             return completion.choices[0].message.content
 
-        response_text = await asyncio.to_thread(_sync_groq)
+        response_text = await model_scheduler.run(Priority.INTERVIEWER, _sync_groq)
         return response_text or "I apologize, could you repeat that?"
 
     async def generate_response(self, history: list[Message]) -> str:
-        formatted_history = "\n".join([f"{msg.role}: {msg.content}" for msg in history])
+        prompt = self._budget_history(history)
 
         try:
-            response = self.client.models.generate_content(
+            response = await model_scheduler.run(
+                Priority.INTERVIEWER,
+                self.client.models.generate_content,
                 model=self.model,
-                contents=formatted_history,
+                contents=prompt.text,
                 config=types.GenerateContentConfig(
-                    system_instruction=self.system_prompt,
+                    **await prompt_cache.system_kwargs(self.model, self.system_prompt, self._cache_holder),
                     temperature=0.7
                 )
             )
+            record_usage("interviewer", prompt.estimated_tokens, response)
             return response.text or "I apologize, could you repeat that?"
         except Exception as e:
             error_str = str(e).lower()
@@ -68,10 +118,111 @@ class InterviewerAgent:
 
             if is_rate_limit and config.GROQ_API_KEY:
                 try:
-                    return await self._call_groq(formatted_history)
+                    return await self._call_groq(prompt)
                 except Exception as groq_error:
                     print(f"[InterviewerAgent] Groq Fallback Error: {groq_error}")
                     return "I apologize, let's move on to the next topic."
             
             print(f"[InterviewerAgent] Error: {e}")
             return "I apologize, let's move on to the next topic."
+
+    def _stream_groq(self, prompt: BudgetedPrompt):
+        """Blocking iterator over Groq completion deltas (runs on a scheduler thread)."""
+        stream = self.groq_client.chat.completions.create(
+            model=config.GROQ_MODEL,
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": prompt.text}
+            ],
+            temperature=0.7,
+            stream=True,
+        )
+        chunk = None
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+        record_usage("interviewer", prompt.estimated_tokens, chunk)
+
+    def _stream_gemini(self, prompt: BudgetedPrompt, system_kwargs: dict):
+        """Blocking iterator over Gemini completion deltas (runs on a scheduler thread)."""
+        stream = self.client.models.generate_content_stream(
+            model=self.model,
+            contents=prompt.text,
+            config=types.GenerateContentConfig(
+                **system_kwargs,
+                temperature=0.7
+            )
+        )
+        chunk = None
+        for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+        record_usage("interviewer", prompt.estimated_tokens, chunk)
+
+    async def _stream_deltas(self, history: list[Message]) -> AsyncIterator[str]:
+        prompt = self._budget_history(history)
+        started = time.perf_counter()
+        first = True
+        provider = "gemini"
+
+        try:
+            system_kwargs = await prompt_cache.system_kwargs(self.model, self.system_prompt, self._cache_holder)
+            async for delta in model_scheduler.stream(
+                Priority.INTERVIEWER, self._stream_gemini, prompt, system_kwargs
+            ):
+                if first:
+                    record_latency("interviewer.ttft.gemini", (time.perf_counter() - started) * 1000)
+                    first = False
+                yield delta
+        except Exception as e:
+            # Nothing we can do once words have reached the candidate; stop quietly.
+            if not first:
+                print(f"[InterviewerAgent] Stream interrupted: {e}")
+                return
+
+            error_str = str(e).lower()
+            is_rate_limit = any(k in error_str for k in ["429", "resource_exhausted", "quota", "rate"])
+            if not (is_rate_limit and config.GROQ_API_KEY):
+                print(f"[InterviewerAgent] Error: {e}")
+                yield "I apologize, let's move on to the next topic."
+                return
+
+            provider = "groq"
+            try:
+                async for delta in model_scheduler.stream(
+                    Priority.INTERVIEWER, self._stream_groq, prompt
+                ):
+                    if first:
+                        record_latency("interviewer.ttft.groq", (time.perf_counter() - started) * 1000)
+                        first = False
+                    yield delta
+            except Exception as groq_error:
+                print(f"[InterviewerAgent] Groq Fallback Error: {groq_error}")
+                if first:
+                    yield "I apologize, let's move on to the next topic."
+                return
+
+        if first:
+            yield "I apologize, could you repeat that?"
+        record_latency(f"interviewer.stream_total.{provider}", (time.perf_counter() - started) * 1000)
+
+    async def stream_response(self, history: list[Message], by_sentence: bool = False) -> AsyncIterator[str]:
+        """
+        Streaming variant of `generate_response`. Yields raw deltas as they arrive, or
+        whole sentences with `by_sentence=True` (handy for TTS). Time-to-first-token is
+        recorded under `interviewer.ttft.<provider>`.
+        """
+        if not by_sentence:
+            async for delta in self._stream_deltas(history):
+                yield delta
+            return
+
+        buffer = ""
+        async for delta in self._stream_deltas(history):
+            buffer += delta
+            *sentences, buffer = _SENTENCE_END.split(buffer)
+            for sentence in sentences:
+                if sentence.strip():
+                    yield sentence.strip()
+        if buffer.strip():
+            yield buffer.strip()
@@ -1,18 +1,51 @@
-from utils.gemini_client import get_gemini_client
+from utils.gemini_client import get_gemini_pool
 from google.genai import types
 from utils.config import config
+from utils.model_scheduler import model_scheduler, Priority
+from utils.vision_precheck import FramePrecheck
+from utils.frame_normalizer import FrameNormalizer
+from utils.metrics import record_latency
+from utils.token_budget import estimate_tokens, fit_text_tail, record_usage, IMAGE_TOKENS
+from utils.model_cascade import ModelCascade
+from models.schemas import ShadowVerdict
 import json
 import base64
 import asyncio
+import time
+
+# Appended to the frame prompt when the local detector missed the face; often it is there
+_FACE_HINTS = {
+    "no_face": (
+        "\n\nA quick local detector found no face in this frame. If the candidate really is "
+        "out of frame, alert them to get back in view; if they are visible, ignore this."
+    ),
+    "turned_away": (
+        "\n\nA quick local detector saw a face in profile. If the candidate really is turned "
+        "away from the camera, alert them to face it; otherwise ignore this."
+    ),
+}
+
 
 class ShadowAgent:
     def __init__(self):
-        self.client = get_gemini_client()
+        self.client = get_gemini_pool()
         self.model = config.SHADOW_MODEL
 
         # Groq fallback client
         self._groq_client = None
 
+        # Local CPU checks that answer obvious frame conditions without a model call
+        self.precheck = FramePrecheck()
+        # Crop/downscale/re-encode before upload to save bandwidth and image tokens
+        self.normalizer = FrameNormalizer()
+        # A lite model answers first; unsure or malformed verdicts go to the stronger tier
+        self.frame_cascade = ModelCascade.from_config("shadow.frame")
+        self.pacing_cascade = ModelCascade.from_config("shadow.pacing")
+
+    @staticmethod
+    def _parse_verdict(text: str) -> dict:
+        return ShadowVerdict.model_validate_json(text).model_dump()
+
     @property
     def groq_client(self):
         if self._groq_client is None and config.GROQ_API_KEY:
@@ -45,14 +78,17 @@ class ShadowAgent:
                 temperature=0.4,
                 response_format={"type": "json_object"}
             )
+            record_usage("shadow_frame", estimate_tokens(prompt) + IMAGE_TOKENS, completion)
             return completion.choices[0].message.content
 
-        response_text = await asyncio.to_thread(_sync_groq)
+        response_text = await model_scheduler.run(Priority.SHADOW, _sync_groq)
         return json.loads(response_text)
 
     async def analyze_frame_and_context(self, base64_image: str, persona: str = "friendly") -> dict:
         """
         Analyzes a single video frame for non-verbal cues (eye contact, posture, expression).
+        Dark frames and off-centre framing are answered by the local precheck; every
+        other frame reaches the model, told when the local face detector found no face.
         """
         tone_map = {
             "friendly": "Be warm and encouraging, like a supportive mentor.",
@@ -77,21 +113,43 @@ Only return "alert" for CLEAR issues. If they look fine, use "ok" with null mess
 
         try:
             image_bytes = base64.b64decode(base64_image)
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Part(text=prompt),
-                    types.Part(inline_data=types.Blob(
-                        mime_type="image/jpeg",
-                        data=image_bytes
-                    ))
-                ],
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    temperature=0.4,
+
+            face_box = None
+            if config.SHADOW_PRECHECK_ENABLED:
+                precheck = await asyncio.to_thread(self.precheck.check, image_bytes, persona)
+                if precheck["status"] == "alert":
+                    return precheck
+                face_box = precheck.get("face_box")
+                if precheck.get("face_hint"):
+                    prompt += _FACE_HINTS[precheck["face_hint"]]
+
+            if config.SHADOW_FRAME_NORMALIZE_ENABLED:
+                image_bytes = await self.normalizer.normalize(image_bytes, face_box)
+                base64_image = base64.b64encode(image_bytes).decode("ascii")
+
+            async def call(model: str) -> str:
+                started = time.perf_counter()
+                response = await model_scheduler.run(
+                    Priority.SHADOW,
+                    self.client.models.generate_content,
+                    model=model,
+                    contents=[
+                        types.Part(text=prompt),
+                        types.Part(inline_data=types.Blob(
+                            mime_type="image/jpeg",
+                            data=image_bytes
+                        ))
+                    ],
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        temperature=0.4,
+                    )
                 )
-            )
-            return json.loads(response.text)
+                record_latency("shadow.model", (time.perf_counter() - started) * 1000)
+                record_usage("shadow_frame", estimate_tokens(prompt) + IMAGE_TOKENS, response)
+                return response.text
+
+            return await self.frame_cascade.run(call, self._parse_verdict)
         except Exception as e:
             error_str = str(e).lower()
             is_rate_limit = any(k in error_str for k in ["429", "resource_exhausted", "quota", "rate"])
@@ -106,7 +164,7 @@ Only return "alert" for CLEAR issues. If they look fine, use "ok" with null mess
             print(f"[ShadowAgent] Vision error: {e}")
             return {"status": "error"}
 
-    async def _call_groq_pacing(self, prompt: str) -> dict:
+    async def _call_groq_pacing(self, prompt: str, estimated_tokens: int) -> dict:
         if not self.groq_client:
             raise ValueError("Groq API key not configured.")
 
@@ -120,9 +178,10 @@ Only return "alert" for CLEAR issues. If they look fine, use "ok" with null mess
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
+            record_usage("pacing", estimated_tokens, completion)
             return completion.choices[0].message.content
 
-        response_text = await asyncio.to_thread(_sync_groq)
+        response_text = await model_scheduler.run(Priority.SHADOW, _sync_groq)
         return json.loads(response_text)
 
     async def analyze_pacing(self, transcript_chunk: str, persona: str = "friendly") -> dict:
@@ -137,31 +196,40 @@ Only return "alert" for CLEAR issues. If they look fine, use "ok" with null mess
             "roast": "Roast them for boring you to death.",
         }
         tone = tone_map.get(persona, tone_map["friendly"])
+        # Only the most recent speech matters for pacing; keep well inside the budget
+        transcript_chunk = fit_text_tail(transcript_chunk, config.TOKEN_BUDGETS["pacing"] - 150)
 
         prompt = f"""Analyze this spoken transcript segment for rambling.
 Persona: {persona}. Tone: {tone}
 Text: "{transcript_chunk}"
 
 Is the speaker repeating themselves, going off-topic, or using excessive filler words?
-Return JSON: {{"status": "alert"|"ok", "message": "Brief advice in persona tone"}}"""
-
-        try:
-            response = self.client.models.generate_content(
-                model=self.model,
+Return JSON: {{"status": "alert"|"ok", "message": "Brief advice in persona tone", "confidence": 0.0-1.0}}"""
+        estimated_tokens = estimate_tokens(prompt)
+
+        async def call(model: str) -> str:
+            response = await model_scheduler.run(
+                Priority.SHADOW,
+                self.client.models.generate_content,
+                model=model,
                 contents=prompt,
                 config=types.GenerateContentConfig(
                     response_mime_type="application/json",
                     temperature=0.3
                 )
             )
-            return json.loads(response.text)
+            record_usage("pacing", estimated_tokens, response)
+            return response.text
+
+        try:
+            return await self.pacing_cascade.run(call, self._parse_verdict)
         except Exception as e:
             error_str = str(e).lower()
             is_rate_limit = any(k in error_str for k in ["429", "resource_exhausted", "quota", "rate"])
 
             if is_rate_limit and config.GROQ_API_KEY:
                 try:
-                    return await self._call_groq_pacing(prompt)
+                    return await self._call_groq_pacing(prompt, estimated_tokens)
                 except Exception as groq_error:
                     print(f"[ShadowAgent] Groq Pacing Fallback error: {groq_error}")
                     return {"status": "error"}
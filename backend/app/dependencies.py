@@ -1,5 +1,7 @@
 from fastapi import Header, HTTPException
 import os
+import secrets
+from utils.config import config
 
 async def get_api_key(x_api_key: str = Header(...)):
     # Simple check against env var or a hardcoded value for scaffold
@@ -7,3 +9,12 @@ async def get_api_key(x_api_key: str = Header(...)):
     if x_api_key != expected_key:
         raise HTTPException(status_code=403, detail="Invalid API Key")
     return x_api_key
+
+
+async def get_admin_key(x_admin_key: str = Header(...)):
+    # The admin surface does not exist unless a key is configured
+    if not config.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(x_admin_key, config.ADMIN_API_KEY):
+        raise HTTPException(status_code=403, detail="Invalid admin key")
+    return x_admin_key
@@ -1,13 +1,29 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, resume, shadow
-from agents.feedback_agent import FeedbackAgent
-from models.schemas import Message
-from models.analysis_schema import InterviewAnalysisReport
-from typing import List
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+from app.routers import admin, analysis, auth, interview, resume, shadow
+from utils.model_scheduler import model_scheduler
+from utils.metrics import latency_snapshot
+from utils.token_budget import token_ledger
+from utils.prompt_cache import prompt_cache
+from utils.gemini_client import get_gemini_pool
+from utils.model_cascade import cascade_stats
+from app.services.drain import drain_coordinator
+from app.services.report_store import close_report_store
+from app.services.diagnostics import RouteCpuMiddleware
+from utils.config import config
 
-app = FastAPI(title="The Shadow Instructor API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs inside uvicorn's signal capture, so this wraps its SIGTERM handler
+    drain_coordinator.install_signal_handler()
+    yield
+    close_report_store()  # commit any queued report writes
+
+
+app = FastAPI(title="The Shadow Instructor API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,28 +32,53 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if config.ROUTE_CPU_ACCOUNTING:
+    app.add_middleware(RouteCpuMiddleware)
 
 @app.get("/health")
 async def health_check():
+    if drain_coordinator.draining:
+        # Tells the load balancer to stop routing new sessions here
+        return JSONResponse(status_code=503, content={"status": "draining"})
     return {"status": "ok", "phase": "The Spine"}
 
+@app.get("/metrics/model-scheduler")
+async def model_scheduler_metrics():
+    """Queue depth, drops and wait times per model-call priority class."""
+    return model_scheduler.snapshot()
+
+@app.get("/metrics/latency")
+async def latency_metrics():
+    """Rolling latency percentiles (e.g. interviewer time-to-first-token)."""
+    return latency_snapshot()
+
+@app.get("/metrics/tokens")
+async def token_metrics():
+    """Estimated vs provider-reported prompt tokens per request class."""
+    return token_ledger.snapshot()
+
+@app.get("/metrics/prompt-cache")
+async def prompt_cache_metrics():
+    """Provider context-cache hits, creations, renewals and evictions."""
+    return prompt_cache.snapshot()
+
+@app.get("/metrics/gemini-regions")
+async def gemini_region_metrics():
+    """Latency/error EWMA and health per configured Vertex AI location."""
+    try:
+        return get_gemini_pool().snapshot()
+    except ValueError as e:
+        return {"error": str(e)}
+
+@app.get("/metrics/model-cascade")
+async def model_cascade_metrics():
+    """Per cascade and tier: calls, answers accepted, escalations and latency."""
+    return cascade_stats.snapshot()
+
 # Include Routers
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(resume.router, tags=["Resume"])
 app.include_router(shadow.router)
-
-# Feedback Endpoint (To be refactored into a router later if needed)
-class AnalysisRequest(BaseModel):
-    history: List[Message]
-    role: str
-    user_id: str | None = None  # Optional user_id
-
-@app.post("/analyze-interview", response_model=InterviewAnalysisReport)
-async def analyze_interview_endpoint(request: AnalysisRequest):
-    """Triggers a deep-dive analysis of the interview transcript."""
-    agent = FeedbackAgent()
-    try:
-        report = await agent.generate_detailed_analysis(request.history, request.role)
-        return report
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+app.include_router(interview.router)
+app.include_router(analysis.router, tags=["Analysis"])
+app.include_router(admin.router, prefix="/admin/diagnostics", tags=["Admin"])
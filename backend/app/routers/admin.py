@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.dependencies import get_admin_key
+from app.services.diagnostics import route_cpu_stats, sampling_profiler, tracemalloc_capture
+from utils.session_registry import session_registry
+
+router = APIRouter(dependencies=[Depends(get_admin_key)])
+
+
+def _conflict(e: RuntimeError):
+    return HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/sessions")
+async def session_memory():
+    """Bytes held by each live interview/shadow session in this worker."""
+    return session_registry.snapshot()
+
+
+@router.get("/routes")
+async def route_cpu():
+    """Event-loop CPU time per route template since start (or the last reset)."""
+    return route_cpu_stats.snapshot()
+
+
+@router.delete("/routes")
+async def reset_route_cpu():
+    route_cpu_stats.reset()
+    return {"status": "reset"}
+
+
+@router.post("/tracemalloc/start")
+async def start_tracemalloc(
+    frames: int = Query(10, ge=1, le=50),
+    max_duration_s: float = Query(300, gt=0, le=3600),
+):
+    try:
+        tracemalloc_capture.start(frames, max_duration_s)
+    except RuntimeError as e:
+        raise _conflict(e)
+    return {"status": "tracing", "frames": frames, "max_duration_s": max_duration_s}
+
+
+@router.get("/tracemalloc")
+async def tracemalloc_snapshot(limit: int = Query(20, ge=1, le=200)):
+    """Top allocation sites now, and the ones that grew most since the capture started."""
+    try:
+        return tracemalloc_capture.snapshot(limit)
+    except RuntimeError as e:
+        raise _conflict(e)
+
+
+@router.post("/tracemalloc/stop")
+async def stop_tracemalloc(limit: int = Query(20, ge=1, le=200)):
+    try:
+        return tracemalloc_capture.stop(limit)
+    except RuntimeError as e:
+        raise _conflict(e)
+
+
+@router.post("/profiler/start")
+async def start_profiler(
+    interval_ms: float = Query(5, ge=1, le=1000),
+    duration_s: float = Query(30, gt=0, le=600),
+):
+    try:
+        sampling_profiler.start(interval_ms, duration_s)
+    except RuntimeError as e:
+        raise _conflict(e)
+    return {"status": "sampling", "interval_ms": interval_ms, "duration_s": duration_s}
+
+
+@router.get("/profiler")
+async def profiler_report(limit: int = Query(30, ge=1, le=500)):
+    return sampling_profiler.report(limit)
+
+
+@router.post("/profiler/stop")
+async def stop_profiler(limit: int = Query(30, ge=1, le=500)):
+    return sampling_profiler.stop(limit)
@@ -0,0 +1,136 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import List
+import json
+from models.schemas import Message
+from models.analysis_schema import InterviewAnalysisReport
+from app.services.analysis_jobs import analysis_jobs, QueueFullError
+from app.services.report_store import get_report_store
+from app.services.bulk_analysis import bulk_analyzer
+from app.services.incremental_grader import grader_registry
+from app.services.progress_analytics import progress_analytics
+from utils.model_scheduler import current_session
+from utils.config import config
+
+router = APIRouter()
+
+
+class AnalysisRequest(BaseModel):
+    history: List[Message]
+    role: str
+    user_id: str | None = None  # Optional user_id; reports are saved to their history
+    persona: str | None = None
+    # From /ws/interview's "session" event (or the id used with /interview-sessions/{id}/turns):
+    # questions graded during the interview are reused, leaving only a short aggregation step
+    session_id: str | None = None
+
+
+class GradedTurn(BaseModel):
+    question: str
+    answer: str
+    role: str
+
+
+async def _submit(request: AnalysisRequest):
+    current_session.set(request.user_id or "anonymous")
+    try:
+        return await analysis_jobs.submit(
+            request.history, request.role, request.user_id, request.persona, request.session_id
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/analyze-interview", response_model=InterviewAnalysisReport)
+async def analyze_interview_endpoint(request: AnalysisRequest):
+    """Triggers a deep-dive analysis of the interview transcript and waits for it."""
+    job = await analysis_jobs.wait(await _submit(request))
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    return job.result
+
+
+@router.post("/analyze-interview/bulk")
+async def bulk_analyze_endpoint(request: Request):
+    """
+    Body: NDJSON, one `AnalysisRequest` per line. Response: NDJSON, one line per record
+    (`index`, `status`, `result` or `error`) in completion order, then a summary line.
+    """
+    return StreamingResponse(
+        bulk_analyzer.run(request.stream(), AnalysisRequest.model_validate_json),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/interview-sessions/{session_id}/turns", status_code=202)
+async def submit_graded_turn(session_id: str, turn: GradedTurn):
+    """
+    Grades a finished question/answer pair in the background, for clients that run the
+    interview elsewhere (the web client's Live API session). /ws/interview does this itself.
+    """
+    if not config.INCREMENTAL_GRADING_ENABLED:
+        raise HTTPException(status_code=404, detail="Incremental grading is disabled")
+    current_session.set(session_id)
+    grader = grader_registry.get_or_create(session_id, turn.role)
+    grader.submit(turn.question, turn.answer)
+    return {"session_id": session_id, "pending": grader.pending, "graded": grader.graded}
+
+
+@router.post("/analysis-jobs", status_code=202)
+async def submit_analysis_job(request: AnalysisRequest):
+    """Queues an analysis and returns immediately. Retries of the same transcript share one job."""
+    job = await _submit(request)
+    return job.to_dict()
+
+
+@router.get("/analysis-jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    job = analysis_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Analysis job not found or expired")
+    return job.to_dict()
+
+
+@router.get("/analysis-jobs/{job_id}/events")
+async def stream_analysis_job(job_id: str):
+    """Server-Sent Events: the current status now, then the final result when it lands."""
+    job = analysis_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Analysis job not found or expired")
+
+    async def event_stream():
+        yield f"event: status\ndata: {json.dumps({'job_id': job.id, 'status': job.status})}\n\n"
+        await analysis_jobs.wait(job)
+        yield f"event: {job.status}\ndata: {json.dumps(job.to_dict())}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.get("/users/{user_id}/reports")
+async def list_user_reports(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    before: str | None = Query(None, description="`next_cursor` from the previous page"),
+):
+    """A user's past reports, newest first, as lightweight summaries."""
+    try:
+        return await asyncio.to_thread(get_report_store().list_reports, user_id, limit, before)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/users/{user_id}/progress")
+async def get_user_progress(user_id: str, window: int = Query(5, ge=1, le=50)):
+    """Trends, moving averages, cohort percentiles and role/persona breakdowns of a user's reports."""
+    return await asyncio.to_thread(progress_analytics.compute, user_id, window)
+
+
+@router.get("/reports/{report_id}")
+async def get_report(report_id: str):
+    """A stored report with its transcript, loaded without calling the model."""
+    stored = await asyncio.to_thread(get_report_store().get_report, report_id)
+    if not stored:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return stored
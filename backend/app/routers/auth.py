@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from google.auth.transport.requests import Request
 from utils.config import config
-from utils.gemini_client import get_credentials
+from utils.gemini_client import get_credentials, get_gemini_pool
 
 router = APIRouter()
 
@@ -21,7 +21,8 @@ async def get_gemini_token():
             "type": "bearer",
             "expires_in": 3600,
             "project_id": config.GOOGLE_CLOUD_PROJECT,
-            "location": config.GOOGLE_CLOUD_LOCATION
+            # Point direct browser calls at the currently fastest healthy region
+            "location": get_gemini_pool().best_location()
         }
     except Exception as e:
         return {"error": f"Token generation failed: {e}", "token": None}
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import asyncio
+import json
+import uuid
+from agents.interviewer import InterviewerAgent
+from agents.instructor import InstructorAgent
+from app.services.turn_orchestrator import TurnOrchestrator
+from utils.session_manager import SessionManager
+from utils.resume_index import get_resume_index_by_id
+from utils.model_scheduler import model_scheduler, current_session
+from utils.session_registry import session_registry
+from utils.config import config
+from utils.prompts import SCENARIOS
+from app.services.incremental_grader import grader_registry
+
+router = APIRouter()
+instructor_agent = InstructorAgent()
+
+
+@router.websocket("/ws/interview")
+async def interview_websocket(
+    websocket: WebSocket,
+    scenario: str = "url_shortener",
+    stream: bool = True,
+    chunking: str = "token",
+    resume_id: str | None = None,
+    role: str | None = None,
+):
+    """
+    Text interview. Client sends {"type": "user_message", "text": ...}; the server
+    streams {"type": "interviewer_delta"} chunks (tokens, or sentences with
+    chunking=sentence), then the full {"type": "interviewer_message"}, and,
+    independently, {"type": "coaching"}. Pass the `resume_id` from /upload-resume to
+    ground questions in the candidate's resume, and the `role` the candidate is
+    interviewing for so answers are graded against it. The first event is {"type": "session"};
+    send its `session_id` to /analyze-interview to reuse the answers graded meanwhile.
+    """
+    await websocket.accept()
+    session_id = f"interview-{uuid.uuid4().hex}"
+    current_session.set(session_id)
+
+    send_lock = asyncio.Lock()
+
+    async def send(payload: dict):
+        async with send_lock:
+            await websocket.send_json(payload)
+
+    async def send_delta(text: str):
+        await send({"type": "interviewer_delta", "text": text})
+
+    async def send_coaching(feedback: str):
+        try:
+            await send({"type": "coaching", "feedback": json.loads(feedback)})
+        except json.JSONDecodeError:
+            pass
+
+    resume_index = get_resume_index_by_id(resume_id) if resume_id else None
+    if resume_id and not resume_index:
+        print(f"[Interview] Unknown resume_id {resume_id} (uploaded to another worker or evicted)")
+
+    # Answers are graded while the interview runs, so they need the role up front
+    role = role or f"Software Engineer (System Design: {SCENARIOS.get(scenario, scenario)})"
+
+    orchestrator = TurnOrchestrator(
+        session=SessionManager(),
+        interviewer=InterviewerAgent(
+            scenario=scenario,
+            resume_context=resume_index.text if resume_index else "",
+        ),
+        instructor=instructor_agent,
+        on_coaching=send_coaching,
+        grader=grader_registry.get_or_create(session_id, role) if config.INCREMENTAL_GRADING_ENABLED else None,
+    )
+    session_registry.register(session_id, "interview", orchestrator.memory_usage)
+
+    try:
+        await send({"type": "session", "session_id": session_id})
+
+        while True:
+            message = json.loads(await websocket.receive_text())
+
+            if message.get("type") == "user_message" and message.get("text"):
+                reply = await orchestrator.handle_user_message(
+                    message["text"],
+                    on_delta=send_delta if stream else None,
+                    by_sentence=chunking == "sentence",
+                )
+                await send({"type": "interviewer_message", "text": reply})
+
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+    finally:
+        session_registry.unregister(session_id)
+        await orchestrator.close()
+        model_scheduler.forget_session(session_id)
@@ -3,6 +3,7 @@ from pypdf import PdfReader
 import io
 from app.services.resume_service import analyze_resume_with_gemini, analyze_resume_with_groq
 from utils.config import config
+from utils.resume_index import get_resume_index
 
 router = APIRouter()
 
@@ -22,11 +23,16 @@ async def upload_resume(
         else:
             text = content.decode("utf-8")
 
+        # Segment + keyword-index once here so prompt builders only pay a cache lookup
+        index = get_resume_index(text)
+
         return {
             "status": "success",
             "extracted_length": len(text),
             "extracted_text": text,
-            "target_role": role
+            "target_role": role,
+            "resume_id": index.resume_id,
+            "sections": index.section_names()
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -1,15 +1,55 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import asyncio
 import json
+import sys
+import uuid
 from agents.shadow_vision import ShadowAgent
+from utils.frame_sampler import AdaptiveFrameSampler
+from utils.model_scheduler import model_scheduler, current_session
+from app.services.drain import drain_coordinator
+from utils.session_registry import session_registry
 
 router = APIRouter()
 shadow_agent = ShadowAgent()
 
+
+def _frame_interval_control(interval_ms: int) -> dict:
+    return {"type": "control", "action": "set_frame_interval", "interval_ms": interval_ms}
+
+
+@router.get("/metrics/shadow-frames")
+async def shadow_frame_metrics():
+    """Bytes in/out of the frame normalisation stage (latency is under /metrics/latency)."""
+    return shadow_agent.normalizer.stats()
+
+
 @router.websocket("/ws/shadow")
 async def shadow_websocket(websocket: WebSocket, persona: str = "friendly"):
     await websocket.accept()
+    sampler = AdaptiveFrameSampler()
+    session_id = f"shadow-{uuid.uuid4().hex}"
+    current_session.set(session_id)
+    send_lock = asyncio.Lock()
+    # Base64 frame currently being analysed (held until the verdict comes back)
+    in_flight = {"frame": ""}
+
+    async def send(payload: dict):
+        async with send_lock:
+            await websocket.send_json(payload)
 
     try:
+        if drain_coordinator.draining:
+            await send(drain_coordinator.reconnect_hint())
+            await websocket.close(code=1012)  # service restart
+            return
+        drain_coordinator.register_shadow(session_id, send)
+        session_registry.register(session_id, "shadow", lambda: {
+            "frame_in_flight_bytes": sys.getsizeof(in_flight["frame"]) if in_flight["frame"] else 0,
+            "sampler_bytes": sys.getsizeof(sampler.__dict__),
+            "frame_interval_ms": sampler.interval_ms,
+        })
+        await send(_frame_interval_control(sampler.pending_update()))
+
         while True:
             try:
                 data = await websocket.receive_text()
@@ -18,12 +58,17 @@ async def shadow_websocket(websocket: WebSocket, persona: str = "friendly"):
 
             message = json.loads(data)
             response = None
+            if drain_coordinator.draining:
+                continue  # the client has been told to reconnect elsewhere
 
             if message.get("type") == "frame":
                 try:
+                    in_flight["frame"] = message.get("data") or ""
+                    sampler.observe_frame(message.get("data"))
                     analysis = await shadow_agent.analyze_frame_and_context(
                         message.get("data"), persona=persona
                     )
+                    sampler.record_verdict(analysis.get("status"))
                     if analysis.get("status") == "alert":
                         response = {
                             "type": "feedback",
@@ -33,6 +78,8 @@ async def shadow_websocket(websocket: WebSocket, persona: str = "friendly"):
                         }
                 except Exception:
                     pass
+                finally:
+                    in_flight["frame"] = ""
 
             elif message.get("type") == "transcript":
                 try:
@@ -49,7 +96,11 @@ async def shadow_websocket(websocket: WebSocket, persona: str = "friendly"):
                     pass
 
             if response:
-                await websocket.send_json(response)
+                await send(response)
+
+            interval_ms = sampler.pending_update()
+            if interval_ms is not None:
+                await send(_frame_interval_control(interval_ms))
 
     except WebSocketDisconnect:
         pass
@@ -58,3 +109,7 @@ async def shadow_websocket(websocket: WebSocket, persona: str = "friendly"):
             await websocket.close()
         except Exception:
             pass
+    finally:
+        session_registry.unregister(session_id)
+        drain_coordinator.unregister_shadow(session_id)
+        model_scheduler.forget_session(session_id)
@@ -0,0 +1,247 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from models.schemas import Message
+from models.analysis_schema import InterviewAnalysisReport
+from utils.config import config
+from utils.model_scheduler import current_session
+
+# (history, role, session_id) -> report; session_id may be None
+AnalyzeFn = Callable[..., Awaitable[InterviewAnalysisReport]]
+
+
+class QueueFullError(Exception):
+    """Raised when too many analyses are already waiting for a worker."""
+
+
+class AnalysisJob:
+    def __init__(
+        self,
+        key: str,
+        history: list[Message],
+        role: str,
+        user_id: str | None = None,
+        persona: str | None = None,
+        session_id: str | None = None,
+    ):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.history = history
+        self.role = role
+        self.user_id = user_id
+        self.persona = persona
+        self.session_id = session_id
+        # Scheduler fairness session of the submitter; workers outlive any one request's context
+        self.scheduler_session = current_session.get()
+        self.report_id: str | None = None
+        self.status = "queued"  # queued | running | succeeded | failed
+        self.result: InterviewAnalysisReport | None = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "result": self.result.model_dump() if self.result else None,
+            "report_id": self.report_id,
+            "error": self.error,
+        }
+
+
+def transcript_key(history: list[Message], role: str) -> str:
+    """Stable hash of the transcript + role, used to deduplicate identical requests."""
+    payload = json.dumps(
+        {"role": role, "history": [[m.role, m.content] for m in history]},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _default_analyze(
+    history: list[Message], role: str, session_id: str | None = None
+) -> InterviewAnalysisReport:
+    """
+    With a session whose questions were graded during the interview, only the short
+    aggregation call is left; otherwise (or if that fails) the full analysis runs.
+    """
+    from agents.feedback_agent import FeedbackAgent
+    from app.services.incremental_grader import grader_registry
+
+    grader = grader_registry.get(session_id) if session_id else None
+    if grader:
+        try:
+            return await grader.finalize(history, role)
+        except Exception as e:
+            print(f"[AnalysisJobs] Incremental report failed, running full analysis: {e}")
+    return await FeedbackAgent().generate_detailed_analysis(history, role)
+
+
+class AnalysisJobQueue:
+    """
+    Runs interview analyses on a bounded pool of background workers.
+
+    Identical submissions from the same user (same transcript hash) attach to the
+    in-flight or cached job instead of starting a new model call. Finished jobs are kept
+    for `result_ttl_s`; with a store, reports are persisted and reused beyond that, also
+    across users (the reused report is then saved under the new user as well).
+    """
+
+    def __init__(
+        self,
+        analyze: AnalyzeFn = _default_analyze,
+        workers: int = config.ANALYSIS_WORKERS,
+        max_pending: int = config.ANALYSIS_MAX_PENDING,
+        result_ttl_s: float = config.ANALYSIS_RESULT_TTL_S,
+        store=None,
+        store_factory: Callable[[], Any] | None = None,
+    ):
+        self.analyze = analyze
+        self._store = store
+        self._store_factory = store_factory
+        self.workers = max(workers, 1)
+        self.max_pending = max_pending
+        self.result_ttl_s = result_ttl_s
+
+        self._jobs: dict[str, AnalysisJob] = {}
+        self._by_key: dict[tuple[str, str | None], AnalysisJob] = {}  # (transcript hash, user id)
+        self._queue: asyncio.Queue | None = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def store(self):
+        """The report store, opened on first use."""
+        if self._store is None and self._store_factory:
+            self._store = self._store_factory()
+        return self._store
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker_tasks:
+            return
+        # Workers are bound to the loop that first needs them (one per server process).
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def submit(
+        self,
+        history: list[Message],
+        role: str,
+        user_id: str | None = None,
+        persona: str | None = None,
+        session_id: str | None = None,
+    ) -> AnalysisJob:
+        """Returns the job for this transcript, creating and enqueueing it only if needed."""
+        self._purge_expired()
+        key = transcript_key(history, role)
+
+        existing = self._by_key.get((key, user_id))
+        if existing and existing.status != "failed":
+            return existing
+
+        # Registered before the store lookup awaits, so a concurrent identical submit attaches
+        job = AnalysisJob(key, history, role, user_id, persona, session_id)
+        self._jobs[job.id] = job
+        self._by_key[(key, user_id)] = job
+
+        try:
+            store = self.store
+            stored = await asyncio.to_thread(store.find_report_by_hash, key, user_id) if store else None
+        except Exception as e:
+            # A locked or unopenable store must not strand the job: analyse it instead
+            print(f"[AnalysisJobs] Report lookup failed, analysing anyway: {e}")
+            store = stored = None
+        if stored:
+            job.report_id, job.result, owner = stored
+            if owner != user_id:
+                # Another user's report of the same transcript: file a copy under this user
+                try:
+                    job.report_id = store.save_analysis(history, job.result, role, key, user_id, persona)
+                except Exception as e:
+                    print(f"[AnalysisJobs] Could not file reused report for user {user_id}: {e}")
+            job.status = "succeeded"
+            self._finish(job)
+            return job
+
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            job.status, job.error = "failed", "Too many interview analyses in progress, try again shortly."
+            self._finish(job)
+            self._forget(job)
+            raise QueueFullError(job.error)
+        return job
+
+    @staticmethod
+    def _finish(job: AnalysisJob):
+        job.finished_at = time.time()
+        job.history = []  # the transcript is no longer needed once analysed
+        job.done.set()
+
+    def _forget(self, job: AnalysisJob):
+        self._jobs.pop(job.id, None)
+        if self._by_key.get((job.key, job.user_id)) is job:
+            del self._by_key[(job.key, job.user_id)]
+
+    def get(self, job_id: str) -> AnalysisJob | None:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: AnalysisJob, timeout: float | None = None) -> AnalysisJob:
+        await asyncio.wait_for(job.done.wait(), timeout)
+        return job
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            current_session.set(job.scheduler_session)
+            try:
+                job.result = await self.analyze(job.history, job.role, job.session_id)
+                job.status = "succeeded"
+                self._save(job)
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                self._finish(job)
+                self._queue.task_done()
+
+    def _save(self, job: AnalysisJob):
+        """Persists a finished report; the report is still returned if the store fails."""
+        try:
+            if self.store:
+                job.report_id = self.store.save_analysis(
+                    job.history, job.result, job.role, job.key, job.user_id, job.persona
+                )
+        except Exception as e:
+            print(f"[AnalysisJobs] Could not save report: {e}")
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.result_ttl_s
+        expired = [
+            job for job in self._jobs.values()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job in expired:
+            self._forget(job)
+
+
+def _default_store():
+    from app.services.report_store import get_report_store
+    return get_report_store()
+
+
+analysis_jobs = AnalysisJobQueue(store_factory=_default_store)
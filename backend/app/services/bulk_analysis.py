@@ -0,0 +1,200 @@
+"""
+Bulk interview analysis over an NDJSON stream.
+
+Records are read lazily from the request body and analysed by a fixed number of
+workers; results are emitted as NDJSON lines in completion order. Every queue
+between the body reader, the workers and the response is bounded, so a slow
+client throttles the whole pipeline and memory stays flat however long the
+batch is. Model calls are paced to a requests-per-minute limit, and the whole
+batch pauses and retries when the provider reports a rate limit.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Callable
+
+from app.services.analysis_jobs import AnalyzeFn, _default_analyze, analysis_jobs, transcript_key
+from utils.config import config
+from utils.model_scheduler import current_session
+
+_DONE = object()
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    # Narrower than the agents' check: "rate" also matches "generateContent" in ordinary
+    # errors, and a false positive here pauses the whole batch
+    error_str = str(error).lower()
+    return any(k in error_str for k in ["429", "resource_exhausted", "quota"])
+
+
+class RateLimiter:
+    """Spaces calls evenly at `per_minute`; `pause` holds everyone back after a 429."""
+
+    def __init__(self, per_minute: float, clock=time.monotonic, sleep=asyncio.sleep):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = self.clock()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await self.sleep(wait)
+
+    def pause(self, seconds: float):
+        self._next = max(self._next, self.clock() + seconds)
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[bytes | None]:
+    """Splits a byte stream into lines. Yields None for a line over `max_bytes` (skipped)."""
+    buffer = b""
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                break
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+            if skipping:
+                skipping = False
+            elif line.strip():
+                yield line
+        if len(buffer) > max_bytes:
+            if not skipping:
+                yield None
+            skipping = True
+            buffer = b""
+    if buffer.strip() and not skipping:
+        yield buffer
+
+
+class BulkAnalyzer:
+    def __init__(
+        self,
+        analyze: AnalyzeFn = _default_analyze,
+        concurrency: int = config.BULK_ANALYSIS_CONCURRENCY,
+        requests_per_minute: float = config.BULK_ANALYSIS_RPM,
+        max_retries: int = config.BULK_ANALYSIS_MAX_RETRIES,
+        max_record_bytes: int = config.BULK_ANALYSIS_MAX_RECORD_BYTES,
+        retry_backoff_s: float = 5.0,
+        store=None,
+        store_factory: Callable[[], Any] | None = None,
+    ):
+        self.analyze = analyze
+        self.concurrency = max(concurrency, 1)
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.max_record_bytes = max_record_bytes
+        self.retry_backoff_s = retry_backoff_s
+        self._store = store
+        self._store_factory = store_factory
+
+    @property
+    def store(self):
+        """The report store, opened on first use."""
+        if self._store is None and self._store_factory:
+            self._store = self._store_factory()
+        return self._store
+
+    async def run(self, chunks: AsyncIterator[bytes], parse: Callable[[bytes], Any]) -> AsyncIterator[str]:
+        """
+        `parse` turns one line into a record with `history`, `role` and optionally
+        `user_id` / `persona`. Yields one NDJSON line per record, then a summary line.
+        """
+        # All bulk calls share one scheduler session, so interactive users keep their fair share
+        current_session.set("bulk-analysis")
+        limiter = RateLimiter(self.requests_per_minute)
+        inbox: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        outbox: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+
+        async def read():
+            index = 0
+            cancelled = False
+            try:
+                async for line in _iter_lines(chunks, self.max_record_bytes):
+                    await inbox.put((index, line))
+                    index += 1
+            except asyncio.CancelledError:
+                # The response is closing and the workers are cancelled too: nobody would
+                # drain the sentinels, and waiting on a full inbox would never return
+                cancelled = True
+                raise
+            finally:
+                if not cancelled:
+                    for _ in range(self.concurrency):
+                        await inbox.put(_DONE)
+
+        async def work():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    await outbox.put(_DONE)
+                    return
+                index, line = item
+                try:
+                    result = await self._process(index, line, parse, limiter)
+                except Exception as e:
+                    result = {"index": index, "status": "failed", "error": str(e)}
+                await outbox.put(result)
+
+        tasks = [asyncio.create_task(read())] + [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        counts = {"succeeded": 0, "failed": 0}
+        try:
+            finished = 0
+            while finished < self.concurrency:
+                result = await outbox.get()
+                if result is _DONE:
+                    finished += 1
+                    continue
+                counts[result["status"]] += 1
+                yield json.dumps(result) + "\n"
+            # Surface a broken body stream (e.g. client aborted the upload)
+            await tasks[0]
+            yield json.dumps({"done": True, **counts}) + "\n"
+        except Exception as e:
+            yield json.dumps({"done": False, "error": str(e), **counts}) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _process(self, index: int, line: bytes | None, parse, limiter: RateLimiter) -> dict:
+        if line is None:
+            return {"index": index, "status": "failed", "error": f"Record exceeds {self.max_record_bytes} bytes"}
+        try:
+            record = parse(line)
+        except Exception as e:
+            return {"index": index, "status": "failed", "error": f"Invalid record: {e}"}
+
+        key = transcript_key(record.history, record.role)
+        user_id, persona = getattr(record, "user_id", None), getattr(record, "persona", None)
+        store = self.store
+        stored = await asyncio.to_thread(store.find_report_by_hash, key, user_id) if store else None
+        if stored:
+            report_id, report, owner = stored
+            if owner != user_id:
+                report_id = store.save_analysis(record.history, report, record.role, key, user_id, persona)
+            return {"index": index, "status": "succeeded", "report_id": report_id, "result": report.model_dump()}
+
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            try:
+                report = await self.analyze(record.history, record.role)
+                break
+            except Exception as e:
+                if not _is_rate_limit(e) or attempt == self.max_retries:
+                    return {"index": index, "status": "failed", "error": str(e)}
+                limiter.pause(self.retry_backoff_s * 2 ** attempt)
+
+        report_id = None
+        if store:
+            report_id = store.save_analysis(record.history, report, record.role, key, user_id, persona)
+        return {"index": index, "status": "succeeded", "report_id": report_id, "result": report.model_dump()}
+
+
+bulk_analyzer = BulkAnalyzer(store_factory=lambda: analysis_jobs.store)
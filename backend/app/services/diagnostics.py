@@ -0,0 +1,272 @@
+"""
+Runtime diagnostics for the admin surface: per-route CPU accounting and
+on-demand tracemalloc / sampling-profiler captures that can be started and
+stopped without restarting the worker.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+
+class _CpuMeter:
+    """
+    Awaits a coroutine while summing the thread CPU time of each of its steps.
+    Other tasks interleaving on the event loop are not counted; work the handler
+    hands to threads or to separately spawned tasks is not counted either.
+    """
+
+    def __init__(self, coro):
+        self.coro = coro
+        self.cpu_s = 0.0
+
+    def __await__(self):
+        inner = self.coro.__await__()
+        value, error = None, None
+        while True:
+            start = time.thread_time()
+            try:
+                yielded = inner.throw(error) if error is not None else inner.send(value)
+            except StopIteration as stop:
+                self.cpu_s += time.thread_time() - start
+                return stop.value
+            except BaseException:
+                self.cpu_s += time.thread_time() - start
+                raise
+            self.cpu_s += time.thread_time() - start
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class RouteCpuStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[str, dict] = {}
+
+    def record(self, route: str, cpu_s: float, wall_s: float):
+        with self._lock:
+            stats = self._routes.setdefault(route, {"calls": 0, "cpu_s": 0.0, "max_cpu_s": 0.0, "wall_s": 0.0})
+            stats["calls"] += 1
+            stats["cpu_s"] += cpu_s
+            stats["max_cpu_s"] = max(stats["max_cpu_s"], cpu_s)
+            stats["wall_s"] += wall_s
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            routes = [
+                {
+                    "route": route,
+                    "calls": stats["calls"],
+                    "cpu_ms_total": round(stats["cpu_s"] * 1000, 1),
+                    "cpu_ms_avg": round(stats["cpu_s"] * 1000 / stats["calls"], 3),
+                    "cpu_ms_max": round(stats["max_cpu_s"] * 1000, 3),
+                    "wall_ms_avg": round(stats["wall_s"] * 1000 / stats["calls"], 1),
+                }
+                for route, stats in self._routes.items()
+            ]
+        return sorted(routes, key=lambda r: r["cpu_ms_total"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_cpu_stats = RouteCpuStats()
+
+
+class RouteCpuMiddleware:
+    """ASGI middleware: event-loop CPU time per route template (websockets included)."""
+
+    def __init__(self, app, stats: RouteCpuStats = route_cpu_stats):
+        self.app = app
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        meter = _CpuMeter(self.app(scope, receive, send))
+        start = time.perf_counter()
+        try:
+            await meter
+        finally:
+            # The router stores the matched route in the scope; use its template, not the raw path
+            route = scope.get("route")
+            method = scope.get("method", "WS")
+            self.stats.record(
+                f"{method} {getattr(route, 'path', None) or 'unmatched'}",
+                meter.cpu_s,
+                time.perf_counter() - start,
+            )
+
+
+class TracemallocCapture:
+    """Allocation tracing between `start` and `stop`; snapshots diff against the start."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._timer: threading.Timer | None = None
+        self.started_at: float | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._baseline is not None and tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10, max_duration_s: float = 300):
+        with self._lock:
+            if tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is already tracing")
+            tracemalloc.start(frames)
+            self._baseline = self._take()
+            self.started_at = time.time()
+            # Tracing slows every allocation; never leave it on by accident
+            self._timer = threading.Timer(max_duration_s, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ])
+
+    def snapshot(self, limit: int = 20, group_by: str = "lineno") -> dict:
+        with self._lock:
+            if not self.running:
+                raise RuntimeError("tracemalloc is not running")
+            current = self._take()
+            traced, peak = tracemalloc.get_traced_memory()
+
+            def describe(stat, size, count):
+                frame = stat.traceback[0]
+                return {"location": f"{frame.filename}:{frame.lineno}", "size_kb": round(size / 1024, 1), "count": count}
+
+            return {
+                "running_s": round(time.time() - self.started_at, 1),
+                "traced_kb": round(traced / 1024, 1),
+                "peak_kb": round(peak / 1024, 1),
+                "top": [describe(s, s.size, s.count) for s in current.statistics(group_by)[:limit]],
+                "growth_since_start": [
+                    describe(s, s.size_diff, s.count_diff)
+                    for s in current.compare_to(self._baseline, group_by)[:limit]
+                ],
+            }
+
+    def stop(self, limit: int = 20) -> dict:
+        report = self.snapshot(limit)
+        self._expire()
+        return report
+
+    def _expire(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            self._baseline = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+# Leaf frames of threads that are parked, not working
+_IDLE_LEAVES = {
+    ("selectors.py", "select"), ("threading.py", "wait"), ("queue.py", "get"),
+    ("thread.py", "_worker"), ("socket.py", "accept"), ("threading.py", "_wait_for_tstate_lock"),
+}
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a background thread samples every thread's stack via
+    `sys._current_frames()` at a fixed interval and counts leaf functions and
+    folded stacks (flamegraph format).
+    """
+
+    def __init__(self, max_depth: int = 64):
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._reset(interval_ms=0)
+
+    def _reset(self, interval_ms: float):
+        self.interval_ms = interval_ms
+        self.samples = 0
+        self.idle_samples = 0
+        self.started_at: float | None = None
+        self.stopped_at: float | None = None
+        self._functions: Counter = Counter()
+        self._stacks: Counter = Counter()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval_ms: float = 5, duration_s: float = 30):
+        if self.running:
+            raise RuntimeError("profiler is already running")
+        with self._lock:
+            self._reset(interval_ms)
+            self.started_at = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval_ms / 1000, time.monotonic() + duration_s),
+            name="sampling-profiler", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, limit: int = 30) -> dict:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self.report(limit)
+
+    def _run(self, interval_s: float, deadline: float):
+        own = threading.get_ident()
+        while not self._stop.wait(interval_s) and time.monotonic() < deadline:
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, frame in frames.items():
+                    if thread_id == own:
+                        continue
+                    stack = []
+                    while frame is not None and len(stack) < self.max_depth:
+                        code = frame.f_code
+                        stack.append((os.path.basename(code.co_filename), code.co_name))
+                        frame = frame.f_back
+                    if not stack or stack[0] in _IDLE_LEAVES:
+                        self.idle_samples += 1
+                        continue
+                    self.samples += 1
+                    self._functions[stack[0]] += 1
+                    self._stacks[";".join(f"{name} ({file})" for file, name in reversed(stack))] += 1
+        self.stopped_at = time.time()
+
+    def report(self, limit: int = 30) -> dict:
+        with self._lock:
+            total = self.samples or 1
+            return {
+                "running": self.running,
+                "interval_ms": self.interval_ms,
+                "started_at": self.started_at,
+                "stopped_at": self.stopped_at,
+                "samples": self.samples,
+                "idle_samples": self.idle_samples,
+                "top_functions": [
+                    {"function": f"{name} ({file})", "samples": n, "share": round(n / total, 3)}
+                    for (file, name), n in self._functions.most_common(limit)
+                ],
+                # "frame;frame;leaf count" lines, ready for flamegraph.pl / speedscope
+                "folded_stacks": [f"{stack} {n}" for stack, n in self._stacks.most_common(limit)],
+            }
+
+
+tracemalloc_capture = TracemallocCapture()
+sampling_profiler = SamplingProfiler()
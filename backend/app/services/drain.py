@@ -0,0 +1,106 @@
+"""
+Graceful draining on deploys.
+
+On SIGTERM the worker does not stop straight away: it tells connected /ws/shadow
+clients to reconnect (the load balancer sends them to a fresh instance), stops
+taking new model work from them and waits for in-flight model calls to finish.
+Only then is the signal handed to uvicorn, which closes the remaining connections
+within its own graceful-shutdown timeout.
+"""
+
+import asyncio
+import signal
+import threading
+import time
+from typing import Awaitable, Callable
+from utils.config import config
+
+SendFn = Callable[[dict], Awaitable[None]]
+
+
+class DrainCoordinator:
+    def __init__(
+        self,
+        scheduler=None,
+        timeout_s: float = config.DRAIN_TIMEOUT_S,
+        reconnect_after_ms: int = config.DRAIN_RECONNECT_AFTER_MS,
+        poll_s: float = 0.1,
+    ):
+        self._scheduler = scheduler
+        self.timeout_s = timeout_s
+        self.reconnect_after_ms = reconnect_after_ms
+        self.poll_s = poll_s
+        self.draining = False
+        self._shadow_clients: dict[str, SendFn] = {}
+        self._forwarded = False
+
+    @property
+    def scheduler(self):
+        if self._scheduler is None:
+            from utils.model_scheduler import model_scheduler
+            self._scheduler = model_scheduler
+        return self._scheduler
+
+    def reconnect_hint(self) -> dict:
+        return {"type": "control", "action": "reconnect", "retry_after_ms": self.reconnect_after_ms}
+
+    def register_shadow(self, session_id: str, send: SendFn):
+        self._shadow_clients[session_id] = send
+
+    def unregister_shadow(self, session_id: str):
+        self._shadow_clients.pop(session_id, None)
+
+    async def drain(self):
+        """Sends reconnect hints, then waits (up to `timeout_s`) for model calls to finish."""
+        self.draining = True
+        start = time.monotonic()
+        hint = self.reconnect_hint()
+        await asyncio.gather(
+            *(send(hint) for send in list(self._shadow_clients.values())), return_exceptions=True
+        )
+
+        deadline = start + self.timeout_s
+        while self.scheduler.in_flight() and time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_s)
+        print(
+            f"[Drain] Hinted {len(self._shadow_clients)} shadow sessions; "
+            f"{self.scheduler.in_flight()} model calls left after {time.monotonic() - start:.1f}s"
+        )
+
+    def install_signal_handler(self):
+        """
+        Wraps the current SIGTERM handler (uvicorn's, when called at startup) so the
+        drain runs first. A second SIGTERM skips the rest of the drain.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def forward(sig, frame):
+            if self._forwarded:
+                return
+            self._forwarded = True
+            if callable(previous):
+                previous(sig, frame)
+            else:
+                signal.signal(sig, previous)
+                signal.raise_signal(sig)
+
+        async def drain_then_forward(sig, frame):
+            try:
+                await self.drain()
+            finally:
+                forward(sig, frame)
+
+        def handle(sig, frame):
+            if self.draining:
+                forward(sig, frame)
+                return
+            self.draining = True
+            loop.call_soon_threadsafe(lambda: loop.create_task(drain_then_forward(sig, frame)))
+
+        signal.signal(signal.SIGTERM, handle)
+
+
+drain_coordinator = DrainCoordinator()
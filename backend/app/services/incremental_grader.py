@@ -0,0 +1,137 @@
+"""
+Per-question grading while the interview is still running.
+
+Every completed question/answer pair is graded in the background as soon as the
+candidate answers, so by the time the interview ends the `QuestionFeedback`
+entries already exist and the final report only needs a short aggregation call.
+Graders are kept per session id for `INCREMENTAL_GRADER_TTL_S` so the report
+request can find them after the websocket has closed.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from models.schemas import Message
+from models.analysis_schema import InterviewAnalysisReport, QuestionFeedback
+from utils.config import config
+
+GradeFn = Callable[[str, str, str], Awaitable[QuestionFeedback]]
+
+_QUESTION_ROLES = {"interviewer", "model", "assistant"}
+
+
+def question_answer_pairs(history: list[Message]) -> list[tuple[str, str]]:
+    """(question, answer) for each interviewer turn the candidate answered, in order."""
+    pairs: list[tuple[str, str]] = []
+    question: list[str] = []
+    answer: list[str] = []
+    for msg in history:
+        if msg.role in _QUESTION_ROLES:
+            if answer:
+                pairs.append((" ".join(question), " ".join(answer)))
+                question, answer = [], []
+            question.append(msg.content.strip())
+        elif msg.role == "user" and question:
+            answer.append(msg.content.strip())
+    if question and answer:
+        pairs.append((" ".join(question), " ".join(answer)))
+    return pairs
+
+
+def _pair_key(question: str, answer: str) -> str:
+    return hashlib.sha256(f"{question.strip()}\0{answer.strip()}".encode("utf-8")).hexdigest()
+
+
+def _agent():
+    from agents.feedback_agent import FeedbackAgent
+    return FeedbackAgent()
+
+
+class IncrementalGrader:
+    def __init__(self, role: str, grade: GradeFn | None = None):
+        self.role = role
+        self._grade = grade
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.last_activity = time.monotonic()
+
+    async def _default_grade(self, question: str, answer: str, role: str) -> QuestionFeedback:
+        return await _agent().grade_question(question, answer, role)
+
+    def submit(self, question: str, answer: str) -> asyncio.Task:
+        """Starts grading a pair in the background (no-op if it is already graded or grading)."""
+        self.last_activity = time.monotonic()
+        key = _pair_key(question, answer)
+        task = self._tasks.get(key)
+        if task is None or (task.done() and (task.cancelled() or task.exception())):
+            grade = self._grade or self._default_grade
+            task = asyncio.create_task(grade(question, answer, self.role))
+            # Failures are retried at report time; don't log them as never-retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._tasks[key] = task
+        return task
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for task in self._tasks.values() if not task.done())
+
+    @property
+    def graded(self) -> int:
+        return sum(1 for task in self._tasks.values() if task.done() and not task.cancelled() and not task.exception())
+
+    async def breakdown(self, history: list[Message]) -> list[QuestionFeedback]:
+        """
+        Grades for every pair in `history`, in order: finished grades are reused, running
+        ones awaited, and pairs that were never submitted (or failed) are graded now.
+        """
+        pairs = question_answer_pairs(history)
+        if not pairs:
+            raise ValueError("Transcript has no answered questions")
+        return list(await asyncio.gather(*(self.submit(q, a) for q, a in pairs)))
+
+    async def finalize(self, history: list[Message], role: str | None = None) -> InterviewAnalysisReport:
+        agent = _agent()
+        breakdown = await self.breakdown(history)
+        return await agent.aggregate_report(history, role or self.role, breakdown)
+
+    def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+
+
+class GraderRegistry:
+    def __init__(
+        self,
+        ttl_s: float = config.INCREMENTAL_GRADER_TTL_S,
+        max_sessions: int = config.INCREMENTAL_GRADER_MAX_SESSIONS,
+        grade: GradeFn | None = None,
+    ):
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self.grade = grade
+        self._graders: "OrderedDict[str, IncrementalGrader]" = OrderedDict()
+
+    def get_or_create(self, session_id: str, role: str) -> IncrementalGrader:
+        self._purge()
+        grader = self._graders.get(session_id)
+        if grader is None:
+            grader = self._graders[session_id] = IncrementalGrader(role, self.grade)
+            while len(self._graders) > self.max_sessions:
+                _, oldest = self._graders.popitem(last=False)
+                oldest.close()
+        self._graders.move_to_end(session_id)
+        return grader
+
+    def get(self, session_id: str) -> IncrementalGrader | None:
+        self._purge()
+        return self._graders.get(session_id)
+
+    def _purge(self):
+        cutoff = time.monotonic() - self.ttl_s
+        for session_id in [s for s, g in self._graders.items() if g.last_activity < cutoff and not g.pending]:
+            self._graders.pop(session_id).close()
+
+
+grader_registry = GraderRegistry()
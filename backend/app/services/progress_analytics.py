@@ -0,0 +1,128 @@
+"""
+Per-user progress analytics over stored report metrics.
+
+A user's reports are loaded from the report store into columnar NumPy arrays
+(sessions x metrics) and every statistic - trends, moving averages, cohort
+percentiles, per-role/persona means - is computed in one vectorised pass.
+No model calls are involved.
+"""
+
+import threading
+import time
+import numpy as np
+from app.services.report_store import METRIC_COLUMNS
+from utils.config import config
+from utils.metrics import record_latency
+
+# For these, a lower value is the better result
+_LOWER_IS_BETTER = np.array([col in ("filled_pauses_count", "long_pauses_count") for col in METRIC_COLUMNS])
+
+
+def _round(values: np.ndarray) -> list:
+    return np.round(values, 1).tolist()
+
+
+def _group_means(labels: np.ndarray, metrics: np.ndarray) -> dict:
+    keys, inverse = np.unique(labels, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(keys))
+    sums = np.zeros((len(keys), metrics.shape[1]))
+    np.add.at(sums, inverse, metrics)
+    means = sums / counts[:, None]
+    return {
+        str(key): {"sessions": int(count), **dict(zip(METRIC_COLUMNS, _round(row)))}
+        for key, count, row in zip(keys, counts, means)
+    }
+
+
+class ProgressAnalytics:
+    def __init__(self, store=None, cohort_ttl_s: float = config.ANALYTICS_COHORT_TTL_S, clock=time.monotonic):
+        self._store = store
+        self.cohort_ttl_s = cohort_ttl_s
+        self.clock = clock
+        self._cohort: np.ndarray | None = None
+        self._cohort_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            from app.services.report_store import get_report_store
+            self._store = get_report_store()
+        return self._store
+
+    def _cohort_means(self) -> np.ndarray:
+        """(users x metrics) per-user averages, cached for `cohort_ttl_s`."""
+        with self._lock:
+            if self._cohort is None or self.clock() - self._cohort_at > self.cohort_ttl_s:
+                rows = self.store.cohort_metric_means()
+                self._cohort = np.array([row[1:] for row in rows], dtype=np.float64).reshape(-1, len(METRIC_COLUMNS))
+                self._cohort_at = self.clock()
+            return self._cohort
+
+    def compute(self, user_id: str, window: int = 5) -> dict:
+        start = time.perf_counter()
+        rows = self.store.load_metrics(user_id)
+        if not rows:
+            return {"user_id": user_id, "sessions": 0}
+
+        k = len(METRIC_COLUMNS)
+        data = np.array([row[: k + 1] for row in rows], dtype=np.float64)
+        created_at, metrics = data[:, 0], data[:, 1:]
+        roles = np.array([row[k + 1] for row in rows])
+        personas = np.array([row[k + 2] or "unknown" for row in rows])
+        n = len(rows)
+
+        mean = metrics.mean(axis=0)
+
+        # Least-squares slope per metric, in points per session
+        x = np.arange(n) - (n - 1) / 2
+        denom = x @ x
+        slope = (x @ (metrics - mean)) / denom if denom else np.zeros(k)
+
+        # Trailing moving average; the first sessions average over what is available
+        window = max(1, min(window, n))
+        csum = np.vstack([np.zeros(k), np.cumsum(metrics, axis=0)])
+        end = np.arange(1, n + 1)
+        begin = np.maximum(end - window, 0)
+        moving = (csum[end] - csum[begin]) / (end - begin)[:, None]
+
+        # Share of cohort users this user's average beats (ties count half)
+        cohort = self._cohort_means()
+        if len(cohort):
+            below = (cohort < mean).sum(axis=0)
+            above = (cohort > mean).sum(axis=0)
+            ties = len(cohort) - below - above
+            beaten = np.where(_LOWER_IS_BETTER, above, below)
+            percentile = (beaten + 0.5 * ties) / len(cohort) * 100
+        else:
+            percentile = np.full(k, np.nan)
+
+        result = {
+            "user_id": user_id,
+            "sessions": n,
+            "window": window,
+            "cohort_size": len(cohort),
+            "metrics": {
+                name: {
+                    "latest": float(metrics[-1, i]),
+                    "mean": round(float(mean[i]), 1),
+                    "trend_per_session": round(float(slope[i]), 2),
+                    "cohort_percentile": None if np.isnan(percentile[i]) else round(float(percentile[i]), 1),
+                }
+                for i, name in enumerate(METRIC_COLUMNS)
+            },
+            "series": {
+                "created_at": created_at.tolist(),
+                "values": {name: metrics[:, i].tolist() for i, name in enumerate(METRIC_COLUMNS)},
+                "moving_average": {name: _round(moving[:, i]) for i, name in enumerate(METRIC_COLUMNS)},
+            },
+            "by_role": _group_means(roles, metrics),
+            "by_persona": _group_means(personas, metrics),
+        }
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        record_latency("analytics.progress", elapsed_ms)
+        result["compute_ms"] = round(elapsed_ms, 2)
+        return result
+
+
+progress_analytics = ProgressAnalytics()
@@ -0,0 +1,290 @@
+"""
+Embedded persistent store for interview sessions, transcripts and analysis reports.
+
+SQLite in WAL mode. Transcripts and full reports are stored as zlib-compressed JSON;
+the headline metrics are also kept as plain columns so history pages and analytics
+never have to decompress a report. Writes are queued and committed in batches by a
+background thread, off the request path.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from models.schemas import Message
+from models.analysis_schema import InterviewAnalysisReport
+from utils.config import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    role TEXT NOT NULL,
+    persona TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_time ON sessions(user_id, created_at);
+
+CREATE TABLE IF NOT EXISTS transcripts (
+    session_id TEXT PRIMARY KEY REFERENCES sessions(id),
+    transcript_hash TEXT NOT NULL,
+    message_count INTEGER NOT NULL,
+    messages BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reports (
+    id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL REFERENCES sessions(id),
+    user_id TEXT,
+    role TEXT NOT NULL,
+    persona TEXT,
+    transcript_hash TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    overall_score INTEGER NOT NULL,
+    final_verdict TEXT NOT NULL,
+    pace TEXT,
+    clarity INTEGER,
+    conciseness INTEGER,
+    filled_pauses_count INTEGER,
+    long_pauses_count INTEGER,
+    technical_accuracy INTEGER,
+    relevance INTEGER,
+    problem_solving_skills INTEGER,
+    report BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_user_time ON reports(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_reports_hash ON reports(transcript_hash);
+"""
+
+# Numeric report metrics kept as columns, in the order analytics reads them
+METRIC_COLUMNS = (
+    "overall_score", "clarity", "conciseness", "filled_pauses_count", "long_pauses_count",
+    "technical_accuracy", "relevance", "problem_solving_skills",
+)
+
+_SUMMARY_COLUMNS = (
+    "id, session_id, role, persona, created_at, overall_score, final_verdict"
+)
+
+_STOP = object()
+
+
+def _pack(obj) -> bytes:
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob: bytes):
+    return json.loads(zlib.decompress(blob))
+
+
+class ReportStore:
+    def __init__(
+        self,
+        path: str | None = None,
+        batch_size: int = 64,
+        flush_interval_s: float = 0.5,
+    ):
+        self.path = path = path or config.REPORT_DB_PATH
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self._local = threading.local()
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    # ---------- connections ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """One read connection per thread (sqlite3 connections are not thread-safe)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ---------- writes (batched, background thread) ----------
+
+    def save_analysis(
+        self,
+        history: list[Message],
+        report: InterviewAnalysisReport,
+        role: str,
+        transcript_hash: str,
+        user_id: str | None = None,
+        persona: str | None = None,
+    ) -> str:
+        """Queues a session + transcript + report for writing. Returns the report id."""
+        session_id = uuid.uuid4().hex
+        report_id = uuid.uuid4().hex
+        now = time.time()
+        speech, content = report.speech_analysis, report.content_analysis
+
+        self._queue.put((
+            (session_id, user_id, role, persona, now),
+            (session_id, transcript_hash, len(history), _pack([m.model_dump() for m in history])),
+            (
+                report_id, session_id, user_id, role, persona, transcript_hash, now,
+                report.overall_score, report.final_verdict, speech.pace, speech.clarity,
+                speech.conciseness, speech.filled_pauses_count, speech.long_pauses_count,
+                content.technical_accuracy, content.relevance, content.problem_solving_skills,
+                _pack(report.model_dump()),
+            ),
+        ))
+        self._ensure_writer()
+        return report_id
+
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="report-store-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval_s
+            while len(batch) < self.batch_size:
+                try:
+                    nxt = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    self._queue.put(_STOP)  # handle after this batch is committed
+                    self._queue.task_done()
+                    break
+                batch.append(nxt)
+
+            try:
+                with conn:
+                    conn.executemany("INSERT INTO sessions VALUES (?, ?, ?, ?, ?)", [b[0] for b in batch])
+                    conn.executemany("INSERT INTO transcripts VALUES (?, ?, ?, ?)", [b[1] for b in batch])
+                    conn.executemany(
+                        "INSERT INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [b[2] for b in batch],
+                    )
+            except Exception as e:
+                print(f"[ReportStore] Failed to write {len(batch)} reports: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def flush(self):
+        """Blocks until every queued write is committed."""
+        self._queue.join()
+
+    def close(self):
+        if self._writer and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    # ---------- reads ----------
+
+    def find_report_by_hash(
+        self, transcript_hash: str, user_id: str | None = None
+    ) -> tuple[str, InterviewAnalysisReport, str | None] | None:
+        """
+        (report id, report, owner user id) of the latest report for an identical transcript
+        + role, preferring one `user_id` already owns.
+        """
+        row = self._reader().execute(
+            "SELECT id, user_id, report FROM reports WHERE transcript_hash = ? "
+            "ORDER BY user_id IS ? DESC, created_at DESC LIMIT 1",
+            (transcript_hash, user_id),
+        ).fetchone()
+        if not row:
+            return None
+        return row["id"], InterviewAnalysisReport.model_validate(_unpack(row["report"])), row["user_id"]
+
+    def get_report(self, report_id: str) -> dict | None:
+        conn = self._reader()
+        row = conn.execute(
+            f"SELECT {_SUMMARY_COLUMNS}, user_id, report FROM reports WHERE id = ?", (report_id,)
+        ).fetchone()
+        if not row:
+            return None
+        transcript = conn.execute(
+            "SELECT messages FROM transcripts WHERE session_id = ?", (row["session_id"],)
+        ).fetchone()
+        result = {k: row[k] for k in row.keys() if k != "report"}
+        result["report"] = _unpack(row["report"])
+        result["transcript"] = _unpack(transcript["messages"]) if transcript else []
+        return result
+
+    def list_reports(self, user_id: str, limit: int = 20, before: str | None = None) -> dict:
+        """
+        Newest-first page of report summaries; pass `next_cursor` back as `before`. The
+        cursor is "<created_at>:<id>", so reports saved in the same instant are not skipped.
+        """
+        limit = max(1, min(limit, 100))
+        created_at, report_id = float("inf"), ""
+        if before:
+            timestamp, _, report_id = before.rpartition(":")
+            created_at = float(timestamp)
+        rows = self._reader().execute(
+            f"SELECT {_SUMMARY_COLUMNS} FROM reports "
+            "WHERE user_id = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT ?",
+            (user_id, created_at, report_id, limit + 1),
+        ).fetchall()
+        items = [dict(row) for row in rows[:limit]]
+        last = items[-1] if len(rows) > limit else None
+        return {
+            "items": items,
+            "next_cursor": f"{last['created_at']!r}:{last['id']}" if last else None,
+        }
+
+    def load_metrics(self, user_id: str) -> list[tuple]:
+        """Oldest-first rows of (created_at, *METRIC_COLUMNS, role, persona) for one user."""
+        return self._reader().execute(
+            f"SELECT created_at, {', '.join(METRIC_COLUMNS)}, role, persona FROM reports "
+            "WHERE user_id = ? ORDER BY created_at",
+            (user_id,),
+        ).fetchall()
+
+    def cohort_metric_means(self) -> list[tuple]:
+        """Rows of (user_id, *mean METRIC_COLUMNS), one per user with stored reports."""
+        averages = ", ".join(f"AVG({col})" for col in METRIC_COLUMNS)
+        return self._reader().execute(
+            f"SELECT user_id, {averages} FROM reports WHERE user_id IS NOT NULL GROUP BY user_id"
+        ).fetchall()
+
+
+_store: ReportStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_report_store() -> ReportStore:
+    """Process-wide store, opened on first use so that importing this module never touches disk."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ReportStore()
+        return _store
+
+
+def close_report_store():
+    """Commits queued writes, if the store was ever opened."""
+    with _store_lock:
+        if _store is not None:
+            _store.close()
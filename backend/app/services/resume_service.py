@@ -1,15 +1,15 @@
-import asyncio
 import io
 import json
 from pypdf import PdfReader
 from utils.config import config
-from utils.gemini_client import get_gemini_client
+from utils.gemini_client import get_gemini_pool
+from utils.model_scheduler import model_scheduler, Priority
 from google.genai import types
 
 
 async def analyze_resume_with_gemini(content: bytes) -> dict:
     """Analyze resume visually using Gemini via Vertex AI."""
-    client = get_gemini_client()
+    client = get_gemini_pool()
 
     # Vertex AI: send PDF as inline bytes
     file_part = types.Part.from_bytes(data=content, mime_type="application/pdf")
@@ -35,7 +35,8 @@ Output JSON:
 
 Be constructive and actionable."""
 
-    response = await asyncio.to_thread(
+    response = await model_scheduler.run(
+        Priority.RESUME,
         client.models.generate_content,
         model=config.SHADOW_MODEL,
         contents=[file_part, prompt],
@@ -96,7 +97,7 @@ Return ONLY the JSON object."""
             response_format={"type": "json_object"}
         )
 
-    completion = await asyncio.to_thread(_sync_call)
+    completion = await model_scheduler.run(Priority.RESUME, _sync_call)
     message_content = completion.choices[0].message.content
     if message_content is None:
         raise ValueError("Empty response from Groq API")
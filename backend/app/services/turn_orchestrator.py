@@ -0,0 +1,96 @@
+import asyncio
+import sys
+from typing import Awaitable, Callable, Optional
+from agents.interviewer import InterviewerAgent
+from agents.instructor import InstructorAgent
+from utils.session_manager import SessionManager
+from app.services.incremental_grader import IncrementalGrader
+
+CoachingCallback = Callable[[str], Awaitable[None]]
+DeltaCallback = Callable[[str], Awaitable[None]]
+
+
+class TurnOrchestrator:
+    """
+    Runs one text-interview turn: records the user's message, then starts the
+    interviewer reply and the instructor coaching on the same history snapshot at once.
+    The reply is returned as soon as it is ready; coaching is delivered later through
+    `on_coaching`, so it never adds to the conversational latency. With a `grader`, the
+    question just answered is also graded in the background for the final report.
+    """
+
+    def __init__(
+        self,
+        session: SessionManager,
+        interviewer: InterviewerAgent,
+        instructor: Optional[InstructorAgent] = None,
+        on_coaching: Optional[CoachingCallback] = None,
+        grader: Optional[IncrementalGrader] = None,
+    ):
+        self.session = session
+        self.interviewer = interviewer
+        self.instructor = instructor
+        self.on_coaching = on_coaching
+        self.grader = grader
+        self._coaching_tasks: set[asyncio.Task] = set()
+
+    async def handle_user_message(
+        self,
+        content: str,
+        on_delta: Optional[DeltaCallback] = None,
+        by_sentence: bool = False,
+    ) -> str:
+        """
+        Returns the full interviewer reply. With `on_delta`, the reply is streamed and
+        each token chunk (or sentence, with `by_sentence`) is pushed as it arrives.
+        """
+        previous = self.session.get_full_history()[-1:]
+        if self.grader and previous and previous[0].role == "interviewer":
+            self.grader.submit(previous[0].content, content)
+
+        self.session.add_message("user", content)
+        history = list(self.session.get_full_history())
+
+        if self.instructor:
+            task = asyncio.create_task(self._coach(history))
+            self._coaching_tasks.add(task)
+            task.add_done_callback(self._coaching_tasks.discard)
+
+        if on_delta:
+            parts = []
+            async for chunk in self.interviewer.stream_response(history, by_sentence=by_sentence):
+                parts.append(chunk)
+                await on_delta(chunk)
+            reply = (" " if by_sentence else "").join(parts)
+        else:
+            reply = await self.interviewer.generate_response(history)
+        self.session.add_message("interviewer", reply)
+        return reply
+
+    async def _coach(self, history):
+        try:
+            feedback = await self.instructor.analyze_and_coach(history)
+            if feedback and self.on_coaching:
+                await self.on_coaching(feedback)
+        except Exception as e:
+            print(f"[TurnOrchestrator] Coaching error: {e}")
+
+    def memory_usage(self) -> dict:
+        """Bytes this interview holds, for the admin diagnostics surface."""
+        return {
+            "history_bytes": self.session.memory_bytes(),
+            "prompt_bytes": sys.getsizeof(self.interviewer.system_prompt),
+            "resume_bytes": sys.getsizeof(self.interviewer.resume_context),
+            "coaching_in_flight": len(self._coaching_tasks),
+        }
+
+    async def close(self):
+        """
+        Cancels coaching that is still running (e.g. the client disconnected) and
+        releases the interviewer's session-scoped cached prompt.
+        """
+        for task in list(self._coaching_tasks):
+            task.cancel()
+        if self._coaching_tasks:
+            await asyncio.gather(*self._coaching_tasks, return_exceptions=True)
+        await self.interviewer.close()
@@ -0,0 +1,104 @@
+"""
+Replays labeled samples through the shadow agent's model cascades and reports the
+accuracy / latency trade-off of each single tier against the full cascade.
+
+    cd backend
+    python benchmarks/cascade_benchmark.py benchmarks/samples/pacing.jsonl
+
+Each JSONL line is one sample:
+    {"task": "pacing", "text": "...", "persona": "friendly", "label": "ok" | "alert"}
+    {"task": "frame", "image": "path/to/frame.jpg", "label": "ok" | "alert"}
+Image paths are relative to the samples file. Needs live model credentials.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.shadow_vision import ShadowAgent  # noqa: E402
+from utils.config import config  # noqa: E402
+from utils.model_cascade import CascadeStats, ModelCascade  # noqa: E402
+
+_CASCADES = {"pacing": ("shadow.pacing", "pacing_cascade"), "frame": ("shadow.frame", "frame_cascade")}
+
+
+def load_samples(path: Path) -> list[dict]:
+    samples = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            sample = json.loads(line)
+            if sample.get("image"):
+                sample["image_b64"] = base64.b64encode((path.parent / sample["image"]).read_bytes()).decode("ascii")
+            samples.append(sample)
+    return samples
+
+
+async def run_variant(agent: ShadowAgent, task: str, samples: list[dict], cascade: ModelCascade) -> dict:
+    setattr(agent, _CASCADES[task][1], cascade)
+    latencies, correct, errors = [], 0, 0
+    for sample in samples:
+        started = time.perf_counter()
+        if task == "pacing":
+            verdict = await agent.analyze_pacing(sample["text"], persona=sample.get("persona", "friendly"))
+        else:
+            verdict = await agent.analyze_frame_and_context(sample["image_b64"], persona=sample.get("persona", "friendly"))
+        latencies.append((time.perf_counter() - started) * 1000)
+        if verdict.get("status") == "error":
+            errors += 1
+        correct += verdict.get("status") == sample["label"]
+
+    tiers = cascade.stats.snapshot().get(cascade.name, {})
+    calls = sum(t["calls"] for t in tiers.values())
+    latencies.sort()
+    return {
+        "variant": " > ".join(cascade.tiers),
+        "samples": len(samples),
+        "accuracy": round(correct / len(samples), 3),
+        "errors": errors,
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)], 1),
+        "model_calls_per_sample": round(calls / len(samples), 2),
+        "calls_by_model": {model: t["calls"] for model, t in tiers.items()},
+    }
+
+
+async def main(args):
+    samples = load_samples(Path(args.samples))
+    # The local precheck would answer some frames without any model; measure the models
+    config.SHADOW_PRECHECK_ENABLED = False
+    agent = ShadowAgent()
+
+    results = []
+    for task in sorted({s["task"] for s in samples}):
+        task_samples = [s for s in samples if s["task"] == task]
+        name = _CASCADES[task][0]
+        settings = config.MODEL_CASCADES[name]
+        variants = [[model] for model in dict.fromkeys(settings["tiers"])]
+        if len(settings["tiers"]) > 1:
+            variants.append(settings["tiers"])
+        for tiers in variants:
+            cascade = ModelCascade(name, tiers, settings["min_confidence"], stats=CascadeStats())
+            result = {"task": task, **await run_variant(agent, task, task_samples, cascade)}
+            results.append(result)
+            print(
+                f"{task:<7} {result['variant']:<50} acc={result['accuracy']:.3f} "
+                f"p50={result['p50_ms']:>7.1f}ms p95={result['p95_ms']:>7.1f}ms "
+                f"calls/sample={result['model_calls_per_sample']:.2f} errors={result['errors']}"
+            )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("samples", help="Labeled JSONL samples")
+    parser.add_argument("--json", help="Also write the results to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -14,6 +14,9 @@ class SpeechAnalysis(BaseModel):
     stammering_frequency: str # "None", "Low", "Moderate", "High"
     filled_pauses_count: int # Uh, um, like
     long_pauses_count: int
+    # Measured from message timestamps (utils/speech_metrics.py); None without timestamps
+    words_per_minute: Optional[float] = None
+    avg_answer_latency_s: Optional[float] = None
 
 class ContentAnalysis(BaseModel):
     technical_accuracy: int # 0-100
@@ -29,6 +32,15 @@ class QuestionFeedback(BaseModel):
     feedback: str
     better_response_suggestion: str
 
+class ReportSummary(BaseModel):
+    """The report minus `question_breakdown`, for when questions were graded during the interview."""
+    overall_score: int
+    summary: str
+    speech_analysis: SpeechAnalysis
+    content_analysis: ContentAnalysis
+    actionable_tips: List[str]
+    final_verdict: str
+
 class InterviewAnalysisReport(BaseModel):
     overall_score: int
     summary: str
@@ -1,16 +1,23 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 class Message(BaseModel):
     role: str
     content: str
-    timestamp: Optional[float] = None
+    timestamp: Optional[float] = None  # Turn start; epoch ms (Date.now()) or seconds
+    end_timestamp: Optional[float] = None  # Last transcript chunk of the turn, same unit
 
 class Feedback(BaseModel):
     score: int
     pros: List[str]
     cons: List[str]
     improvement_tip: str
+    confidence: Optional[float] = None  # 0-1; low values escalate to a stronger model
+
+class ShadowVerdict(BaseModel):
+    status: Literal["ok", "alert"]
+    message: Optional[str] = None
+    confidence: Optional[float] = None
 
 class SessionState(BaseModel):
     session_id: str
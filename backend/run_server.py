@@ -1,21 +1,44 @@
-
+import argparse
 import uvicorn
-import os
+from utils.config import config
 
 if __name__ == "__main__":
-    # In development, you might want restart, but it kills WebSockets.
-    # To prevent StatReload from killing active sessions during code edits, 
-    # you can either:
-    # 1. Disable reload (workers=1, reload=False)
-    # 2. Exclude specific files/dirs (reload_excludes)
-    
-    # "Production-like" runner for local dev stability
-    uvicorn.run(
-        "app.main:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True,  # Set to False for absolute stability
-        reload_excludes=["agents/*", "logs/*"], # Example exclusions
-        ws_ping_interval=None, # Prevent aggressive ping disconnects if needed
-        ws_ping_timeout=None
-    )
+    parser = argparse.ArgumentParser(description="Run The Shadow Instructor API")
+    parser.add_argument("--prod", action="store_true", help="Production mode (no reload)")
+    # Jobs, resume indexes and graders are per process: >1 worker needs sticky routing
+    parser.add_argument("--workers", type=int, default=config.WEB_CONCURRENCY)
+    args = parser.parse_args()
+
+    if args.prod:
+        # Each worker drains on SIGTERM (see app/services/drain.py) before uvicorn
+        # closes its connections, so deploys don't cut live interviews mid-answer.
+        uvicorn.run(
+            "app.main:app",
+            host=config.HOST,
+            port=config.PORT,
+            workers=args.workers,
+            loop="auto",  # uvloop when installed (uvicorn[standard]), asyncio otherwise
+            http="auto",  # httptools when installed
+            timeout_keep_alive=config.KEEP_ALIVE_S,
+            ws_ping_interval=config.WS_PING_INTERVAL_S,
+            ws_ping_timeout=config.WS_PING_TIMEOUT_S,
+            timeout_graceful_shutdown=config.GRACEFUL_SHUTDOWN_TIMEOUT_S,
+            proxy_headers=True,
+            forwarded_allow_ips="*",
+            access_log=False,
+        )
+    else:
+        # In development, you might want restart, but it kills WebSockets.
+        # To prevent StatReload from killing active sessions during code edits,
+        # you can either:
+        # 1. Disable reload (workers=1, reload=False)
+        # 2. Exclude specific files/dirs (reload_excludes)
+        uvicorn.run(
+            "app.main:app",
+            host=config.HOST,
+            port=config.PORT,
+            reload=True,  # Set to False for absolute stability
+            reload_excludes=["agents/*", "logs/*"], # Example exclusions
+            ws_ping_interval=None, # Prevent aggressive ping disconnects if needed
+            ws_ping_timeout=None
+        )
@@ -0,0 +1,12 @@
+import pytest
+
+from app.services.report_store import close_report_store
+from utils.config import config
+
+
+@pytest.fixture(autouse=True, scope="session")
+def report_db(tmp_path_factory):
+    """Keeps the app's SQLite report store (opened lazily) out of backend/data."""
+    config.REPORT_DB_PATH = str(tmp_path_factory.mktemp("data") / "shadow_instructor.db")
+    yield
+    close_report_store()
@@ -0,0 +1,95 @@
+import asyncio
+
+from app.services.analysis_jobs import AnalysisJobQueue
+from utils.model_scheduler import current_session
+from models.schemas import Message
+from models.analysis_schema import InterviewAnalysisReport
+
+REPORT = {
+    "overall_score": 70,
+    "summary": "Solid.",
+    "speech_analysis": {
+        "pace": "Good", "clarity": 70, "conciseness": 70,
+        "stammering_frequency": "Low", "filled_pauses_count": 1, "long_pauses_count": 0,
+    },
+    "content_analysis": {
+        "technical_accuracy": 70, "relevance": 70, "problem_solving_skills": 70,
+        "key_strengths": [], "areas_for_improvement": [],
+    },
+    "question_breakdown": [],
+    "actionable_tips": [],
+    "final_verdict": "Hire",
+}
+
+
+def test_identical_transcripts_share_one_job():
+    calls = []
+
+    async def fake_analyze(history, role, session_id=None):
+        calls.append(role)
+        await asyncio.sleep(0.01)
+        return InterviewAnalysisReport.model_validate(REPORT)
+
+    async def scenario():
+        queue = AnalysisJobQueue(analyze=fake_analyze, workers=2)
+        history = [Message(role="interviewer", content="Hi"), Message(role="user", content="Hello")]
+
+        first = await queue.submit(history, "Backend Engineer")
+        retry = await queue.submit(list(history), "Backend Engineer")
+        other = await queue.submit(history, "Frontend Engineer")
+        assert retry is first
+        assert other is not first
+
+        await queue.wait(first, timeout=1)
+        await queue.wait(other, timeout=1)
+        cached = await queue.submit(history, "Backend Engineer")
+        return first, cached
+
+    first, cached = asyncio.run(scenario())
+    assert calls == ["Backend Engineer", "Frontend Engineer"]
+    assert first.status == "succeeded"
+    assert cached is first
+    assert first.to_dict()["result"]["overall_score"] == 70
+
+
+def test_failed_job_is_retried_on_resubmit():
+    attempts = []
+
+    async def flaky_analyze(history, role, session_id=None):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return InterviewAnalysisReport.model_validate(REPORT)
+
+    async def scenario():
+        queue = AnalysisJobQueue(analyze=flaky_analyze, workers=1)
+        history = [Message(role="user", content="Hello")]
+        failed = await queue.wait(await queue.submit(history, "SRE"), timeout=1)
+        retried = await queue.wait(await queue.submit(history, "SRE"), timeout=1)
+        return failed, retried
+
+    failed, retried = asyncio.run(scenario())
+    assert failed.status == "failed" and failed.error == "boom"
+    assert retried is not failed and retried.status == "succeeded"
+
+
+def test_each_job_runs_under_its_submitters_scheduler_session():
+    seen = []
+
+    async def fake_analyze(history, role, session_id=None):
+        seen.append(current_session.get())
+        return InterviewAnalysisReport.model_validate(REPORT)
+
+    async def submit_as(queue, user, content):
+        current_session.set(user)
+        return await queue.submit([Message(role="user", content=content)], "SRE")
+
+    async def scenario():
+        queue = AnalysisJobQueue(analyze=fake_analyze, workers=1)
+        # Separate tasks, like separate requests; the first one starts the workers
+        for user, content in [("alice", "one"), ("bob", "two")]:
+            job = await asyncio.create_task(submit_as(queue, user, content))
+            await queue.wait(job, timeout=1)
+
+    asyncio.run(scenario())
+    assert seen == ["alice", "bob"]
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+from app.routers.analysis import AnalysisRequest
+from app.services.bulk_analysis import BulkAnalyzer
+from models.analysis_schema import InterviewAnalysisReport
+from tests.test_analysis_jobs import REPORT
+
+
+async def _chunks(payload: bytes, size: int = 7):
+    # Deliberately split records across chunk boundaries
+    for i in range(0, len(payload), size):
+        yield payload[i:i + size]
+
+
+def _record(role: str) -> str:
+    return json.dumps({"history": [{"role": "user", "content": f"I want {role}"}], "role": role})
+
+
+def test_records_stream_back_in_completion_order_with_bounded_concurrency():
+    active = {"now": 0, "peak": 0}
+    rate_limited = []
+
+    async def fake_analyze(history, role):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.03 if role == "slow" else 0.001)
+        active["now"] -= 1
+        if role == "flaky" and not rate_limited:
+            rate_limited.append(role)
+            raise RuntimeError("429 RESOURCE_EXHAUSTED")
+        return InterviewAnalysisReport.model_validate(REPORT)
+
+    body = "\n".join([_record("slow"), _record("fast"), "{not json", _record("flaky"), _record("fast2")]).encode()
+
+    async def scenario():
+        bulk = BulkAnalyzer(analyze=fake_analyze, concurrency=2, requests_per_minute=0, retry_backoff_s=0)
+        return [json.loads(line) async for line in bulk.run(_chunks(body), AnalysisRequest.model_validate_json)]
+
+    lines = asyncio.run(scenario())
+    results, summary = lines[:-1], lines[-1]
+
+    assert summary == {"done": True, "succeeded": 4, "failed": 1}
+    assert active["peak"] <= 2
+    assert results[-1]["index"] == 0  # the slow record finished last
+    assert {r["index"] for r in results if r["status"] == "failed"} == {2}
+    assert rate_limited == ["flaky"]
+
+
+def test_client_disconnect_stops_every_pipeline_task():
+    async def stuck_analyze(history, role):
+        await asyncio.sleep(10)
+
+    async def endless_body():
+        for i in range(1000):
+            yield (_record(f"role-{i}") + "\n").encode()
+
+    async def scenario():
+        bulk = BulkAnalyzer(analyze=stuck_analyze, concurrency=2, requests_per_minute=0)
+        lines = bulk.run(endless_body(), AnalysisRequest.model_validate_json)
+        # Workers busy, inbox full, reader waiting on it: then the client goes away
+        pending = asyncio.ensure_future(lines.__anext__())
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_only_provider_rate_limits_pause_the_batch():
+    attempts = []
+
+    async def broken_analyze(history, role):
+        attempts.append(role)
+        raise RuntimeError("400 INVALID_ARGUMENT: generateContent request is malformed")
+
+    async def scenario():
+        bulk = BulkAnalyzer(analyze=broken_analyze, concurrency=1, requests_per_minute=0, retry_backoff_s=60)
+        body = _record("sre").encode()
+        return [json.loads(line) async for line in bulk.run(_chunks(body), AnalysisRequest.model_validate_json)]
+
+    lines = asyncio.run(asyncio.wait_for(scenario(), timeout=1))
+    assert attempts == ["sre"] and lines[0]["status"] == "failed"
@@ -0,0 +1,46 @@
+import time
+
+from fastapi.testclient import TestClient
+from app.main import app
+from utils.config import config
+
+client = TestClient(app)
+ADMIN = {"X-Admin-Key": "test-admin"}
+
+
+def test_admin_surface_is_hidden_without_a_configured_key(monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_API_KEY", None)
+    assert client.get("/admin/diagnostics/sessions", headers=ADMIN).status_code == 404
+
+    monkeypatch.setattr(config, "ADMIN_API_KEY", "test-admin")
+    assert client.get("/admin/diagnostics/sessions", headers={"X-Admin-Key": "nope"}).status_code == 403
+    assert client.get("/admin/diagnostics/sessions", headers=ADMIN).json()["count"] == 0
+
+
+def test_route_cpu_is_grouped_by_route_template(monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_API_KEY", "test-admin")
+    client.delete("/admin/diagnostics/routes", headers=ADMIN)
+    client.get("/health")
+    client.get("/reports/does-not-exist")
+
+    routes = {r["route"]: r for r in client.get("/admin/diagnostics/routes", headers=ADMIN).json()}
+    assert routes["GET /health"]["calls"] == 1
+    assert "GET /reports/{report_id}" in routes
+
+
+def test_tracemalloc_and_profiler_captures(monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_API_KEY", "test-admin")
+    assert client.post("/admin/diagnostics/tracemalloc/start", headers=ADMIN).status_code == 200
+    assert client.post("/admin/diagnostics/tracemalloc/start", headers=ADMIN).status_code == 409
+    blobs = [bytearray(10_000) for _ in range(50)]
+    report = client.post("/admin/diagnostics/tracemalloc/stop", headers=ADMIN).json()
+    assert report["traced_kb"] > 400 and report["growth_since_start"]
+    del blobs
+
+    client.post("/admin/diagnostics/profiler/start?interval_ms=1&duration_s=5", headers=ADMIN)
+    deadline = time.time() + 0.2
+    while time.time() < deadline:
+        sum(i * i for i in range(1000))
+    report = client.post("/admin/diagnostics/profiler/stop", headers=ADMIN).json()
+    assert not report["running"] and report["samples"] > 0
+    assert report["folded_stacks"]
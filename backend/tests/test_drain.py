@@ -0,0 +1,46 @@
+import asyncio
+
+from app.services.drain import DrainCoordinator
+
+
+class FakeScheduler:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def in_flight(self):
+        return self.calls
+
+
+def test_drain_hints_shadow_clients_and_waits_for_model_calls():
+    scheduler = FakeScheduler(calls=2)
+    sent = []
+
+    async def send(payload):
+        sent.append(payload)
+
+    async def finish_calls():
+        await asyncio.sleep(0.05)
+        scheduler.calls = 0
+
+    async def scenario():
+        drain = DrainCoordinator(scheduler=scheduler, timeout_s=5, reconnect_after_ms=500, poll_s=0.01)
+        drain.register_shadow("a", send)
+        drain.register_shadow("b", send)
+        drain.unregister_shadow("b")
+        finisher = asyncio.create_task(finish_calls())
+        await drain.drain()
+        await finisher
+        return drain
+
+    drain = asyncio.run(scenario())
+    assert drain.draining
+    assert sent == [{"type": "control", "action": "reconnect", "retry_after_ms": 500}]
+    assert scheduler.calls == 0
+
+
+def test_drain_gives_up_after_timeout():
+    async def scenario():
+        drain = DrainCoordinator(scheduler=FakeScheduler(calls=1), timeout_s=0.05, poll_s=0.01)
+        await asyncio.wait_for(drain.drain(), timeout=1)
+
+    asyncio.run(scenario())
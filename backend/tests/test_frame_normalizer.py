@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from utils.frame_normalizer import FrameNormalizer
+
+cv2 = pytest.importorskip("cv2")
+
+
+def encode(image: np.ndarray, quality: int = 95) -> bytes:
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    assert ok
+    return buffer.tobytes()
+
+
+def decode(data: bytes) -> np.ndarray:
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+def noisy_frame(height=720, width=1280) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def normalizer(**kwargs) -> FrameNormalizer:
+    return FrameNormalizer(**{"max_side": 512, "jpeg_quality": 70, "crop_to_subject": True, "workers": 1, **kwargs})
+
+
+def test_downscales_longest_side_to_max_side():
+    output = normalizer().normalize_sync(encode(noisy_frame()))
+    assert decode(output).shape[:2] == (288, 512)
+
+
+def test_crops_head_and_shoulders_around_the_face():
+    # 100x100 face at (600, 200): one face-width either side, 0.6 above, 3 heights below
+    assert FrameNormalizer._subject_region((720, 1280), (600, 200, 100, 100)) == (slice(140, 500), slice(500, 800))
+    # Clamped to the frame near the edges
+    assert FrameNormalizer._subject_region((720, 1280), (20, 10, 100, 300)) == (slice(0, 720), slice(0, 220))
+
+    output = normalizer(max_side=1280).normalize_sync(encode(noisy_frame()), face_box=(600, 200, 100, 100))
+    assert decode(output).shape[:2] == (360, 300)
+
+
+def test_face_box_is_ignored_when_cropping_is_off():
+    output = normalizer(crop_to_subject=False).normalize_sync(encode(noisy_frame()), face_box=(600, 200, 100, 100))
+    assert decode(output).shape[:2] == (288, 512)
+
+
+def test_original_is_kept_when_reencoding_is_not_smaller():
+    # Already small and heavily compressed: re-encoding at a higher quality only grows it
+    original = encode(np.full((64, 64, 3), 128, np.uint8), quality=10)
+    assert normalizer(jpeg_quality=100).normalize_sync(original) is original
+    assert normalizer().normalize_sync(b"not an image") == b"not an image"
+
+
+def test_stats_account_bytes_in_and_out():
+    frames = normalizer()
+    big = encode(noisy_frame())
+    small = encode(np.full((64, 64, 3), 128, np.uint8), quality=10)
+    outputs = [frames.normalize_sync(big), frames.normalize_sync(small)]
+
+    stats = frames.stats()
+    assert stats["frames"] == 2
+    assert outputs[1] is small and stats["passthrough"] == 1
+    assert stats["bytes_in"] == len(big) + len(small)
+    assert stats["bytes_out"] == sum(len(o) for o in outputs)
+    assert stats["bytes_saved_ratio"] == round(1 - stats["bytes_out"] / stats["bytes_in"], 3) > 0
@@ -0,0 +1,47 @@
+from utils.frame_sampler import AdaptiveFrameSampler
+
+
+def make_sampler():
+    return AdaptiveFrameSampler(
+        base_interval_ms=1000, max_interval_ms=4000, ok_streak=2, change_threshold=0.5
+    )
+
+
+def test_backs_off_after_ok_streak_and_caps():
+    sampler = make_sampler()
+    assert sampler.pending_update() == 1000
+
+    for _ in range(2):
+        sampler.record_verdict("ok")
+    assert sampler.pending_update() == 2000
+
+    for _ in range(6):
+        sampler.record_verdict("ok")
+    assert sampler.interval_ms == 4000
+    assert sampler.pending_update() == 4000
+    assert sampler.pending_update() is None
+
+
+def test_alert_and_frame_change_reset_interval():
+    sampler = make_sampler()
+    for _ in range(4):
+        sampler.record_verdict("ok")
+    sampler.record_verdict("alert")
+    assert sampler.interval_ms == 1000
+
+    for _ in range(2):
+        sampler.record_verdict("ok")
+    assert sampler.observe_frame("a" * 100) is False
+    assert sampler.observe_frame("a" * 110) is False
+    assert sampler.interval_ms == 2000
+    assert sampler.observe_frame("a" * 300) is True
+    assert sampler.interval_ms == 1000
+
+
+def test_errors_do_not_count_towards_streak():
+    sampler = make_sampler()
+    sampler.record_verdict("ok")
+    sampler.record_verdict("error")
+    assert sampler.interval_ms == 1000
+    sampler.record_verdict("ok")
+    assert sampler.interval_ms == 2000
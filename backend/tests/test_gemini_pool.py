@@ -0,0 +1,120 @@
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils.gemini_client import GeminiClientPool
+
+
+class FakeEndpoint:
+    """Stands in for a regional genai.Client."""
+
+    def __init__(self, location, delay=0.0, error=None):
+        self.location = location
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.models = SimpleNamespace(
+            generate_content=self._generate,
+            generate_content_stream=self._stream,
+        )
+
+    def _generate(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return SimpleNamespace(text=self.location)
+
+    def _stream(self, **kwargs):
+        yield self._generate(**kwargs)
+        yield SimpleNamespace(text="done")
+
+
+def make_pool(endpoints):
+    return GeminiClientPool(
+        locations=list(endpoints),
+        client_factory=lambda location: endpoints[location],
+        explore_rate=0.0,
+        rng=random.Random(0),
+    )
+
+
+def test_routes_to_fastest_region_after_measuring():
+    endpoints = {
+        "us-central1": FakeEndpoint("us-central1", delay=0.03),
+        "europe-west4": FakeEndpoint("europe-west4", delay=0.001),
+    }
+    pool = make_pool(endpoints)
+
+    pool.models.generate_content(model="m", contents="x")  # measures us-central1
+    pool.models.generate_content(model="m", contents="x")  # measures europe-west4
+    results = [pool.models.generate_content(model="m", contents="x").text for _ in range(5)]
+
+    assert results == ["europe-west4"] * 5
+    assert pool.best_location() == "europe-west4"
+
+
+def test_fails_over_on_location_errors_and_cools_region_down():
+    endpoints = {
+        "us-central1": FakeEndpoint("us-central1", error="400 FAILED_PRECONDITION: location not supported"),
+        "europe-west4": FakeEndpoint("europe-west4"),
+    }
+    pool = make_pool(endpoints)
+
+    assert pool.models.generate_content(model="m", contents="x").text == "europe-west4"
+    assert pool.models.generate_content(model="m", contents="x").text == "europe-west4"
+    assert endpoints["us-central1"].calls == 1
+    snapshot = pool.snapshot()
+    assert snapshot["us-central1"]["healthy"] is False
+    assert snapshot["europe-west4"]["healthy"] is True
+
+
+def test_other_errors_are_not_retried_elsewhere():
+    endpoints = {
+        "us-central1": FakeEndpoint("us-central1", error="429 RESOURCE_EXHAUSTED"),
+        "europe-west4": FakeEndpoint("europe-west4"),
+    }
+    pool = make_pool(endpoints)
+    with pytest.raises(RuntimeError, match="429"):
+        pool.models.generate_content(model="m", contents="x")
+    assert endpoints["europe-west4"].calls == 0
+
+
+def test_streams_fail_over_before_first_chunk_and_cached_calls_stay_home():
+    endpoints = {
+        "global": FakeEndpoint("global", error="503 UNAVAILABLE"),
+        "us-east5": FakeEndpoint("us-east5"),
+    }
+    pool = make_pool(endpoints)
+    chunks = [c.text for c in pool.models.generate_content_stream(model="m", contents="x")]
+    assert chunks == ["us-east5", "done"]
+
+    cached = {"config": SimpleNamespace(cached_content="cachedContents/1")}
+    assert pool.candidates(cached) == ["global"]
+
+
+def test_latency_is_compared_per_call_shape():
+    class Report:
+        pass
+
+    class Verdict:
+        pass
+
+    pool = make_pool({"us-central1": FakeEndpoint("us-central1"), "europe-west4": FakeEndpoint("europe-west4")})
+    report = {"model": "pro", "config": SimpleNamespace(response_schema=Report)}
+    verdict = {"model": "lite", "config": SimpleNamespace(response_schema=Verdict)}
+    pool.record("us-central1", latency_ms=800, series="call:lite:Verdict")
+    pool.record("europe-west4", latency_ms=1_200, series="call:lite:Verdict")
+    # us-central1 then serves a 20s report; it is still the faster region for verdicts
+    pool.record("us-central1", latency_ms=20_000, series="call:pro:Report")
+
+    assert pool.candidates(verdict)[0] == "us-central1"
+    assert pool.candidates(report)[0] == "europe-west4"  # not measured for reports yet
+    # Streams' time to first chunk is its own series, so both regions get measured for it
+    assert pool.candidates({"model": "lite"}, series="first_chunk:lite") == ["us-central1", "europe-west4"]
+    pool.record("us-central1", latency_ms=900, series="first_chunk:lite")
+    assert pool.candidates({"model": "lite"}, series="first_chunk:lite")[0] == "europe-west4"
+    assert pool.best_location() == "us-central1"
+    assert pool.snapshot()["us-central1"]["latency_ewma_ms"]["call:lite:Verdict"] == 800
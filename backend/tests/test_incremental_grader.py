@@ -0,0 +1,63 @@
+import asyncio
+
+from app.services.incremental_grader import GraderRegistry, question_answer_pairs
+from models.schemas import Message
+from models.analysis_schema import QuestionFeedback
+
+HISTORY = [
+    Message(role="interviewer", content="Design a URL shortener."),
+    Message(role="user", content="Base62 ids"),
+    Message(role="user", content="plus a cache."),
+    Message(role="interviewer", content="How do you scale reads?"),
+    Message(role="user", content="Replicas and a CDN."),
+    Message(role="interviewer", content="Any questions for me?"),
+]
+
+
+def test_pairs_join_multi_part_answers_and_skip_unanswered_questions():
+    assert question_answer_pairs(HISTORY) == [
+        ("Design a URL shortener.", "Base62 ids plus a cache."),
+        ("How do you scale reads?", "Replicas and a CDN."),
+    ]
+
+
+def test_breakdown_reuses_background_grades_and_fills_gaps():
+    graded = []
+
+    async def fake_grade(question, answer, role):
+        graded.append(question)
+        await asyncio.sleep(0.01)
+        return QuestionFeedback(
+            question_text=question, user_response_summary=answer, score=len(graded) * 10,
+            feedback="ok", better_response_suggestion="more depth",
+        )
+
+    async def scenario():
+        registry = GraderRegistry(grade=fake_grade)
+        grader = registry.get_or_create("s1", "Backend Engineer")
+        assert registry.get_or_create("s1", "ignored") is grader
+
+        # Graded during the interview; the second pair was never submitted
+        grader.submit("Design a URL shortener.", "Base62 ids plus a cache.")
+        await asyncio.sleep(0.02)
+        assert grader.graded == 1
+        return await grader.breakdown(HISTORY)
+
+    breakdown = asyncio.run(scenario())
+    assert graded == ["Design a URL shortener.", "How do you scale reads?"]
+    assert [q.question_text for q in breakdown] == graded
+
+
+def test_live_transcript_fragments_pair_as_the_web_client_posts_them():
+    # Live transcription appends chunks as " " + text; the web client strips each turn and
+    # joins with one space (closedQuestionAnswerPairs) so its posted grades are found again
+    live = [
+        Message(role="interviewer", content="Hi, I'm Sam. Tell me about  Kafka. "),
+        Message(role="interviewer", content=" Start with partitions."),
+        Message(role="user", content="Um  ordered per partition "),
+        Message(role="user", content=" keyed by user id."),
+        Message(role="interviewer", content="Next question."),
+    ]
+    assert question_answer_pairs(live) == [
+        ("Hi, I'm Sam. Tell me about  Kafka. Start with partitions.", "Um  ordered per partition keyed by user id."),
+    ]
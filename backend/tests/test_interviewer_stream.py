@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+
+import agents.interviewer as interviewer_module
+from agents.interviewer import InterviewerAgent
+from app.services.turn_orchestrator import TurnOrchestrator
+from models.schemas import Message
+from utils.config import config
+from utils.metrics import latency_snapshot
+from utils.session_manager import SessionManager
+
+HISTORY = [Message(role="interviewer", content="Design a cache."), Message(role="user", content="LRU in front of Redis.")]
+
+
+class FakeGemini:
+    def __init__(self, deltas, fail_after=None, error="429 RESOURCE_EXHAUSTED"):
+        self.deltas = deltas
+        self.fail_after = fail_after
+        self.error = error
+        self.models = self
+
+    def generate_content_stream(self, **kwargs):
+        for i, text in enumerate(self.deltas):
+            if i == self.fail_after:
+                raise RuntimeError(self.error)
+            yield SimpleNamespace(text=text)
+        if self.fail_after == len(self.deltas):
+            raise RuntimeError(self.error)
+
+
+class FakeGroq:
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        assert kwargs["stream"]
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))]) for d in self.deltas])
+
+
+def make_agent(monkeypatch, gemini, groq=None):
+    monkeypatch.setattr(interviewer_module, "get_gemini_pool", lambda: gemini)
+    monkeypatch.setattr(config, "GROQ_API_KEY", "test-groq" if groq else None)
+    agent = InterviewerAgent()
+    agent._groq_client = groq
+    return agent
+
+
+def collect(agent, by_sentence=False):
+    async def scenario():
+        return [chunk async for chunk in agent.stream_response(HISTORY, by_sentence=by_sentence)]
+    return asyncio.run(scenario())
+
+
+def ttft_count(provider):
+    return (latency_snapshot().get(f"interviewer.ttft.{provider}") or {"count": 0})["count"]
+
+
+def test_sentences_are_reassembled_across_deltas(monkeypatch):
+    agent = make_agent(monkeypatch, FakeGemini(["Good. Why ", "Redis? Walk me", " through eviction.", " Redis 7.2 helps"]))
+    before = ttft_count("gemini")
+    assert collect(agent, by_sentence=True) == ["Good.", "Why Redis?", "Walk me through eviction.", "Redis 7.2 helps"]
+    assert ttft_count("gemini") == before + 1
+
+
+def test_raw_deltas_pass_through_unchanged(monkeypatch):
+    agent = make_agent(monkeypatch, FakeGemini(["Go", "od. ", "Next?"]))
+    assert collect(agent) == ["Go", "od. ", "Next?"]
+
+
+def test_rate_limit_before_first_token_falls_back_to_groq(monkeypatch):
+    groq = FakeGroq(["From ", "Groq."])
+    agent = make_agent(monkeypatch, FakeGemini(["never sent"], fail_after=0), groq)
+    before = ttft_count("groq")
+    assert collect(agent) == ["From ", "Groq."]
+    assert groq.calls == 1 and ttft_count("groq") == before + 1
+
+
+def test_no_fallback_once_words_reached_the_candidate(monkeypatch):
+    groq = FakeGroq(["duplicate"])
+    agent = make_agent(monkeypatch, FakeGemini(["Partial answer"], fail_after=1), groq)
+    assert collect(agent) == ["Partial answer"]
+    assert groq.calls == 0
+
+
+def test_non_rate_limit_error_apologises_without_fallback(monkeypatch):
+    groq = FakeGroq(["unused"])
+    agent = make_agent(monkeypatch, FakeGemini([], fail_after=0, error="400 INVALID_ARGUMENT"), groq)
+    assert collect(agent) == ["I apologize, let's move on to the next topic."]
+    assert groq.calls == 0
+
+
+def test_streamed_turn_pushes_sentences_and_records_the_joined_reply(monkeypatch):
+    agent = make_agent(monkeypatch, FakeGemini(["First sen", "tence. Second", " one."]))
+    deltas = []
+
+    async def on_delta(chunk):
+        deltas.append(chunk)
+
+    async def scenario():
+        orchestrator = TurnOrchestrator(SessionManager(), agent)
+        reply = await orchestrator.handle_user_message("Hi", on_delta=on_delta, by_sentence=True)
+        return reply, orchestrator.session.get_full_history()
+
+    reply, history = asyncio.run(scenario())
+    assert deltas == ["First sentence.", "Second one."]
+    assert reply == history[-1].content == "First sentence. Second one."
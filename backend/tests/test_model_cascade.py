@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+import pytest
+
+from models.schemas import ShadowVerdict
+from utils.model_cascade import CascadeStats, ModelCascade
+
+
+def _parse(text):
+    return ShadowVerdict.model_validate_json(text).model_dump()
+
+
+def _run(cascade, answers):
+    calls = []
+
+    async def call(model):
+        calls.append(model)
+        return answers[model]
+
+    return asyncio.run(cascade.run(call, _parse)), calls
+
+
+def test_confident_answer_from_the_cheap_tier_is_kept():
+    cascade = ModelCascade("t", ["lite", "pro"], min_confidence=0.6, stats=CascadeStats())
+    value, calls = _run(cascade, {"lite": json.dumps({"status": "ok", "confidence": 0.9})})
+    assert calls == ["lite"] and value["status"] == "ok"
+
+
+def test_escalates_on_low_confidence_and_on_invalid_output():
+    stats = CascadeStats()
+    cascade = ModelCascade("t", ["lite", "mid", "pro"], min_confidence=0.6, stats=stats)
+    value, calls = _run(cascade, {
+        "lite": json.dumps({"status": "alert", "message": "Sit up", "confidence": 0.3}),
+        "mid": "not json",
+        "pro": json.dumps({"status": "ok", "confidence": 0.4}),
+    })
+    # The last tier's answer stands even when it is unsure
+    assert calls == ["lite", "mid", "pro"] and value["status"] == "ok"
+
+    snapshot = stats.snapshot()["t"]
+    assert snapshot["lite"]["escalated_low_confidence"] == 1
+    assert snapshot["mid"]["escalated_invalid"] == 1
+    assert snapshot["pro"]["accepted"] == 1
+
+
+def test_invalid_output_from_the_last_tier_raises():
+    cascade = ModelCascade("t", ["lite"], min_confidence=0.6, stats=CascadeStats())
+    with pytest.raises(ValueError):
+        _run(cascade, {"lite": json.dumps({"status": "maybe"})})
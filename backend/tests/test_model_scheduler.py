@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.model_scheduler import ModelCallScheduler, Priority, DeadlineExceeded
+
+
+def test_higher_priority_and_fair_sessions_run_first():
+    order = []
+    gate = threading.Event()
+
+    async def scenario():
+        scheduler = ModelCallScheduler(max_concurrency=1, deadlines={})
+        blocker = asyncio.ensure_future(scheduler.run(Priority.REPORT, gate.wait, session_id="x"))
+        await asyncio.sleep(0.01)
+
+        calls = [
+            (Priority.REPORT, "a", "report-a1"),
+            (Priority.REPORT, "a", "report-a2"),
+            (Priority.REPORT, "b", "report-b1"),
+            (Priority.INTERVIEWER, "c", "interviewer"),
+        ]
+        tasks = [
+            asyncio.ensure_future(scheduler.run(p, order.append, label, session_id=s))
+            for p, s, label in calls
+        ]
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+        return scheduler.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert order == ["interviewer", "report-a1", "report-b1", "report-a2"]
+    assert snapshot["classes"]["report"]["completed"] == 4
+    assert snapshot["running"] == 0
+
+
+def test_queued_call_is_dropped_after_deadline():
+    async def scenario():
+        scheduler = ModelCallScheduler(max_concurrency=1, deadlines={"shadow": 0.05})
+        blocker = asyncio.ensure_future(scheduler.run(Priority.REPORT, time.sleep, 0.2))
+        await asyncio.sleep(0.01)
+        with pytest.raises(DeadlineExceeded):
+            await scheduler.run(Priority.SHADOW, lambda: "late")
+        await blocker
+        return scheduler.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["classes"]["shadow"]["dropped"] == 1
+    assert snapshot["classes"]["shadow"]["completed"] == 0
+
+
+def test_stream_holds_its_slot_until_the_stream_ends():
+    order = []
+    gate = threading.Event()
+
+    def tokens():
+        yield "first"
+        gate.wait()
+        yield "last"
+
+    async def scenario():
+        scheduler = ModelCallScheduler(max_concurrency=1, deadlines={})
+        stream = scheduler.stream(Priority.INTERVIEWER, tokens)
+        received = [await stream.__anext__()]
+        other = asyncio.ensure_future(scheduler.run(Priority.INTERVIEWER, order.append, "other"))
+        await asyncio.sleep(0.02)
+        assert order == [] and scheduler.snapshot()["running"] == 1
+        gate.set()
+        received += [item async for item in stream]
+        await other
+        return received
+
+    assert asyncio.run(scenario()) == ["first", "last"]
+    assert order == ["other"]
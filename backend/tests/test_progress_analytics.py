@@ -0,0 +1,45 @@
+import numpy as np
+
+from app.services.progress_analytics import ProgressAnalytics
+from app.services.report_store import METRIC_COLUMNS
+
+
+class FakeStore:
+    def __init__(self, rows, cohort):
+        self.rows = rows
+        self.cohort = cohort
+
+    def load_metrics(self, user_id):
+        return self.rows
+
+    def cohort_metric_means(self):
+        return self.cohort
+
+
+def _row(t, score, pauses, role="SRE", persona="friendly"):
+    values = {col: score for col in METRIC_COLUMNS}
+    values["filled_pauses_count"] = values["long_pauses_count"] = pauses
+    return (t, *[values[col] for col in METRIC_COLUMNS], role, persona)
+
+
+def test_trend_moving_average_percentile_and_breakdowns():
+    rows = [_row(i, 50 + 5 * i, 10 - i, persona="tough" if i % 2 else "friendly") for i in range(5)]
+    cohort = [("a", *[40] * len(METRIC_COLUMNS)), ("b", *[80] * len(METRIC_COLUMNS)), ("u", *[60, 0, 0, 8, 8, 0, 0, 0])]
+    result = ProgressAnalytics(store=FakeStore(rows, cohort)).compute("u", window=3)
+
+    score = result["metrics"]["overall_score"]
+    assert score["latest"] == 70 and score["mean"] == 60
+    assert score["trend_per_session"] == 5.0
+    assert result["series"]["moving_average"]["overall_score"] == [50, 52.5, 55, 60, 65]
+
+    # 60 beats "a" (40), loses to "b" (80), ties itself; fewer pauses (8) beat 40 and 80
+    assert score["cohort_percentile"] == 50.0
+    assert result["metrics"]["long_pauses_count"]["cohort_percentile"] == 83.3
+
+    assert result["by_persona"]["tough"]["sessions"] == 2
+    assert result["by_persona"]["tough"]["overall_score"] == np.mean([55, 65])
+    assert result["by_role"]["SRE"]["sessions"] == 5
+
+
+def test_user_without_reports():
+    assert ProgressAnalytics(store=FakeStore([], [])).compute("nobody") == {"user_id": "nobody", "sessions": 0}
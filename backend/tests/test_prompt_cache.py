@@ -0,0 +1,145 @@
+import asyncio
+
+from utils.prompt_cache import PromptCacheManager, FakeCacheBackend
+
+LONG_PROMPT = "You are an interview coach. " * 200
+OTHER_PROMPT = "You are a strict interviewer. " * 200
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_manager(**kwargs):
+    backend, clock = FakeCacheBackend(), Clock()
+    defaults = dict(ttl_s=100, max_entries=8, min_tokens=50, enabled=True, clock=clock)
+    defaults.update(kwargs)
+    return PromptCacheManager(backend=backend, **defaults), backend, clock
+
+
+def test_prefix_is_registered_once_and_referenced_afterwards():
+    manager, backend, _ = make_manager()
+
+    async def scenario():
+        first = await manager.system_kwargs("model", LONG_PROMPT)
+        second = await manager.system_kwargs("model", LONG_PROMPT)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second == {"cached_content": "cachedContents/fake-1"}
+    assert backend.calls["create"] == 1
+    assert manager.stats["hits"] == 1
+
+
+def test_small_prompts_stay_inline():
+    manager, backend, _ = make_manager()
+    kwargs = asyncio.run(manager.system_kwargs("model", "short prompt"))
+    assert kwargs == {"system_instruction": "short prompt"}
+    assert backend.calls["create"] == 0
+
+
+def test_renewal_before_expiry_and_recreate_after():
+    manager, backend, clock = make_manager()
+
+    async def scenario():
+        name = await manager.resolve("model", LONG_PROMPT)
+        clock.now = 90  # inside the renewal margin
+        renewed = await manager.resolve("model", LONG_PROMPT)
+        clock.now = 500  # long expired
+        recreated = await manager.resolve("model", LONG_PROMPT)
+        return name, renewed, recreated
+
+    name, renewed, recreated = asyncio.run(scenario())
+    assert renewed == name
+    assert backend.calls["refresh"] == 1
+    assert recreated != name
+    assert backend.calls["create"] == 2
+
+
+def test_lru_eviction_and_forget_delete_provider_entries():
+    manager, backend, _ = make_manager(max_entries=1)
+
+    async def scenario():
+        await manager.resolve("model", LONG_PROMPT)
+        await manager.resolve("model", OTHER_PROMPT)
+        await manager.forget("model", OTHER_PROMPT)
+
+    asyncio.run(scenario())
+    assert manager.stats["evictions"] == 1
+    assert backend.calls["delete"] == 2
+    assert backend.entries == {}
+
+
+def test_shared_prefix_is_deleted_only_after_its_last_holder_forgets():
+    manager, backend, _ = make_manager(max_entries=1)
+
+    async def scenario():
+        # Two tabs with the same resume share one entry
+        first = await manager.resolve("model", LONG_PROMPT, holder="tab-1")
+        second = await manager.resolve("model", LONG_PROMPT, holder="tab-2")
+        await manager.forget("model", LONG_PROMPT, holder="tab-1")
+        still_cached = await manager.resolve("model", LONG_PROMPT, holder="tab-2")
+        # A held entry is not evicted to make room
+        await manager.resolve("model", OTHER_PROMPT)
+        held = dict(backend.entries)
+        await manager.forget("model", LONG_PROMPT, holder="tab-2")
+        return first, second, still_cached, held
+
+    first, second, still_cached, held = asyncio.run(scenario())
+    assert first == second == still_cached == "cachedContents/fake-1"
+    assert first in held and backend.calls["create"] == 2
+    assert first not in backend.entries
+    assert list(manager._locks) == [manager._key("model", OTHER_PROMPT)]
+
+
+def test_provider_errors_fall_back_to_inline():
+    manager, backend, _ = make_manager()
+
+    def refuse(*args):
+        raise RuntimeError("cached content is too small")
+
+    backend.create = refuse
+    kwargs = asyncio.run(manager.system_kwargs("model", LONG_PROMPT))
+    assert kwargs == {"system_instruction": LONG_PROMPT}
+    assert manager.stats["errors"] == 1
+
+
+def test_resume_interview_caches_one_prefix_per_session(monkeypatch):
+    from types import SimpleNamespace
+    import agents.interviewer as interviewer_module
+    from agents.interviewer import InterviewerAgent
+    from models.schemas import Message
+
+    calls = []
+
+    class FakeModels:
+        def generate_content(self, **kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(text="Tell me more.")
+
+    manager, backend, _ = make_manager()
+    monkeypatch.setattr(interviewer_module, "prompt_cache", manager)
+    monkeypatch.setattr(interviewer_module, "get_gemini_pool", lambda: SimpleNamespace(models=FakeModels()))
+    resume = (
+        "Experience\nBuilt a Kafka pipeline at Acme.\n\nProjects\nChess engine in Rust.\n\n"
+        "Skills\nPython, Go, Kubernetes\n"
+    )
+    agent = InterviewerAgent(scenario="kv_store", resume_context=resume)
+
+    async def scenario():
+        history = []
+        for answer in ["I used Kafka at Acme.", "My chess engine in Rust.", "Kubernetes mostly.", "No idea."]:
+            history += [Message(role="interviewer", content="Next question?"), Message(role="user", content=answer)]
+            await agent.generate_response(history)
+        await agent.close()
+
+    asyncio.run(scenario())
+    assert backend.calls["create"] == 1 and backend.calls["delete"] == 1
+    assert {c["config"].cached_content for c in calls} == {"cachedContents/fake-1"}
+    # The topic-specific slice travels with each turn instead
+    assert "Chess engine in Rust" in calls[1]["contents"] and "Chess engine" not in calls[0]["contents"]
+    assert "RESUME SECTIONS" not in calls[3]["contents"]
@@ -0,0 +1,141 @@
+import asyncio
+
+from app.services.analysis_jobs import AnalysisJobQueue, transcript_key
+from app.services.report_store import ReportStore
+from models.schemas import Message
+from models.analysis_schema import InterviewAnalysisReport
+from tests.test_analysis_jobs import REPORT
+
+HISTORY = [Message(role="interviewer", content="Hi"), Message(role="user", content="Hello")]
+
+
+def test_history_is_paginated_newest_first(tmp_path):
+    store = ReportStore(str(tmp_path / "reports.db"), batch_size=8, flush_interval_s=0.01)
+    report = InterviewAnalysisReport.model_validate(REPORT)
+    ids = [store.save_analysis(HISTORY, report, "SRE", f"hash-{i}", user_id="u1") for i in range(5)]
+    store.save_analysis(HISTORY, report, "SRE", "other", user_id="u2")
+    store.flush()
+
+    first = store.list_reports("u1", limit=3)
+    second = store.list_reports("u1", limit=3, before=first["next_cursor"])
+    assert [r["id"] for r in first["items"] + second["items"]] == ids[::-1]
+    assert second["next_cursor"] is None
+
+    stored = store.get_report(ids[0])
+    assert stored["report"]["overall_score"] == 70
+    assert stored["transcript"][1]["content"] == "Hello"
+    store.close()
+
+
+def test_reports_saved_in_the_same_instant_are_not_skipped(tmp_path, monkeypatch):
+    store = ReportStore(str(tmp_path / "reports.db"), flush_interval_s=0.01)
+    report = InterviewAnalysisReport.model_validate(REPORT)
+    monkeypatch.setattr("app.services.report_store.time.time", lambda: 1_700_000_000.25)
+    ids = {store.save_analysis(HISTORY, report, "SRE", f"hash-{i}", user_id="u1") for i in range(5)}
+    store.flush()
+
+    seen, cursor = [], None
+    while True:
+        page = store.list_reports("u1", limit=2, before=cursor)
+        seen += [r["id"] for r in page["items"]]
+        if not (cursor := page["next_cursor"]):
+            break
+    assert sorted(seen) == sorted(ids) and len(seen) == 5
+    store.close()
+
+
+def test_stored_report_is_reused_without_a_model_call(tmp_path):
+    store = ReportStore(str(tmp_path / "reports.db"), flush_interval_s=0.01)
+    calls = []
+
+    async def fake_analyze(history, role, session_id=None):
+        calls.append(role)
+        return InterviewAnalysisReport.model_validate(REPORT)
+
+    async def run_once():
+        # A fresh queue each time, as after a restart or once the in-memory TTL lapsed
+        queue = AnalysisJobQueue(analyze=fake_analyze, store=store)
+        return await queue.wait(await queue.submit(HISTORY, "SRE", user_id="u1"), timeout=1)
+
+    first = asyncio.run(run_once())
+    store.flush()
+    second = asyncio.run(run_once())
+
+    assert calls == ["SRE"]
+    assert second.status == "succeeded" and second.report_id == first.report_id
+    assert store.find_report_by_hash(transcript_key(HISTORY, "SRE"), "u1")[::2] == (first.report_id, "u1")
+    store.close()
+
+
+def test_concurrent_identical_submits_share_one_job_with_a_store(tmp_path):
+    store = ReportStore(str(tmp_path / "reports.db"), flush_interval_s=0.01)
+    calls = []
+
+    async def fake_analyze(history, role, session_id=None):
+        calls.append(role)
+        await asyncio.sleep(0.01)
+        return InterviewAnalysisReport.model_validate(REPORT)
+
+    async def scenario():
+        queue = AnalysisJobQueue(analyze=fake_analyze, store=store)
+        # A double-click: both submits are in the store lookup at the same time
+        first, second = await asyncio.gather(
+            queue.submit(HISTORY, "SRE", user_id="u1"), queue.submit(HISTORY, "SRE", user_id="u1")
+        )
+        await queue.wait(first, timeout=1)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first is second and calls == ["SRE"]
+    store.close()
+
+
+def test_reused_report_is_also_filed_under_the_new_user(tmp_path):
+    store = ReportStore(str(tmp_path / "reports.db"), flush_interval_s=0.01)
+    calls = []
+
+    async def fake_analyze(history, role, session_id=None):
+        calls.append(role)
+        return InterviewAnalysisReport.model_validate(REPORT)
+
+    async def run_as(user_id):
+        queue = AnalysisJobQueue(analyze=fake_analyze, store=store)
+        job = await queue.wait(await queue.submit(HISTORY, "SRE", user_id=user_id), timeout=1)
+        store.flush()
+        return job
+
+    first, second, again = asyncio.run(run_as("u1")), asyncio.run(run_as("u2")), asyncio.run(run_as("u2"))
+
+    assert calls == ["SRE"]
+    assert second.report_id != first.report_id and again.report_id == second.report_id
+    assert [r["id"] for r in store.list_reports("u2")["items"]] == [second.report_id]
+    assert store.get_report(second.report_id)["report"]["overall_score"] == 70
+    store.close()
+
+
+def test_failed_report_lookup_still_analyses_the_transcript():
+    class LockedStore:
+        def find_report_by_hash(self, key, user_id=None):
+            raise RuntimeError("database is locked")
+
+        def save_analysis(self, *args):
+            return "saved-id"
+
+    def unopenable_store():
+        raise RuntimeError("unable to open database file")
+
+    async def fake_analyze(history, role, session_id=None):
+        return InterviewAnalysisReport.model_validate(REPORT)
+
+    async def scenario(queue):
+        first = await queue.wait(await queue.submit(HISTORY, "SRE", user_id="u1"), timeout=1)
+        again = await queue.submit(HISTORY, "SRE", user_id="u1")
+        return first, again
+
+    for queue in (
+        AnalysisJobQueue(analyze=fake_analyze, store=LockedStore()),
+        AnalysisJobQueue(analyze=fake_analyze, store_factory=unopenable_store),
+    ):
+        first, again = asyncio.run(scenario(queue))
+        assert first.status == "succeeded" and first.finished_at is not None
+        assert again is first
@@ -0,0 +1,86 @@
+from utils.resume_index import ResumeIndex, get_resume_index, get_resume_index_by_id
+from utils.token_budget import estimate_tokens
+
+RESUME = """Jane Doe
+jane@example.com
+
+Professional Summary
+Backend engineer focused on distributed systems.
+
+Work Experience
+Acme Corp - Senior Engineer
+Built a Kafka event pipeline processing 2M events per day.
+Cut p99 latency of the payments API by 40% with Redis caching.
+
+Projects
+ShortLink: URL shortener in Go with base62 ids and PostgreSQL.
+Chess engine in Rust with alpha-beta search.
+
+Technical Skills
+Python, Go, Rust, Kafka, Redis, PostgreSQL, Kubernetes
+
+Education
+B.Tech Computer Science, 2019
+
+Extracurricular Activities
+Captain of the college chess club.
+"""
+
+
+def section(selection: str, name: str) -> bool:
+    return f"[{name.upper()}]" in selection
+
+
+def test_headings_split_the_resume_into_named_sections():
+    index = ResumeIndex(RESUME)
+    assert index.section_names() == [
+        "header", "summary", "experience", "projects", "skills", "education", "leadership",
+    ]
+    experience = index.sections[2]
+    assert experience.text.startswith("Acme Corp") and "Redis caching" in experience.text
+    assert experience.terms["kafka"] == 1
+
+
+def test_long_lines_that_mention_a_heading_word_are_not_headings():
+    index = ResumeIndex("Summary\nLed the skills and projects review board for the platform team.\n")
+    assert index.section_names() == ["summary"]
+
+
+def test_selection_fits_the_budget_and_keeps_resume_order():
+    index = ResumeIndex(RESUME)
+    for budget in (40, 80, 150):
+        selection = index.select(role="Backend Engineer", budget_tokens=budget)
+        assert estimate_tokens(selection) <= budget + 5  # joins between sections are not budgeted
+    selection = index.select(role="Backend Engineer", budget_tokens=10_000)
+    positions = [selection.index(f"[{name.upper()}]") for name in index.section_names()]
+    assert positions == sorted(positions)
+
+
+def test_priority_sections_win_a_tight_budget():
+    selection = ResumeIndex(RESUME).select(role="Engineer", budget_tokens=80)
+    assert section(selection, "experience")
+    assert not section(selection, "leadership") and not section(selection, "header")
+
+
+def test_oversized_section_is_cut_at_a_line_boundary():
+    long_experience = "Experience\n" + "\n".join(f"Shipped service number {i} to production." for i in range(60))
+    selection = ResumeIndex(long_experience).select(budget_tokens=120)
+    lines = selection.splitlines()
+    assert lines[0] == "[EXPERIENCE]" and 1 < len(lines) < 61
+    assert all(line.endswith("to production.") for line in lines[1:])
+
+
+def test_topic_pulls_in_the_matching_section():
+    index = ResumeIndex("Education\nB.Tech, thesis on consensus protocols\n\nExtracurricular\nChess club captain\n")
+    budget = max(s.tokens for s in index.sections) + 5  # room for one section
+    assert section(index.select(budget_tokens=budget), "education")
+    chess = index.select(topic="How did you lead the chess club?", budget_tokens=budget)
+    assert section(chess, "leadership") and not section(chess, "education")
+    assert index.select(topic="the weather", matching_only=True) == ""
+
+
+def test_indexes_are_cached_by_content_hash():
+    index = get_resume_index(RESUME)
+    assert get_resume_index(RESUME) is index
+    assert get_resume_index_by_id(index.resume_id) is index
+    assert get_resume_index_by_id("unknown") is None
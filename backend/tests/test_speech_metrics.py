@@ -0,0 +1,74 @@
+from models.schemas import Message
+from models.analysis_schema import SpeechAnalysis
+from utils.speech_metrics import apply_speech_metrics, compute_speech_metrics, describe_for_prompt
+
+T0 = 1_700_000_000_000  # Date.now() milliseconds, as the browser sends them
+
+
+def history(scale=1.0, offset=T0):
+    def at(ms):
+        return None if ms is None else (offset + ms) * scale
+
+    return [
+        Message(role="interviewer", content="Tell me about yourself.", timestamp=at(0), end_timestamp=at(2000)),
+        Message(
+            role="user", content="Um, I build backend services, uh, mostly in Python.",
+            timestamp=at(6000), end_timestamp=at(12000),
+        ),
+        Message(role="user", content="You know, like, caching matters.", timestamp=at(13000), end_timestamp=at(15000)),
+        Message(role="interviewer", content="Why?", timestamp=at(16000)),
+        Message(role="user", content="Latency.", timestamp=at(17000)),
+    ]
+
+
+def model_speech():
+    return SpeechAnalysis(
+        pace="Good", clarity=70, conciseness=60, stammering_frequency="Low",
+        filled_pauses_count=0, long_pauses_count=7,
+    )
+
+
+def test_metrics_from_millisecond_timestamps():
+    metrics = compute_speech_metrics(history())
+    # 14 words over 8s of timed speech; the last answer has no end and is not timed
+    assert metrics["words_per_minute"] == 105.0
+    assert metrics["pace"] == "Too Slow"
+    assert metrics["filled_pauses_count"] == 4
+    assert metrics["fillers"] == {"um": 1, "uh": 1, "you know": 1, "like": 1}
+    # 4s before the first answer is long; the 1s gap inside it and the 0.6s reply are not
+    assert metrics["long_pauses_count"] == 1
+    assert metrics["answer_latency_s"]["max"] == 4.0
+    assert [t["latency_s"] for t in metrics["turns"]] == [4.0, None, 0.62]
+    assert sum(metrics["pause_histogram"].values()) == 3
+
+
+def test_seconds_give_the_same_metrics():
+    in_ms = compute_speech_metrics(history())
+    in_s = compute_speech_metrics(history(scale=0.001))
+    relative = compute_speech_metrics(history(scale=0.001, offset=0))
+    for key in ("words_per_minute", "long_pauses_count", "answer_latency_s", "turns"):
+        assert in_ms[key] == in_s[key] == relative[key]
+
+
+def test_measured_values_overwrite_the_model():
+    speech = apply_speech_metrics(model_speech(), compute_speech_metrics(history()))
+    assert (speech.pace, speech.filled_pauses_count, speech.long_pauses_count) == ("Too Slow", 4, 1)
+    assert speech.words_per_minute == 105.0
+    assert speech.clarity == 70
+
+
+def test_without_timestamps_only_fillers_are_measured():
+    untimed = [Message(role=m.role, content=m.content) for m in history()]
+    metrics = compute_speech_metrics(untimed)
+    assert metrics["pace"] is None and metrics["long_pauses_count"] is None
+    speech = apply_speech_metrics(model_speech(), metrics)
+    assert (speech.pace, speech.filled_pauses_count, speech.long_pauses_count) == ("Good", 4, 7)
+    assert speech.words_per_minute is None
+
+
+def test_a_lone_timestamped_answer_measures_no_pauses():
+    metrics = compute_speech_metrics([Message(role="user", content="Hello there.", timestamp=T0)])
+    assert metrics["timed"] is False
+    assert metrics["long_pauses_count"] is None and metrics["pause_histogram"] is None
+    assert "long_pauses_count" not in describe_for_prompt(metrics)
+    assert apply_speech_metrics(model_speech(), metrics).long_pauses_count == 7
@@ -0,0 +1,50 @@
+from models.schemas import Message
+from utils.token_budget import estimate_tokens, fit_history, TokenLedger
+
+
+def line(msg):
+    return f"{msg.role}: {msg.content}"
+
+
+def make_history(turns: int) -> list[Message]:
+    history = []
+    for i in range(turns):
+        history.append(Message(role="interviewer", content=f"Question {i} about caching and sharding strategies?"))
+        history.append(Message(role="user", content=f"Answer {i}: I would use consistent hashing with replicas."))
+    return history
+
+
+def test_short_history_is_untouched():
+    history = make_history(2)
+    prompt = fit_history("interviewer", history, line, budget_tokens=1000)
+    assert prompt.omitted == 0
+    assert prompt.text == "\n".join(line(m) for m in history)
+
+
+def test_long_history_keeps_head_and_recent_turns_within_budget():
+    history = make_history(50)
+    first = fit_history("interviewer", history, line, fixed_text="system prompt", budget_tokens=300)
+    second = fit_history("interviewer", history, line, fixed_text="system prompt", budget_tokens=300)
+
+    assert first.text == second.text  # deterministic
+    assert first.estimated_tokens <= 300
+    assert first.omitted > 0
+    lines = first.text.splitlines()
+    assert lines[0] == line(history[0])
+    assert lines[1].startswith(f"[{first.omitted} earlier messages omitted; topics discussed:")
+    assert lines[-1] == line(history[-1])
+
+
+def test_ledger_compares_estimates_with_actuals():
+    ledger = TokenLedger()
+    ledger.record("feedback", 100, 110)
+    ledger.record("feedback", 100, None)
+    stats = ledger.snapshot()["feedback"]
+    assert stats["calls"] == 2
+    assert stats["avg_actual_tokens"] == 110
+    assert stats["actual_to_estimate_ratio"] == 1.1
+
+
+def test_estimate_grows_with_text():
+    assert estimate_tokens("") == 0
+    assert 8 <= estimate_tokens("The quick brown fox jumps over the lazy dog.") <= 12
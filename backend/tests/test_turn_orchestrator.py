@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from app.services.turn_orchestrator import TurnOrchestrator
+from utils.session_manager import SessionManager
+
+
+class FakeInterviewer:
+    def __init__(self):
+        self.closed = False
+
+    async def generate_response(self, history):
+        await asyncio.sleep(0.01)
+        return f"Reply to: {history[-1].content}"
+
+    async def close(self):
+        self.closed = True
+
+
+class SlowInstructor:
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def analyze_and_coach(self, history):
+        self.started.set()
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return f"Tip after {len(history)} messages"
+
+
+def test_slow_coaching_does_not_delay_the_reply():
+    coaching = []
+
+    async def on_coaching(tip):
+        coaching.append((tip, time.perf_counter()))
+
+    async def scenario():
+        instructor = SlowInstructor(delay_s=0.2)
+        orchestrator = TurnOrchestrator(SessionManager(), FakeInterviewer(), instructor, on_coaching)
+        start = time.perf_counter()
+        reply = await orchestrator.handle_user_message("I would shard by user id.")
+        replied_at = time.perf_counter()
+        assert instructor.started.is_set()  # coaching runs alongside, not after
+        await asyncio.gather(*orchestrator._coaching_tasks)
+        return reply, start, replied_at, orchestrator
+
+    reply, start, replied_at, orchestrator = asyncio.run(scenario())
+    assert reply == "Reply to: I would shard by user id."
+    assert replied_at - start < 0.15
+    # Coaching saw the same snapshot as the reply and arrived after it
+    assert coaching[0][0] == "Tip after 1 messages" and coaching[0][1] > replied_at
+    assert [m.role for m in orchestrator.session.get_full_history()] == ["user", "interviewer"]
+
+
+def test_close_cancels_pending_coaching():
+    coaching = []
+
+    async def on_coaching(tip):
+        coaching.append(tip)
+
+    async def scenario():
+        interviewer = FakeInterviewer()
+        instructor = SlowInstructor(delay_s=10)
+        orchestrator = TurnOrchestrator(SessionManager(), interviewer, instructor, on_coaching)
+        await orchestrator.handle_user_message("Hello")
+        await instructor.started.wait()
+        await asyncio.wait_for(orchestrator.close(), timeout=1)
+        return interviewer, instructor, orchestrator
+
+    interviewer, instructor, orchestrator = asyncio.run(scenario())
+    assert instructor.cancelled and interviewer.closed
+    assert coaching == [] and not orchestrator._coaching_tasks
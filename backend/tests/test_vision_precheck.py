@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from utils.vision_precheck import FramePrecheck
+
+cv2 = pytest.importorskip("cv2")
+
+
+def encode(image: np.ndarray) -> bytes:
+    ok, buffer = cv2.imencode(".jpg", image)
+    assert ok
+    return buffer.tobytes()
+
+
+def test_dark_frame_is_flagged_without_face_detection():
+    result = FramePrecheck(dark_threshold=40).check(encode(np.full((480, 640, 3), 10, np.uint8)))
+    assert result["status"] == "alert"
+    assert result["reason"] == "too_dark"
+    assert "face" not in result["timings_ms"]
+
+
+def test_local_alerts_speak_in_the_persona_tone():
+    dark = encode(np.full((480, 640, 3), 10, np.uint8))
+    messages = {persona: FramePrecheck(dark_threshold=40).check(dark, persona)["message"] for persona in
+                ("friendly", "tough", "roast", "unknown")}
+    assert len({messages["friendly"], messages["tough"], messages["roast"]}) == 3
+    assert messages["unknown"] == messages["friendly"]
+
+
+def test_missed_face_goes_to_the_model_with_a_hint():
+    rng = np.random.default_rng(0)
+    noise = rng.integers(100, 160, (240, 320, 3), dtype=np.uint8)
+    result = FramePrecheck().check(encode(noise))
+    assert result["status"] == "pass"
+    assert result["face_box"] is None and result["face_hint"] == "no_face"
+    assert set(result["timings_ms"]) == {"decode", "brightness", "face"}
+
+
+def test_undecodable_bytes_pass_through_to_the_model():
+    assert FramePrecheck().check(b"not a jpeg")["status"] == "pass"
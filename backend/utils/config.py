@@ -6,6 +6,12 @@ from pathlib import Path
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
+
+def _cascade_tiers(name: str, default: list[str]) -> list[str]:
+    override = os.getenv("MODEL_CASCADE_" + name.upper().replace(".", "_"))
+    return [m.strip() for m in override.split(",") if m.strip()] if override else default
+
+
 class Config:
     # --- Model Configuration ---
     SHADOW_MODEL = "gemini-3-flash-preview"
@@ -15,17 +21,160 @@ class Config:
     INSTRUCTOR_MODEL = SHADOW_MODEL
     FEEDBACK_MODEL = SHADOW_MODEL
 
+    # --- Model Cascade ---
+    # Per agent method: model tiers tried cheapest first. A call escalates to the next
+    # tier when the output fails schema validation or reports `confidence` below
+    # `min_confidence`. Override tiers with MODEL_CASCADE_<NAME>="model-a,model-b"
+    # (e.g. MODEL_CASCADE_SHADOW_FRAME). The interviewer streams to the candidate, so
+    # it cannot be re-asked after the fact and stays on a single model.
+    CASCADE_LITE_MODEL = os.getenv("CASCADE_LITE_MODEL", "gemini-2.5-flash-lite")
+    MODEL_CASCADES = {
+        "shadow.frame": {
+            "tiers": _cascade_tiers("shadow.frame", [CASCADE_LITE_MODEL, SHADOW_MODEL]),
+            "min_confidence": 0.6,
+        },
+        "shadow.pacing": {
+            "tiers": _cascade_tiers("shadow.pacing", [CASCADE_LITE_MODEL, SHADOW_MODEL]),
+            "min_confidence": 0.6,
+        },
+        "instructor.coach": {
+            "tiers": _cascade_tiers("instructor.coach", [CASCADE_LITE_MODEL, INSTRUCTOR_MODEL]),
+            "min_confidence": 0.5,
+        },
+        "feedback.report": {
+            "tiers": _cascade_tiers("feedback.report", [FEEDBACK_MODEL]),
+            "min_confidence": None,
+        },
+        "feedback.question": {
+            "tiers": _cascade_tiers("feedback.question", [FEEDBACK_MODEL]),
+            "min_confidence": None,
+        },
+    }
+
     # Groq Fallback (for when Gemini rate limits are hit)
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
     GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
 
+    # --- Shadow Frame Sampling ---
+    # The server drives the webcam sampling rate: it backs off after a streak of
+    # "ok" verdicts and snaps back to the base interval on alerts or scene changes.
+    SHADOW_FRAME_INTERVAL_MS = int(os.getenv("SHADOW_FRAME_INTERVAL_MS", "2000"))
+    SHADOW_FRAME_MAX_INTERVAL_MS = int(os.getenv("SHADOW_FRAME_MAX_INTERVAL_MS", "16000"))
+    SHADOW_OK_STREAK = int(os.getenv("SHADOW_OK_STREAK", "3"))
+    SHADOW_FRAME_CHANGE_THRESHOLD = float(os.getenv("SHADOW_FRAME_CHANGE_THRESHOLD", "0.3"))
+
+    # --- Shadow Frame Precheck (local CPU, before the vision model) ---
+    SHADOW_PRECHECK_ENABLED = os.getenv("SHADOW_PRECHECK_ENABLED", "true").lower() == "true"
+    SHADOW_DARK_THRESHOLD = float(os.getenv("SHADOW_DARK_THRESHOLD", "40"))  # mean luma, 0-255
+    SHADOW_OFF_CENTER_THRESHOLD = float(os.getenv("SHADOW_OFF_CENTER_THRESHOLD", "0.25"))  # fraction of frame
+
+    # --- Shadow Frame Normalisation (before upload to the vision model) ---
+    SHADOW_FRAME_NORMALIZE_ENABLED = os.getenv("SHADOW_FRAME_NORMALIZE_ENABLED", "true").lower() == "true"
+    SHADOW_FRAME_MAX_SIDE = int(os.getenv("SHADOW_FRAME_MAX_SIDE", "384"))
+    SHADOW_FRAME_JPEG_QUALITY = int(os.getenv("SHADOW_FRAME_JPEG_QUALITY", "70"))
+    SHADOW_FRAME_CROP_TO_SUBJECT = os.getenv("SHADOW_FRAME_CROP_TO_SUBJECT", "true").lower() == "true"
+    FRAME_WORKERS = int(os.getenv("FRAME_WORKERS", "2"))
+
+    # --- Model Call Scheduling ---
+    # Concurrent model calls per process; everything else waits in priority order.
+    MODEL_MAX_CONCURRENCY = int(os.getenv("MODEL_MAX_CONCURRENCY", "8"))
+    # Seconds a queued call may wait before it is dropped (None = never dropped).
+    # A shadow alert about a frame from 5s ago is worthless; an interviewer turn never is.
+    MODEL_PRIORITY_DEADLINES = {
+        "interviewer": None,
+        "shadow": float(os.getenv("SHADOW_CALL_DEADLINE_S", "4")),
+        "instructor": float(os.getenv("INSTRUCTOR_CALL_DEADLINE_S", "15")),
+        "report": None,
+        "resume": float(os.getenv("RESUME_CALL_DEADLINE_S", "120")),
+    }
+
+    # --- Interview Analysis Jobs ---
+    ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+    ANALYSIS_MAX_PENDING = int(os.getenv("ANALYSIS_MAX_PENDING", "32"))
+    ANALYSIS_RESULT_TTL_S = int(os.getenv("ANALYSIS_RESULT_TTL_S", "900"))
+    # Bulk (NDJSON) analysis: parallel records, provider calls per minute, 429 retries
+    BULK_ANALYSIS_CONCURRENCY = int(os.getenv("BULK_ANALYSIS_CONCURRENCY", "4"))
+    BULK_ANALYSIS_RPM = float(os.getenv("BULK_ANALYSIS_RPM", "60"))
+    BULK_ANALYSIS_MAX_RETRIES = int(os.getenv("BULK_ANALYSIS_MAX_RETRIES", "3"))
+    BULK_ANALYSIS_MAX_RECORD_BYTES = int(os.getenv("BULK_ANALYSIS_MAX_RECORD_BYTES", "2000000"))
+
+    # --- Resume Context ---
+    # Max tokens of resume sections pasted into interviewer prompts
+    RESUME_PROMPT_TOKEN_BUDGET = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", "1000"))
+    # Sections matching the candidate's latest answer, sent with each text-interview turn
+    # (outside the session's cached system prefix, so topic shifts don't re-create it)
+    RESUME_FOCUS_TOKEN_BUDGET = int(os.getenv("RESUME_FOCUS_TOKEN_BUDGET", "250"))
+
+    # --- Prompt Token Budgets (estimated input tokens per request class) ---
+    TOKEN_BUDGETS = {
+        "interviewer": int(os.getenv("INTERVIEWER_TOKEN_BUDGET", "8000")),
+        "instructor": int(os.getenv("INSTRUCTOR_TOKEN_BUDGET", "6000")),
+        "feedback": int(os.getenv("FEEDBACK_TOKEN_BUDGET", "32000")),
+        "pacing": int(os.getenv("PACING_TOKEN_BUDGET", "1200")),
+        "question": int(os.getenv("QUESTION_TOKEN_BUDGET", "2500")),
+        "aggregate": int(os.getenv("AGGREGATE_TOKEN_BUDGET", "6000")),
+        "default": 8000,
+    }
+    # Any single message longer than this is cut in the middle
+    MAX_MESSAGE_TOKENS = int(os.getenv("MAX_MESSAGE_TOKENS", "1500"))
+
+    # --- Provider Context Caching (static system prompts) ---
+    CONTEXT_CACHE_ENABLED = os.getenv("CONTEXT_CACHE_ENABLED", "true").lower() == "true"
+    CONTEXT_CACHE_TTL_S = int(os.getenv("CONTEXT_CACHE_TTL_S", "1800"))
+    CONTEXT_CACHE_MAX_ENTRIES = int(os.getenv("CONTEXT_CACHE_MAX_ENTRIES", "64"))
+    # Gemini refuses to cache prompts smaller than this; they are sent inline instead
+    CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("CONTEXT_CACHE_MIN_TOKENS", "1024"))
+
+    # --- Incremental Grading ---
+    # Each answered question is graded in the background during the interview, so the
+    # final report only needs a short aggregation call. Graders are kept per session id.
+    INCREMENTAL_GRADING_ENABLED = os.getenv("INCREMENTAL_GRADING_ENABLED", "true").lower() == "true"
+    INCREMENTAL_GRADER_TTL_S = int(os.getenv("INCREMENTAL_GRADER_TTL_S", "3600"))
+    INCREMENTAL_GRADER_MAX_SESSIONS = int(os.getenv("INCREMENTAL_GRADER_MAX_SESSIONS", "1000"))
+
+    # --- Speech Metrics ---
+    # Measured from message timestamps and written into the report's speech_analysis
+    SPEECH_LONG_PAUSE_S = float(os.getenv("SPEECH_LONG_PAUSE_S", "3.0"))
+    SPEECH_SLOW_WPM = float(os.getenv("SPEECH_SLOW_WPM", "110"))
+    SPEECH_FAST_WPM = float(os.getenv("SPEECH_FAST_WPM", "170"))
+    # Used to estimate when a question ended if the client did not send end_timestamp
+    SPEECH_INTERVIEWER_WPM = float(os.getenv("SPEECH_INTERVIEWER_WPM", "160"))
+
+    # --- Report Store (SQLite) ---
+    REPORT_DB_PATH = os.getenv("REPORT_DB_PATH", str(Path(__file__).parent.parent / "data" / "shadow_instructor.db"))
+    # Cohort averages behind the progress percentiles are recomputed at most this often
+    ANALYTICS_COHORT_TTL_S = int(os.getenv("ANALYTICS_COHORT_TTL_S", "300"))
+
+    # --- Admin Diagnostics ---
+    # Sent as the X-Admin-Key header; /admin/diagnostics is disabled (404) when unset
+    ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+    ROUTE_CPU_ACCOUNTING = os.getenv("ROUTE_CPU_ACCOUNTING", "true").lower() == "true"
+
     # --- Server ---
     HOST = os.getenv("HOST", "127.0.0.1")
     PORT = int(os.getenv("PORT", "8000"))
+    # Production mode (`python run_server.py --prod` / the Docker image). Analysis jobs,
+    # resume indexes and interview graders live in process memory, so more than one
+    # worker needs sticky routing (by session / job id) in front of it.
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+    KEEP_ALIVE_S = int(os.getenv("KEEP_ALIVE_S", "75"))  # longer than typical LB idle timeouts
+    WS_PING_INTERVAL_S = float(os.getenv("WS_PING_INTERVAL_S", "20"))
+    WS_PING_TIMEOUT_S = float(os.getenv("WS_PING_TIMEOUT_S", "30"))
+    # On SIGTERM: hint /ws/shadow clients to reconnect and let in-flight model calls finish
+    DRAIN_TIMEOUT_S = float(os.getenv("DRAIN_TIMEOUT_S", "20"))
+    DRAIN_RECONNECT_AFTER_MS = int(os.getenv("DRAIN_RECONNECT_AFTER_MS", "1500"))
+    # Then uvicorn waits this long for remaining connections before cancelling them
+    GRACEFUL_SHUTDOWN_TIMEOUT_S = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT_S", "10"))
 
     # --- Vertex AI ---
     GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT")
-    GOOGLE_CLOUD_LOCATION = "global"
+    # Comma-separated; the first is the home location (token endpoint, prompt caches).
+    # Model calls go to the fastest healthy location and fail over between them.
+    GOOGLE_CLOUD_LOCATIONS = [
+        loc.strip() for loc in os.getenv("GOOGLE_CLOUD_LOCATIONS", "global").split(",") if loc.strip()
+    ] or ["global"]
+    GOOGLE_CLOUD_LOCATION = GOOGLE_CLOUD_LOCATIONS[0]
+    GEMINI_REGION_COOLDOWN_S = float(os.getenv("GEMINI_REGION_COOLDOWN_S", "60"))
     GOOGLE_APPLICATION_CREDENTIALS_JSON = os.getenv("GOOGLE_APPLICATION_CREDENTIALS_JSON")
 
 config = Config()
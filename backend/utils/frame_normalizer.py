@@ -0,0 +1,94 @@
+"""
+Normalises webcam frames before they are uploaded to the vision model: crop to the
+candidate (head and shoulders around the detected face), downscale to a target size
+and re-encode at a tuned JPEG quality. Runs on a small dedicated thread pool.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from utils.config import config
+from utils.metrics import record_latency
+
+
+class FrameNormalizer:
+    def __init__(
+        self,
+        max_side: int = config.SHADOW_FRAME_MAX_SIDE,
+        jpeg_quality: int = config.SHADOW_FRAME_JPEG_QUALITY,
+        crop_to_subject: bool = config.SHADOW_FRAME_CROP_TO_SUBJECT,
+        workers: int = config.FRAME_WORKERS,
+    ):
+        self.max_side = max_side
+        self.jpeg_quality = jpeg_quality
+        self.crop_to_subject = crop_to_subject
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="frame-normalize")
+        self._lock = threading.Lock()
+        self._stats = {"frames": 0, "passthrough": 0, "bytes_in": 0, "bytes_out": 0}
+
+    async def normalize(self, image_bytes: bytes, face_box: tuple | None = None) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.normalize_sync, image_bytes, face_box)
+
+    def normalize_sync(self, image_bytes: bytes, face_box: tuple | None = None) -> bytes:
+        """Returns the re-encoded frame, or the original bytes if that would not be smaller."""
+        start = time.perf_counter()
+        try:
+            output = self._transcode(image_bytes, face_box)
+        except Exception as e:
+            print(f"[FrameNormalizer] Falling back to original frame: {e}")
+            output = None
+
+        passthrough = output is None or len(output) >= len(image_bytes)
+        if passthrough:
+            output = image_bytes
+        record_latency("shadow.normalize", (time.perf_counter() - start) * 1000)
+
+        with self._lock:
+            self._stats["frames"] += 1
+            self._stats["passthrough"] += int(passthrough)
+            self._stats["bytes_in"] += len(image_bytes)
+            self._stats["bytes_out"] += len(output)
+        return output
+
+    def _transcode(self, image_bytes: bytes, face_box: tuple | None) -> bytes | None:
+        try:
+            import cv2
+        except ImportError:
+            return None
+
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            return None
+
+        if self.crop_to_subject and face_box:
+            image = image[self._subject_region(image.shape, face_box)]
+
+        height, width = image.shape[:2]
+        scale = self.max_side / max(height, width)
+        if scale < 1.0:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        return buffer.tobytes() if ok else None
+
+    @staticmethod
+    def _subject_region(shape: tuple, face_box: tuple) -> tuple[slice, slice]:
+        """Head-and-shoulders box around the face, so posture is still visible."""
+        height, width = shape[:2]
+        x, y, w, h = face_box
+        left = max(int(x - 1.0 * w), 0)
+        right = min(int(x + 2.0 * w), width)
+        top = max(int(y - 0.6 * h), 0)
+        bottom = min(int(y + 3.0 * h), height)
+        return slice(top, bottom), slice(left, right)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["bytes_saved_ratio"] = (
+            round(1 - stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else 0.0
+        )
+        return stats
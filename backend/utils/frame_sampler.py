@@ -0,0 +1,75 @@
+from utils.config import config
+
+
+class AdaptiveFrameSampler:
+    """
+    Decides how often the client should send webcam frames for one shadow session.
+
+    A streak of "ok" verdicts doubles the interval (up to a ceiling); an alert or a
+    large change in the incoming frame snaps it back to the base interval.
+    """
+
+    def __init__(
+        self,
+        base_interval_ms: int = config.SHADOW_FRAME_INTERVAL_MS,
+        max_interval_ms: int = config.SHADOW_FRAME_MAX_INTERVAL_MS,
+        ok_streak: int = config.SHADOW_OK_STREAK,
+        change_threshold: float = config.SHADOW_FRAME_CHANGE_THRESHOLD,
+        backoff_factor: float = 2.0,
+    ):
+        self.base_interval_ms = base_interval_ms
+        self.max_interval_ms = max(max_interval_ms, base_interval_ms)
+        self.ok_streak = max(ok_streak, 1)
+        self.change_threshold = change_threshold
+        self.backoff_factor = backoff_factor
+
+        self._interval_ms: int = base_interval_ms
+        self._sent_interval_ms: int | None = None
+        self._ok_count: int = 0
+        self._last_frame_size: int | None = None
+
+    @property
+    def interval_ms(self) -> int:
+        return self._interval_ms
+
+    def observe_frame(self, base64_image: str) -> bool:
+        """
+        Records an incoming frame and returns True if it differs a lot from the last one.
+        JPEG payload size tracks scene content closely, so a relative size jump is a
+        cheap proxy for "the candidate moved or left the frame".
+        """
+        size = len(base64_image or "")
+        previous = self._last_frame_size
+        self._last_frame_size = size
+
+        if not previous:
+            return False
+
+        changed = abs(size - previous) / previous >= self.change_threshold
+        if changed:
+            self._reset()
+        return changed
+
+    def record_verdict(self, status: str | None):
+        """Updates the interval from the vision verdict ("ok", "alert" or "error")."""
+        if status == "alert":
+            self._reset()
+        elif status == "ok":
+            self._ok_count += 1
+            if self._ok_count >= self.ok_streak:
+                self._ok_count = 0
+                self._interval_ms = min(
+                    int(self._interval_ms * self.backoff_factor), self.max_interval_ms
+                )
+        # Errors say nothing about the candidate, so they leave the streak untouched.
+
+    def pending_update(self) -> int | None:
+        """Returns the new interval if the client has not been told about it yet."""
+        if self._interval_ms == self._sent_interval_ms:
+            return None
+        self._sent_interval_ms = self._interval_ms
+        return self._interval_ms
+
+    def _reset(self):
+        self._ok_count = 0
+        self._interval_ms = self.base_interval_ms
@@ -1,5 +1,9 @@
 
 import json
+import random
+import threading
+import time
+from typing import Callable
 from google import genai
 from google.oauth2 import service_account
 from utils.config import config
@@ -39,3 +43,208 @@ def get_gemini_client(location: str | None = None) -> genai.Client:
         location=target_location,
         credentials=creds,
     )
+
+
+# Errors that mean "this region can't serve the request right now" — try another one.
+FAILOVER_ERRORS = ["location", "precondition", "unavailable", "503"]
+
+
+def is_failover_error(error: Exception) -> bool:
+    error_str = str(error).lower()
+    return any(k in error_str for k in FAILOVER_ERRORS)
+
+
+def latency_series(kwargs: dict | None, kind: str = "call") -> str:
+    """
+    Latency is only comparable between calls of the same shape: `kind` separates full
+    calls from streams' time to first chunk, and model + response schema separate a
+    20 s report from a 1 s shadow verdict.
+    """
+    kwargs = kwargs or {}
+    schema = getattr(kwargs.get("config"), "response_schema", None)
+    series = f"{kind}:{kwargs.get('model', '?')}"
+    return f"{series}:{schema.__name__}" if isinstance(schema, type) else series
+
+
+class _RegionStats:
+    def __init__(self):
+        self.latency_ewma_ms: dict[str, float] = {}  # per latency series
+        self.error_ewma = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+
+class _RoutedModels:
+    """Drop-in for `client.models` that routes each call through the pool."""
+
+    def __init__(self, pool: "GeminiClientPool"):
+        self._pool = pool
+
+    def generate_content(self, **kwargs):
+        return self._pool.call(lambda client: client.models.generate_content(**kwargs), kwargs)
+
+    def generate_content_stream(self, **kwargs):
+        # Latency is time to first chunk; failover is only possible before it arrives.
+        series = latency_series(kwargs, "first_chunk")
+        for location in self._pool.candidates(kwargs, series):
+            started = time.perf_counter()
+            try:
+                stream = self._pool.client_for(location).models.generate_content_stream(**kwargs)
+                first = next(stream, None)
+            except Exception as e:
+                self._pool.record(location, error=e)
+                if is_failover_error(e):
+                    continue
+                raise
+            self._pool.record(location, latency_ms=(time.perf_counter() - started) * 1000, series=series)
+            if first is not None:
+                yield first
+                yield from stream
+            return
+        raise RuntimeError("No Gemini region available")
+
+
+class GeminiClientPool:
+    """
+    Keeps one client per configured Vertex AI location and tracks an error EWMA per
+    location and a latency EWMA per location and `latency_series`. Each call goes to
+    the location that is fastest for calls like it and fails over to the next on
+    location/precondition/unavailable errors.
+
+    Calls that reference a provider cache (`cached_content`) are pinned to the home
+    location, since cached content only exists in the region that created it.
+    """
+
+    def __init__(
+        self,
+        locations: list[str] | None = None,
+        client_factory: Callable[[str], object] = get_gemini_client,
+        alpha: float = 0.3,
+        cooldown_s: float = config.GEMINI_REGION_COOLDOWN_S,
+        explore_rate: float = 0.05,
+        rng: random.Random | None = None,
+    ):
+        self.locations = list(locations or config.GOOGLE_CLOUD_LOCATIONS)
+        self.home_location = self.locations[0]
+        self.alpha = alpha
+        self.cooldown_s = cooldown_s
+        self.explore_rate = explore_rate
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._clients = {location: client_factory(location) for location in self.locations}
+        self._stats = {location: _RegionStats() for location in self.locations}
+        self.models = _RoutedModels(self)
+
+    def client_for(self, location: str):
+        return self._clients[location]
+
+    def _relative_latency(self, location: str) -> float:
+        """Mean of this location's latency / the all-location average, over every series."""
+        ratios = []
+        for series, latency in self._stats[location].latency_ewma_ms.items():
+            measured = [s.latency_ewma_ms[series] for s in self._stats.values() if series in s.latency_ewma_ms]
+            ratios.append(latency / (sum(measured) / len(measured)))
+        return sum(ratios) / len(ratios) if ratios else 0.0
+
+    def candidates(self, kwargs: dict | None = None, series: str | None = None) -> list[str]:
+        """
+        Locations in the order they should be tried for this call. Without `kwargs`
+        (e.g. picking a region for the browser), locations are compared on latency
+        relative to the other locations, across all series.
+        """
+        config_obj = (kwargs or {}).get("config")
+        if getattr(config_obj, "cached_content", None):
+            return [self.home_location]
+
+        series = series or (latency_series(kwargs) if kwargs is not None else None)
+        now = time.monotonic()
+        with self._lock:
+            def score(location: str) -> float:
+                stats = self._stats[location]
+                if series is None:
+                    latency = self._relative_latency(location)
+                else:
+                    latency = stats.latency_ewma_ms.get(series, 0.0)  # unmeasured regions get tried first
+                return latency * (1 + 4 * stats.error_ewma)
+
+            healthy = [loc for loc in self.locations if self._stats[loc].cooldown_until <= now]
+            cooling = [loc for loc in self.locations if loc not in healthy]
+            ordered = sorted(healthy, key=score)
+            if len(ordered) > 1 and self._rng.random() < self.explore_rate:
+                # Occasionally probe a slower region so its EWMA doesn't go stale
+                ordered.insert(0, ordered.pop(self._rng.randrange(1, len(ordered))))
+            return ordered + sorted(cooling, key=lambda loc: self._stats[loc].cooldown_until)
+
+    def best_location(self) -> str:
+        return self.candidates()[0]
+
+    def call(self, fn: Callable[[object], object], kwargs: dict | None = None):
+        last_error: Exception | None = None
+        series = latency_series(kwargs)
+        for location in self.candidates(kwargs, series):
+            started = time.perf_counter()
+            try:
+                result = fn(self._clients[location])
+            except Exception as e:
+                self.record(location, error=e)
+                if is_failover_error(e):
+                    last_error = e
+                    continue
+                raise
+            self.record(location, latency_ms=(time.perf_counter() - started) * 1000, series=series)
+            return result
+        raise last_error or RuntimeError("No Gemini region available")
+
+    def record(
+        self,
+        location: str,
+        latency_ms: float | None = None,
+        error: Exception | None = None,
+        series: str = "call:?",
+    ):
+        with self._lock:
+            stats = self._stats[location]
+            stats.calls += 1
+            failed = error is not None
+            stats.error_ewma = (1 - self.alpha) * stats.error_ewma + self.alpha * (1.0 if failed else 0.0)
+            if failed:
+                stats.failures += 1
+                if is_failover_error(error):
+                    stats.cooldown_until = time.monotonic() + self.cooldown_s
+            elif latency_ms is not None:
+                previous = stats.latency_ewma_ms.get(series)
+                stats.latency_ewma_ms[series] = (
+                    latency_ms if previous is None
+                    else (1 - self.alpha) * previous + self.alpha * latency_ms
+                )
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                location: {
+                    "latency_ewma_ms": {series: round(ms, 1) for series, ms in sorted(stats.latency_ewma_ms.items())},
+                    "error_ewma": round(stats.error_ewma, 3),
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                    "healthy": stats.cooldown_until <= now,
+                }
+                for location, stats in self._stats.items()
+            }
+
+
+_pool: GeminiClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_gemini_pool() -> GeminiClientPool:
+    """
+    Process-wide location-aware client. Exposes `.models` like a genai.Client, so
+    agents use it unchanged. Raises if credentials are not configured.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = GeminiClientPool()
+        return _pool
@@ -0,0 +1,57 @@
+"""
+In-process latency metrics. Each named series keeps a rolling window of samples
+so the metrics endpoint can report recent percentiles without any external backend.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class LatencyRecorder:
+    def __init__(self, window: int = 500):
+        self._samples: deque = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, ms: float):
+        self._samples.append(ms)
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count, "avg_ms": None, "p50_ms": None, "p95_ms": None}
+
+        def pct(p: float) -> float:
+            return round(samples[min(int(p * len(samples)), len(samples) - 1)], 1)
+
+        return {
+            "count": self.count,
+            "avg_ms": round(sum(samples) / len(samples), 1),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+        }
+
+
+_recorders: dict[str, LatencyRecorder] = {}
+
+
+def record_latency(name: str, ms: float):
+    recorder = _recorders.get(name)
+    if recorder is None:
+        recorder = _recorders[name] = LatencyRecorder()
+    recorder.record(ms)
+
+
+@contextmanager
+def timed(name: str):
+    """Records the wall time of the enclosed block under `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_latency(name, (time.perf_counter() - start) * 1000)
+
+
+def latency_snapshot() -> dict:
+    return {name: recorder.snapshot() for name, recorder in sorted(_recorders.items())}
@@ -0,0 +1,105 @@
+"""
+Model cascades: answer with the cheapest model tier first and escalate only when
+the answer is unusable (fails schema validation) or unsure (`confidence` below the
+cascade's threshold). Tiers and thresholds are configured per agent method in
+`config.MODEL_CASCADES`.
+
+Provider errors (rate limits, outages) are not escalated here; they propagate so
+the agents' existing Groq fallback still applies.
+"""
+
+import threading
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+from utils.config import config
+
+T = TypeVar("T")
+
+
+def output_confidence(value: Any) -> float | None:
+    """`confidence` from a parsed dict or model, if the output carries one."""
+    confidence = value.get("confidence") if isinstance(value, dict) else getattr(value, "confidence", None)
+    try:
+        return float(confidence) if confidence is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class CascadeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: dict[tuple[str, str], dict] = {}
+
+    def record(self, cascade: str, model: str, outcome: str, latency_ms: float):
+        """`outcome`: accepted | low_confidence | invalid."""
+        with self._lock:
+            stats = self._tiers.setdefault((cascade, model), {
+                "calls": 0, "accepted": 0, "low_confidence": 0, "invalid": 0, "latency_ms_total": 0.0,
+            })
+            stats["calls"] += 1
+            stats[outcome] += 1
+            stats["latency_ms_total"] += latency_ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result: dict[str, dict] = {}
+            for (cascade, model), stats in sorted(self._tiers.items()):
+                result.setdefault(cascade, {})[model] = {
+                    "calls": stats["calls"],
+                    "accepted": stats["accepted"],
+                    "escalated_low_confidence": stats["low_confidence"],
+                    "escalated_invalid": stats["invalid"],
+                    "avg_latency_ms": round(stats["latency_ms_total"] / stats["calls"], 1),
+                }
+            return result
+
+
+cascade_stats = CascadeStats()
+
+
+class ModelCascade:
+    def __init__(
+        self,
+        name: str,
+        tiers: list[str],
+        min_confidence: float | None = None,
+        stats: CascadeStats = cascade_stats,
+    ):
+        if not tiers:
+            raise ValueError(f"Model cascade '{name}' needs at least one tier")
+        self.name = name
+        self.tiers = tiers
+        self.min_confidence = min_confidence
+        self.stats = stats
+
+    @classmethod
+    def from_config(cls, name: str) -> "ModelCascade":
+        settings = config.MODEL_CASCADES[name]
+        return cls(name, settings["tiers"], settings.get("min_confidence"))
+
+    async def run(self, call: Callable[[str], Awaitable[str]], parse: Callable[[str], T]) -> T:
+        """
+        `call(model)` returns the raw model text; `parse(text)` validates it and raises on
+        bad output. The last tier's answer is returned even when it is unsure; if the last
+        tier's output is invalid, the validation error is raised.
+        """
+        for tier, model in enumerate(self.tiers):
+            last = tier == len(self.tiers) - 1
+            started = time.perf_counter()
+            text = await call(model)
+            try:
+                value = parse(text)
+            except Exception:
+                self.stats.record(self.name, model, "invalid", (time.perf_counter() - started) * 1000)
+                if last:
+                    raise
+                continue
+
+            confidence = output_confidence(value)
+            unsure = self.min_confidence is not None and confidence is not None and confidence < self.min_confidence
+            self.stats.record(
+                self.name, model, "low_confidence" if unsure and not last else "accepted",
+                (time.perf_counter() - started) * 1000,
+            )
+            if not unsure or last:
+                return value
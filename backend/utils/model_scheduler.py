@@ -0,0 +1,244 @@
+"""
+Process-wide scheduler for every model call (Gemini and Groq).
+
+Calls are queued by priority class, then shared fairly between sessions inside a
+class (weighted fair queuing on per-session virtual finish times). Queued work that
+misses its class deadline is dropped instead of being sent late.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from utils.config import config
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    INTERVIEWER = 0
+    SHADOW = 1
+    INSTRUCTOR = 2
+    REPORT = 3
+    RESUME = 4
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a queued call was dropped because it waited past its deadline."""
+
+
+# Routers set this once per connection/request so agents don't have to thread it through.
+current_session: ContextVar[str] = ContextVar("current_session", default="anonymous")
+
+
+class _Job:
+    __slots__ = (
+        "priority", "session_id", "func", "args", "kwargs", "future",
+        "enqueued_at", "deadline", "start_tag", "started",
+    )
+
+    def __init__(self, priority, session_id, func, args, kwargs, future, deadline):
+        self.priority = priority
+        self.session_id = session_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+        self.start_tag = 0.0
+        self.started = False
+
+
+class ModelCallScheduler:
+    def __init__(
+        self,
+        max_concurrency: int = config.MODEL_MAX_CONCURRENCY,
+        deadlines: dict[str, float | None] | None = None,
+    ):
+        self.max_concurrency = max(max_concurrency, 1)
+        deadlines = config.MODEL_PRIORITY_DEADLINES if deadlines is None else deadlines
+        self.deadlines: dict[Priority, float | None] = {
+            p: deadlines.get(p.name.lower()) for p in Priority
+        }
+
+        self._queues: dict[Priority, list] = {p: [] for p in Priority}
+        self._seq = itertools.count()
+        self._weights: dict[str, float] = {}
+        self._last_finish: dict[tuple[Priority, str], float] = {}
+        self._virtual_time: dict[Priority, float] = defaultdict(float)
+        self._running = 0
+
+        self._stats = {
+            p: {"submitted": 0, "started": 0, "completed": 0, "failed": 0, "dropped": 0, "wait_ms_total": 0.0}
+            for p in Priority
+        }
+
+    def set_session_weight(self, session_id: str, weight: float):
+        """Gives a session a larger (or smaller) share of its priority class."""
+        self._weights[session_id] = max(weight, 0.01)
+
+    def forget_session(self, session_id: str):
+        self._weights.pop(session_id, None)
+        for key in [k for k in self._last_finish if k[1] == session_id]:
+            del self._last_finish[key]
+
+    async def run(
+        self,
+        priority: Priority,
+        func: Callable[..., Any],
+        *args,
+        session_id: str | None = None,
+        deadline_s: float | None = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Queues a blocking model call and runs it on a worker thread once a slot frees up.
+        Raises DeadlineExceeded if the call waited longer than its deadline.
+        """
+        session_id = session_id or current_session.get()
+        if deadline_s is None:
+            deadline_s = self.deadlines.get(priority)
+
+        loop = asyncio.get_running_loop()
+        job = _Job(
+            priority, session_id, func, args, kwargs, loop.create_future(),
+            time.monotonic() + deadline_s if deadline_s is not None else None,
+        )
+
+        # Virtual finish tag: sessions that already used their share wait behind the others.
+        key = (priority, session_id)
+        start_tag = max(self._virtual_time[priority], self._last_finish.get(key, 0.0))
+        finish_tag = start_tag + 1.0 / self._weights.get(session_id, 1.0)
+        self._last_finish[key] = finish_tag
+        job.start_tag = start_tag
+
+        heapq.heappush(self._queues[priority], (finish_tag, next(self._seq), job))
+        self._stats[priority]["submitted"] += 1
+        if deadline_s is not None:
+            loop.call_later(deadline_s, self._expire, job)
+        self._dispatch()
+
+        return await job.future
+
+    async def stream(
+        self,
+        priority: Priority,
+        func: Callable[..., Iterable[Any]],
+        *args,
+        session_id: str | None = None,
+        deadline_s: float | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        """
+        Like `run`, for calls that return a blocking iterator (streaming completions).
+        The iterator is drained on the worker thread and items are yielded as they arrive;
+        the call holds its slot until the stream ends.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        end = object()
+
+        def _pump():
+            for item in func(*args, **kwargs):
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        producer = asyncio.ensure_future(
+            self.run(priority, _pump, session_id=session_id, deadline_s=deadline_s)
+        )
+        producer.add_done_callback(lambda _: queue.put_nowait(end))
+        try:
+            while (item := await queue.get()) is not end:
+                yield item
+            await producer  # surfaces errors raised by the model call
+        finally:
+            stop.set()
+            if not producer.done():
+                producer.cancel()
+
+    def _dispatch(self):
+        while self._running < self.max_concurrency:
+            job = self._pop_next()
+            if job is None:
+                return
+
+            job.started = True
+            self._running += 1
+            self._stats[job.priority]["started"] += 1
+            self._stats[job.priority]["wait_ms_total"] += (time.monotonic() - job.enqueued_at) * 1000
+            asyncio.ensure_future(self._execute(job))
+
+    def _pop_next(self) -> _Job | None:
+        now = time.monotonic()
+        for priority in Priority:
+            queue = self._queues[priority]
+            while queue:
+                _, _, job = heapq.heappop(queue)
+                self._virtual_time[priority] = max(self._virtual_time[priority], job.start_tag)
+
+                if job.future.done():  # expired or the caller gave up while queued
+                    continue
+                if job.deadline is not None and now > job.deadline:
+                    self._expire(job)
+                    continue
+                return job
+        return None
+
+    def _expire(self, job: _Job):
+        if job.started or job.future.done():
+            return
+        self._stats[job.priority]["dropped"] += 1
+        job.future.set_exception(DeadlineExceeded(
+            f"{job.priority.name.lower()} call dropped after waiting past its deadline"
+        ))
+
+    async def _execute(self, job: _Job):
+        try:
+            result = await asyncio.to_thread(job.func, *job.args, **job.kwargs)
+            self._stats[job.priority]["completed"] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        except Exception as e:
+            self._stats[job.priority]["failed"] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            self._running -= 1
+            self._dispatch()
+
+    def in_flight(self) -> int:
+        """Calls running or still queued (used to drain before shutdown)."""
+        queued = sum(1 for q in self._queues.values() for _, _, job in q if not job.future.done())
+        return self._running + queued
+
+    def snapshot(self) -> dict:
+        """Queue depth and counters per priority class, for the metrics endpoint."""
+        classes = {}
+        for priority in Priority:
+            stats = self._stats[priority]
+            started = stats["started"]
+            classes[priority.name.lower()] = {
+                "queue_depth": sum(1 for _, _, job in self._queues[priority] if not job.future.done()),
+                "submitted": stats["submitted"],
+                "completed": stats["completed"],
+                "failed": stats["failed"],
+                "dropped": stats["dropped"],
+                "avg_wait_ms": round(stats["wait_ms_total"] / started, 1) if started > 0 else 0.0,
+                "deadline_s": self.deadlines.get(priority),
+            }
+        return {
+            "running": self._running,
+            "max_concurrency": self.max_concurrency,
+            "classes": classes,
+        }
+
+
+model_scheduler = ModelCallScheduler()
@@ -0,0 +1,232 @@
+"""
+Provider-side caching of static system prompts.
+
+Prefixes of at least `CONTEXT_CACHE_MIN_TOKENS` (the provider's minimum) are registered
+once with Gemini's cached-content API and referenced by name afterwards, so they are
+not re-sent and re-billed on every call. In practice that is a text interview's
+resume-bearing interviewer instruction, which stays fixed for the whole session. The
+instructor prompt and the feedback scaffolding are well under the minimum and are
+always sent inline; every agent still goes through `system_kwargs`, so they would be
+picked up if they grew past it.
+
+Entries are keyed by (model, prompt hash), renewed before their TTL runs out and
+evicted LRU. Sessions that pass a `holder` share one entry (a reconnect or a second
+tab with the same resume) and keep it alive: `forget` only deletes it once the last
+holder has let go, and live held entries are never evicted. `FakeCacheBackend` stands
+in for the provider in tests.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import time
+from collections import OrderedDict
+from utils.config import config
+from utils.token_budget import estimate_tokens
+
+
+class GeminiCacheBackend:
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from utils.gemini_client import get_gemini_client
+            self._client = get_gemini_client()
+        return self._client
+
+    def create(self, model: str, system_instruction: str, ttl_s: int) -> str:
+        from google.genai import types
+        cached = self.client.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_instruction,
+                ttl=f"{ttl_s}s",
+                display_name="shadow-instructor-prompt",
+            ),
+        )
+        return cached.name
+
+    def refresh(self, name: str, ttl_s: int):
+        from google.genai import types
+        self.client.caches.update(name=name, config=types.UpdateCachedContentConfig(ttl=f"{ttl_s}s"))
+
+    def delete(self, name: str):
+        self.client.caches.delete(name=name)
+
+
+class FakeCacheBackend:
+    """In-memory stand-in for the provider's cache API."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.entries: dict[str, dict] = {}
+        self.calls = {"create": 0, "refresh": 0, "delete": 0}
+
+    def create(self, model: str, system_instruction: str, ttl_s: int) -> str:
+        self.calls["create"] += 1
+        name = f"cachedContents/fake-{next(self._ids)}"
+        self.entries[name] = {"model": model, "system_instruction": system_instruction, "ttl_s": ttl_s}
+        return name
+
+    def refresh(self, name: str, ttl_s: int):
+        self.calls["refresh"] += 1
+        if name not in self.entries:
+            raise KeyError(name)
+        self.entries[name]["ttl_s"] = ttl_s
+
+    def delete(self, name: str):
+        self.calls["delete"] += 1
+        self.entries.pop(name, None)
+
+
+class _Entry:
+    def __init__(self, key: str, name: str, expires_at: float, holders: set | None = None):
+        self.key = key
+        self.name = name
+        self.expires_at = expires_at
+        self.holders = holders if holders is not None else set()
+
+
+class PromptCacheManager:
+    def __init__(
+        self,
+        backend=None,
+        ttl_s: int = config.CONTEXT_CACHE_TTL_S,
+        max_entries: int = config.CONTEXT_CACHE_MAX_ENTRIES,
+        min_tokens: int = config.CONTEXT_CACHE_MIN_TOKENS,
+        enabled: bool = config.CONTEXT_CACHE_ENABLED,
+        clock=time.monotonic,
+    ):
+        self.backend = backend or GeminiCacheBackend()
+        self.ttl_s = ttl_s
+        self.renew_margin_s = ttl_s * 0.2
+        self.max_entries = max_entries
+        self.min_tokens = min_tokens
+        self.enabled = enabled
+        self.clock = clock
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._failed_until: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.stats = {"hits": 0, "creates": 0, "renewals": 0, "evictions": 0, "inline": 0, "errors": 0}
+
+    @staticmethod
+    def _key(model: str, system_instruction: str) -> str:
+        return hashlib.sha256(f"{model}\0{system_instruction}".encode("utf-8")).hexdigest()
+
+    async def system_kwargs(self, model: str, system_instruction: str, holder: str | None = None) -> dict:
+        """
+        Keyword arguments for GenerateContentConfig: `cached_content` when the prompt is
+        (or can now be) cached, otherwise the plain `system_instruction`.
+        """
+        name = await self.resolve(model, system_instruction, holder)
+        if name:
+            return {"cached_content": name}
+        return {"system_instruction": system_instruction}
+
+    async def resolve(self, model: str, system_instruction: str, holder: str | None = None) -> str | None:
+        if not self.enabled or estimate_tokens(system_instruction) < self.min_tokens:
+            self.stats["inline"] += 1
+            return None
+
+        key = self._key(model, system_instruction)
+        if self._failed_until.get(key, 0) > self.clock():
+            self.stats["inline"] += 1
+            return None
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            now = self.clock()
+            entry = self._entries.get(key)
+
+            if entry and entry.expires_at - now > self.renew_margin_s:
+                self._hold(entry, holder)
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry.name
+
+            try:
+                if entry and entry.expires_at > now:
+                    await asyncio.to_thread(self.backend.refresh, entry.name, self.ttl_s)
+                    self.stats["renewals"] += 1
+                else:
+                    name = await asyncio.to_thread(self.backend.create, model, system_instruction, self.ttl_s)
+                    # The expired entry's holders carry over to its replacement
+                    entry = _Entry(key, name, 0.0, entry.holders if entry else None)
+                    self._entries[key] = entry
+                    self.stats["creates"] += 1
+                entry.expires_at = self.clock() + self.ttl_s
+                self._hold(entry, holder)
+                self._entries.move_to_end(key)
+            except Exception as e:
+                print(f"[PromptCache] Falling back to inline prompt: {e}")
+                self.stats["errors"] += 1
+                self._entries.pop(key, None)
+                # Don't hammer the API for a prompt it just refused (e.g. too small)
+                now = self.clock()
+                self._failed_until = {k: t for k, t in self._failed_until.items() if t > now}
+                self._failed_until[key] = now + 300
+                return None
+
+        await self._evict_overflow(keep=key)
+        return entry.name
+
+    @staticmethod
+    def _hold(entry: _Entry, holder: str | None):
+        if holder is not None:
+            entry.holders.add(holder)
+
+    async def forget(self, model: str, system_instruction: str, holder: str | None = None):
+        """
+        Releases `holder`'s reference to a session-scoped prefix (e.g. a resume
+        instruction) and deletes it from the provider once no session holds it.
+        """
+        key = self._key(model, system_instruction)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.holders.discard(holder)
+                if entry.holders:
+                    return
+                del self._entries[key]
+        if entry is None:
+            self._drop_lock(key)
+        else:
+            await self._delete(entry)
+
+    async def _evict_overflow(self, keep: str):
+        now = self.clock()
+        # Held entries may have calls in flight against them (expired ones are gone anyway),
+        # and `keep` is about to be used by the caller
+        evictable = [
+            key for key, entry in self._entries.items()
+            if key != keep and (not entry.holders or entry.expires_at <= now)
+        ]
+        for key in evictable[:max(len(self._entries) - self.max_entries, 0)]:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self.stats["evictions"] += 1
+                await self._delete(entry)
+
+    def _drop_lock(self, key: str):
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked() and key not in self._entries:
+            # Never drop a lock someone holds: a second lock for the key would let two
+            # sessions create the same entry
+            del self._locks[key]
+
+    async def _delete(self, entry: _Entry):
+        self._drop_lock(entry.key)
+        try:
+            await asyncio.to_thread(self.backend.delete, entry.name)
+        except Exception as e:
+            print(f"[PromptCache] Delete failed for {entry.name}: {e}")
+
+    def snapshot(self) -> dict:
+        return {"entries": len(self._entries), **self.stats}
+
+
+prompt_cache = PromptCacheManager()
@@ -4,6 +4,9 @@ All prompts enforce strict anti-hallucination: the AI must only respond
 to what the candidate actually says, never infer or fabricate content.
 """
 
+from utils.config import config
+from utils.resume_index import get_resume_index
+
 # ==================== INTERVIEW SCENARIOS ====================
 SCENARIOS = {
     "url_shortener": "Design a URL Shortening service like TinyURL or bit.ly.",
@@ -106,10 +109,18 @@ def build_live_system_instruction(
     resume_text: str,
     persona: str = "friendly",
     difficulty: str = "medium",
+    topic: str = "",
+    resume_budget_tokens: int = config.RESUME_PROMPT_TOKEN_BUDGET,
 ) -> str:
-    """Build the system instruction for the Gemini Live (voice/video) interview session."""
+    """
+    Build the system instruction for the Gemini Live (voice/video) interview session.
+    Only the resume sections relevant to the role, persona and current topic are included.
+    """
     persona_config = PERSONA_TONES.get(persona, PERSONA_TONES["friendly"])
     difficulty_instruction = DIFFICULTY_INSTRUCTIONS.get(difficulty, DIFFICULTY_INSTRUCTIONS["medium"])
+    resume_excerpt = get_resume_index(resume_text).select(
+        role=role, persona=persona, topic=topic, budget_tokens=resume_budget_tokens
+    )
 
     return f"""You are an expert technical interviewer conducting a live voice interview.
 Role being interviewed for: {role}
@@ -120,7 +131,7 @@ INTERVIEWER PERSONA — {persona_config["description"]}:
 DIFFICULTY: {difficulty_instruction}
 
 CANDIDATE RESUME (for context only — do NOT assume they know everything listed):
-{resume_text[:4000]}
+{resume_excerpt}
 
 YOUR GOALS:
 1. Start immediately: introduce yourself (in character) and ask your first question based on their resume.
@@ -155,4 +166,5 @@ ANALYSIS CRITERIA:
 {ANTI_HALLUCINATION_RULES}
 
 Output your analysis as a JSON object matching the `Feedback` schema.
+Set `confidence` (0.0-1.0) to how sure you are of the score given what was actually said.
 If the candidate gave a vague or non-answer, score it as such — do NOT infer hidden expertise."""
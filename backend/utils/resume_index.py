@@ -0,0 +1,176 @@
+"""
+Section index over extracted resume text.
+
+The text is split into sections (experience, projects, skills, ...) with a keyword
+index per section, built once per resume at upload time and cached by content hash.
+Prompt builders then pull only the sections relevant to the role, persona and current
+topic under a token budget instead of pasting a blind prefix of the resume.
+"""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from utils.token_budget import estimate_tokens
+
+_HEADING_ALIASES = {
+    "summary": ["summary", "profile", "objective", "about me", "professional summary", "career objective"],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment",
+        "work history", "internships", "internship", "internship experience",
+    ],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "side projects"],
+    "skills": ["skills", "technical skills", "technologies", "tech stack", "core competencies", "tools"],
+    "education": ["education", "academics", "academic background"],
+    "certifications": ["certifications", "certificates", "licenses", "courses"],
+    "achievements": ["achievements", "awards", "honors", "honours", "accomplishments"],
+    "publications": ["publications", "research", "papers"],
+    "leadership": [
+        "leadership", "extracurricular", "extracurricular activities", "activities",
+        "volunteering", "positions of responsibility",
+    ],
+}
+_ALIAS_TO_SECTION = {alias: name for name, aliases in _HEADING_ALIASES.items() for alias in aliases}
+
+# How useful each section is to an interviewer before looking at the topic at all.
+_SECTION_PRIORITY = {
+    "experience": 3.0, "projects": 2.5, "skills": 2.5, "summary": 1.5,
+    "achievements": 1.0, "publications": 1.0, "certifications": 0.8,
+    "education": 0.8, "leadership": 0.5, "other": 0.5, "header": 0.2,
+}
+_PERSONA_BOOST = {
+    "faang": {"projects": 1.0, "experience": 1.0},
+    "tough": {"experience": 0.5, "skills": 0.5},
+    "friendly": {"summary": 0.5, "education": 0.5},
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_STOPWORDS = frozenset(
+    "a an and the of to in for on with at by from as is are was were be been it its this that "
+    "i my we our you your or but not using used use via etc "
+    "how what why when which would could should can do does did about me tell explain".split()
+)
+
+_CACHE_SIZE = 128
+
+
+def keywords(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _heading_for(line: str) -> str | None:
+    cleaned = re.sub(r"[^a-z& ]", "", line.lower()).replace("&", "and").strip()
+    if not cleaned or len(cleaned.split()) > 4:
+        return None
+    return _ALIAS_TO_SECTION.get(cleaned)
+
+
+class ResumeSection:
+    def __init__(self, name: str, order: int, lines: list[str]):
+        self.name = name
+        self.order = order
+        self.text = "\n".join(lines).strip()
+        self.terms = Counter(keywords(self.text))
+        self.tokens = estimate_tokens(self.text)
+
+
+class ResumeIndex:
+    def __init__(self, text: str):
+        self.text = text
+        self.resume_id = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+        self.sections = self._segment(text)
+
+    @staticmethod
+    def _segment(text: str) -> list[ResumeSection]:
+        sections: list[ResumeSection] = []
+        name, lines = "header", []
+        for line in text.splitlines():
+            heading = _heading_for(line)
+            if heading:
+                if "".join(lines).strip():
+                    sections.append(ResumeSection(name, len(sections), lines))
+                name, lines = heading, []
+            else:
+                lines.append(line.rstrip())
+        if "".join(lines).strip():
+            sections.append(ResumeSection(name, len(sections), lines))
+        return sections
+
+    def section_names(self) -> list[str]:
+        return [s.name for s in self.sections]
+
+    def select(
+        self,
+        role: str = "",
+        persona: str = "friendly",
+        topic: str = "",
+        budget_tokens: int = 1000,
+        matching_only: bool = False,
+    ) -> str:
+        """
+        Returns the most relevant sections (in resume order) that fit `budget_tokens`.
+        Relevance = section priority + persona boost + keyword overlap with role/topic.
+        With `matching_only`, sections that share no keyword with role/topic are skipped.
+        """
+        if not self.sections:
+            return ""
+
+        query = set(keywords(f"{role} {topic}"))
+        boost = _PERSONA_BOOST.get(persona, {})
+
+        def overlap(section: ResumeSection) -> int:
+            return sum(min(section.terms[t], 3) for t in query)
+
+        def score(section: ResumeSection) -> float:
+            base = _SECTION_PRIORITY.get(section.name, _SECTION_PRIORITY["other"])
+            return base + boost.get(section.name, 0.0) + 0.5 * overlap(section)
+
+        candidates = [s for s in self.sections if overlap(s)] if matching_only else self.sections
+        chosen: list[tuple[ResumeSection, str]] = []
+        remaining = budget_tokens
+        for section in sorted(candidates, key=lambda s: (-score(s), s.order)):
+            label = f"[{section.name.upper()}]\n"
+            cost = section.tokens + estimate_tokens(label)
+            if cost <= remaining:
+                chosen.append((section, label + section.text))
+                remaining -= cost
+            elif remaining > 60:
+                # Partially include the section, cut at a line boundary.
+                kept, used = [], estimate_tokens(label)
+                for line in section.text.splitlines():
+                    line_cost = estimate_tokens(line) + 1
+                    if used + line_cost > remaining:
+                        break
+                    kept.append(line)
+                    used += line_cost
+                if kept:
+                    chosen.append((section, label + "\n".join(kept)))
+                    remaining -= used
+
+        chosen.sort(key=lambda item: item[0].order)
+        return "\n\n".join(text for _, text in chosen)
+
+
+_cache: "OrderedDict[str, ResumeIndex]" = OrderedDict()
+
+
+def get_resume_index(text: str) -> ResumeIndex:
+    """Builds (or returns the cached) index for this resume text."""
+    key = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+    index = _cache.get(key)
+    if index is None:
+        index = ResumeIndex(text)
+        _cache[key] = index
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return index
+
+
+def get_resume_index_by_id(resume_id: str) -> ResumeIndex | None:
+    """
+    The cache is per process: an id only resolves in the worker that handled the upload
+    (and until it is evicted). Run a single worker, or route a client's upload and
+    interview to the same one.
+    """
+    return _cache.get(resume_id)
@@ -1,3 +1,4 @@
+import sys
 from collections import deque
 from typing import List, Dict, Any
 from models.schemas import Message
@@ -36,3 +37,10 @@ class SessionManager:
         self._context_buffer.clear()
         self._history.clear()
         self._active_speaker = "interviewer"
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the transcript (message objects and their text)."""
+        return sum(
+            sys.getsizeof(m) + sys.getsizeof(m.__dict__) + sys.getsizeof(m.content) + sys.getsizeof(m.role)
+            for m in self._history
+        )
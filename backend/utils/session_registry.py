@@ -0,0 +1,47 @@
+"""
+Registry of live websocket sessions and the memory each one holds.
+
+Routers register a session with a callable that reports its current usage
+(`*_bytes` entries plus any counters); the admin diagnostics endpoint
+snapshots all of them on demand, so nothing is measured unless asked.
+"""
+
+import time
+from typing import Callable
+
+UsageFn = Callable[[], dict]
+
+
+class SessionRegistry:
+    def __init__(self):
+        self._sessions: dict[str, tuple[str, float, UsageFn]] = {}
+
+    def register(self, session_id: str, kind: str, usage: UsageFn):
+        self._sessions[session_id] = (kind, time.time(), usage)
+
+    def unregister(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    def snapshot(self) -> dict:
+        sessions = []
+        for session_id, (kind, started_at, usage) in list(self._sessions.items()):
+            try:
+                detail = usage()
+            except Exception as e:
+                detail = {"error": str(e)}
+            sessions.append({
+                "session_id": session_id,
+                "kind": kind,
+                "age_s": round(time.time() - started_at, 1),
+                "total_bytes": sum(v for k, v in detail.items() if k.endswith("_bytes")),
+                **detail,
+            })
+        sessions.sort(key=lambda s: s["total_bytes"], reverse=True)
+        return {
+            "sessions": sessions,
+            "count": len(sessions),
+            "total_bytes": sum(s["total_bytes"] for s in sessions),
+        }
+
+
+session_registry = SessionRegistry()
@@ -0,0 +1,166 @@
+"""
+Speech metrics measured from the transcript's own timestamps instead of being
+guessed by the report model: words per minute, filled pauses, long pauses and
+how long the candidate took to start each answer.
+
+Each message carries `timestamp` (when the turn's first transcript chunk arrived)
+and, from the live client, `end_timestamp` (its last chunk). A turn without an
+end is taken to last until the next message starts. The interviewer's end, when
+missing, is estimated from its word count so answer latency is not inflated by
+the question itself. Everything is computed over the whole session at once.
+"""
+
+import re
+
+import numpy as np
+
+from models.schemas import Message
+from models.analysis_schema import SpeechAnalysis
+from utils.config import config
+
+_QUESTION_ROLES = {"interviewer", "model", "assistant"}
+# Hesitation sounds plus the two verbal fillers that are unambiguous in transcripts
+_FILLED_PAUSE = re.compile(r"\b(?:u+h+|u+m+|e+r+m*|a+h+|h+m+|m+h*m+)\b|\blike,|\byou know\b", re.IGNORECASE)
+_WORD = re.compile(r"\b[\w']+\b")
+_PAUSE_BINS_S = [0, 1, 2, 3, 5, 10, np.inf]
+
+
+def _filler_key(token: str) -> str:
+    token = token.lower().rstrip(",")
+    return token if " " in token else re.sub(r"(.)\1+", r"\1", token)
+
+
+def _round(value: float, digits: int = 1) -> float | None:
+    return None if value is None or not np.isfinite(value) else round(float(value), digits)
+
+
+def _summary(values: np.ndarray) -> dict | None:
+    if values.size == 0:
+        return None
+    p50, p90 = np.percentile(values, [50, 90])
+    return {
+        "mean": _round(values.mean(), 2), "p50": _round(p50, 2),
+        "p90": _round(p90, 2), "max": _round(values.max(), 2),
+    }
+
+
+def compute_speech_metrics(
+    history: list[Message],
+    long_pause_s: float = config.SPEECH_LONG_PAUSE_S,
+    interviewer_wpm: float = config.SPEECH_INTERVIEWER_WPM,
+) -> dict:
+    """
+    Filler counts always come from the text. Timing metrics (`words_per_minute`,
+    `pace`, `long_pauses_count`, latencies) are None when the history has no timestamps.
+    """
+    n = len(history)
+    is_user = np.array([msg.role == "user" for msg in history], dtype=bool)
+    is_question = np.array([msg.role in _QUESTION_ROLES for msg in history], dtype=bool)
+    words = np.array([len(_WORD.findall(msg.content)) for msg in history], dtype=float)
+    fillers: dict[str, int] = {}
+    filler_counts = np.zeros(n, dtype=int)
+    for i in np.flatnonzero(is_user):
+        for match in _FILLED_PAUSE.findall(history[i].content):
+            key = _filler_key(match)
+            fillers[key] = fillers.get(key, 0) + 1
+            filler_counts[i] += 1
+
+    starts = np.array([msg.timestamp if msg.timestamp is not None else np.nan for msg in history], dtype=float)
+    ends = np.array([msg.end_timestamp if msg.end_timestamp is not None else np.nan for msg in history], dtype=float)
+    metrics = {
+        "filled_pauses_count": int(filler_counts.sum()),
+        "fillers": dict(sorted(fillers.items(), key=lambda item: -item[1])),
+        "timed": False,
+        "words_per_minute": None,
+        "pace": None,
+        "long_pauses_count": None,
+        "speaking_time_s": None,
+        "answer_latency_s": None,
+        "pause_histogram": None,
+        "turns": [],
+    }
+    if n == 0 or np.isnan(starts).all():
+        return metrics
+
+    # The browser sends Date.now() milliseconds (~1.7e12); epoch or relative seconds are far smaller
+    if np.nanmax(starts) > 1e11:
+        starts, ends = starts / 1000.0, ends / 1000.0
+    explicit_end = ~np.isnan(ends)
+    next_start = np.append(starts[1:], np.nan)
+    ends = np.where(explicit_end, ends, next_start)
+    durations = ends - starts
+    timed = is_user & np.isfinite(durations) & (durations > 0) & (words > 0)
+
+    # Silence before an answer: from the end of the question to the first words
+    question_end = np.where(explicit_end, ends, starts + words / interviewer_wpm * 60.0)
+    answers = np.flatnonzero(is_user[1:] & is_question[:-1]) + 1
+    latency = np.full(n, np.nan)
+    latency[answers] = np.maximum(starts[answers] - question_end[answers - 1], 0.0)
+    # Silence inside an answer split over several segments (only measurable with explicit ends)
+    gaps = np.full(n, np.nan)
+    continued = np.flatnonzero(is_user[1:] & is_user[:-1] & explicit_end[:-1]) + 1
+    gaps[continued] = np.maximum(starts[continued] - ends[continued - 1], 0.0)
+
+    latencies = latency[np.isfinite(latency)]
+    pauses = np.concatenate([latencies, gaps[np.isfinite(gaps)]])
+    speaking_s = durations[timed].sum()
+    wpm = words[timed].sum() / speaking_s * 60.0 if speaking_s > 0 else np.nan
+    turn_wpm = np.full(n, np.nan)
+    turn_wpm[timed] = words[timed] / durations[timed] * 60.0
+
+    pace = None
+    if np.isfinite(wpm):
+        pace = "Too Slow" if wpm < config.SPEECH_SLOW_WPM else "Too Fast" if wpm > config.SPEECH_FAST_WPM else "Good"
+    histogram, _ = np.histogram(pauses, bins=_PAUSE_BINS_S)
+    metrics.update({
+        "timed": bool(timed.any() or pauses.size),
+        "words_per_minute": _round(wpm),
+        "pace": pace,
+        # A single answer with no question before it has no pause to count
+        "long_pauses_count": int((pauses >= long_pause_s).sum()) if pauses.size else None,
+        "speaking_time_s": _round(speaking_s),
+        "answer_latency_s": _summary(latencies),
+        "pause_histogram": {
+            (f"{lo:g}-{hi:g}s" if np.isfinite(hi) else f"{lo:g}s+"): int(count)
+            for lo, hi, count in zip(_PAUSE_BINS_S[:-1], _PAUSE_BINS_S[1:], histogram)
+        } if pauses.size else None,
+        "turns": [
+            {
+                "index": int(i),
+                "words": int(words[i]),
+                "wpm": _round(turn_wpm[i]),
+                "latency_s": _round(latency[i], 2),
+                "filled_pauses": int(filler_counts[i]),
+            }
+            for i in np.flatnonzero(is_user)
+        ],
+    })
+    return metrics
+
+
+def describe_for_prompt(metrics: dict) -> str:
+    """The measured values, for the report prompt: the model copies them instead of estimating."""
+    lines = [f"- filled_pauses_count: {metrics['filled_pauses_count']}"]
+    if metrics["fillers"]:
+        lines.append("- fillers used: " + ", ".join(f'"{k}" x{v}' for k, v in metrics["fillers"].items()))
+    if metrics["pace"]:
+        lines.append(f"- pace: {metrics['pace']} ({metrics['words_per_minute']} words per minute)")
+    if metrics["long_pauses_count"] is not None:
+        lines.append(f"- long_pauses_count: {metrics['long_pauses_count']}")
+    if metrics["answer_latency_s"]:
+        lines.append(f"- average time to start answering: {metrics['answer_latency_s']['mean']}s")
+    return "\n".join(lines)
+
+
+def apply_speech_metrics(speech: SpeechAnalysis, metrics: dict) -> SpeechAnalysis:
+    """Overwrites the model's values with measured ones wherever a measurement exists."""
+    update = {
+        "filled_pauses_count": metrics["filled_pauses_count"],
+        "words_per_minute": metrics["words_per_minute"],
+        "avg_answer_latency_s": metrics["answer_latency_s"]["mean"] if metrics["answer_latency_s"] else None,
+    }
+    if metrics["pace"]:
+        update["pace"] = metrics["pace"]
+    if metrics["long_pauses_count"] is not None:
+        update["long_pauses_count"] = metrics["long_pauses_count"]
+    return speech.model_copy(update=update)
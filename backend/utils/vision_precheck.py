@@ -0,0 +1,134 @@
+"""
+CPU-only precheck for shadow webcam frames.
+
+Answers the unambiguous questions locally — is the frame too dark, is the detected
+face off-centre — so those frames never reach the vision model, and finds the face
+box the normalizer crops to. A missed face detection is not unambiguous (glasses, a
+tilted head or looking down at notes all defeat the Haar cascades), so those frames
+still go to the model, with what the detector saw as a hint.
+
+Uses NumPy for image statistics and the Haar cascades bundled with OpenCV. If
+OpenCV is not installed the precheck is skipped and every frame passes.
+"""
+
+import time
+import numpy as np
+from utils.config import config
+from utils.metrics import record_latency
+
+# Local alerts still speak in the persona's voice, like the model's would
+_ALERT_MESSAGES = {
+    "too_dark": {
+        "friendly": "A bit dark — try adding some light",
+        "tough": "Too dark. Fix your lighting.",
+        "faang": "Poor lighting undercuts your presence",
+        "roast": "Interviewing from a cave? Add light",
+    },
+    "off_center": {
+        "friendly": "Try centering yourself in the frame",
+        "tough": "Center yourself in the frame.",
+        "faang": "Center yourself — framing signals polish",
+        "roast": "The camera is over here, buddy",
+    },
+}
+
+
+class FramePrecheck:
+    def __init__(
+        self,
+        dark_threshold: float = config.SHADOW_DARK_THRESHOLD,
+        off_center_threshold: float = config.SHADOW_OFF_CENTER_THRESHOLD,
+        max_width: int = 320,
+    ):
+        self.dark_threshold = dark_threshold
+        self.off_center_threshold = off_center_threshold
+        self.max_width = max_width
+        self._cv2 = None
+        self._frontal = None
+        self._profile = None
+
+    @property
+    def available(self) -> bool:
+        """Lazy-loads OpenCV and its bundled cascades; False if OpenCV is missing."""
+        if self._cv2 is None:
+            try:
+                import cv2
+            except ImportError:
+                self._cv2 = False
+                return False
+            self._cv2 = cv2
+            self._frontal = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+            self._profile = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_profileface.xml")
+        return bool(self._cv2)
+
+    def check(self, image_bytes: bytes, persona: str = "friendly") -> dict:
+        """
+        Returns {"status": "alert", "reason", "message"} for conditions we can decide
+        locally, otherwise {"status": "pass", "face_box": (x, y, w, h) | None,
+        "face_hint": "no_face" | "turned_away" | None}. Both carry per-stage "timings_ms".
+        """
+        if not self.available:
+            return {"status": "pass", "face_box": None, "face_hint": None, "timings_ms": {}}
+
+        cv2 = self._cv2
+        timings: dict[str, float] = {}
+
+        start = time.perf_counter()
+        gray = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            return {"status": "pass", "face_box": None, "face_hint": None, "timings_ms": timings}
+        scale = 1.0
+        if gray.shape[1] > self.max_width:
+            scale = self.max_width / gray.shape[1]
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        timings["decode"] = self._lap("decode", start)
+
+        start = time.perf_counter()
+        too_dark = float(gray.mean()) < self.dark_threshold
+        timings["brightness"] = self._lap("brightness", start)
+        if too_dark:
+            return self._alert("too_dark", persona, timings)
+
+        start = time.perf_counter()
+        equalized = cv2.equalizeHist(gray)
+        faces = self._frontal.detectMultiScale(equalized, scaleFactor=1.15, minNeighbors=5, minSize=(40, 40))
+        turned_away = False
+        if len(faces) == 0:
+            # Profile cascade only knows one side; mirror the frame to catch the other.
+            turned_away = (
+                len(self._profile.detectMultiScale(equalized, 1.15, 5, minSize=(40, 40))) > 0
+                or len(self._profile.detectMultiScale(cv2.flip(equalized, 1), 1.15, 5, minSize=(40, 40))) > 0
+            )
+        timings["face"] = self._lap("face", start)
+
+        if len(faces) == 0:
+            # Let the model judge: the frontal cascade misses plenty of faces that are there
+            hint = "turned_away" if turned_away else "no_face"
+            return {"status": "pass", "face_box": None, "face_hint": hint, "timings_ms": timings}
+
+        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        height, width = gray.shape
+        dx = abs((x + w / 2) / width - 0.5)
+        dy = abs((y + h / 2) / height - 0.5)
+        if max(dx, dy) > self.off_center_threshold:
+            return self._alert("off_center", persona, timings)
+
+        face_box = tuple(int(v / scale) for v in (x, y, w, h))
+        return {"status": "pass", "face_box": face_box, "face_hint": None, "timings_ms": timings}
+
+    @staticmethod
+    def _lap(stage: str, start: float) -> float:
+        ms = (time.perf_counter() - start) * 1000
+        record_latency(f"shadow.precheck.{stage}", ms)
+        return round(ms, 2)
+
+    @staticmethod
+    def _alert(reason: str, persona: str, timings: dict) -> dict:
+        messages = _ALERT_MESSAGES[reason]
+        return {
+            "status": "alert",
+            "reason": reason,
+            "message": messages.get(persona, messages["friendly"]),
+            "confidence": 1.0,
+            "timings_ms": timings,
+        }
@@ -26,6 +26,7 @@ export default function Home() {
   const [conversationHistory, setConversationHistory] = useState<ChatMessage[]>(
     [],
   );
+  const [gradingSessionId, setGradingSessionId] = useState<string | null>(null);
   const [isClient, setIsClient] = useState(false);
   const [userId, setUserId] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
@@ -77,7 +78,10 @@ export default function Home() {
     }
   }, [analysisResult]);
 
-  const handleAnalyze = async (messages: ChatMessage[]) => {
+  const handleAnalyze = async (
+    messages: ChatMessage[],
+    sessionId: string | null = null,
+  ) => {
     // BUG FIX: Provide minimal feedback if not enough messages
     if (!messages || messages.length < 2) {
       console.warn("Interview too short for analysis");
@@ -86,6 +90,7 @@ export default function Home() {
     }
 
     setConversationHistory(messages);
+    setGradingSessionId(sessionId);
     setIsAnalyzing(true);
 
     try {
@@ -98,8 +103,11 @@ export default function Home() {
             role: m.role,
             content: m.content,
             timestamp: m.timestamp,
+            end_timestamp: m.endTimestamp,
           })),
           user_id: userId, // Pass the user ID for saving
+          // Answers graded during the interview are reused; only aggregation is left
+          session_id: sessionId,
         }),
       });
 
@@ -193,7 +201,7 @@ export default function Home() {
           <p className="text-neutral-400 mb-6">{error}</p>
           <div className="flex gap-3 justify-center">
             <button
-              onClick={() => handleAnalyze(conversationHistory)}
+              onClick={() => handleAnalyze(conversationHistory, gradingSessionId)}
               className="px-6 py-2 bg-white text-black font-medium rounded-xl hover:bg-neutral-200 transition"
             >
               Retry
@@ -249,7 +249,7 @@ function ResumePanelParsed({
 interface InterviewSessionProps {
     interviewData: InterviewState;
     onEnd: () => void;
-    onAnalyze: (messages: ChatMessage[]) => void;
+    onAnalyze: (messages: ChatMessage[], sessionId: string | null) => void;
 }
 
 export function InterviewSession({
@@ -260,6 +260,7 @@ export function InterviewSession({
     const {
         isConnected,
         messages: geminiMessages,
+        sessionId,
         connect,
         disconnect,
         setMicMuted,
@@ -278,6 +279,7 @@ export function InterviewSession({
             role: (msg.role === "model" ? "interviewer" : "user") as "user" | "interviewer",
             content: msg.text || "",
             timestamp: msg.timestamp,
+            endTimestamp: msg.endTimestamp,
         }))
         .filter((m) => m.content);
 
@@ -306,11 +308,11 @@ export function InterviewSession({
     const handleEndCall = useCallback(() => {
         disconnect();
         if (messages.length > 0) {
-            onAnalyze(messages);
+            onAnalyze(messages, sessionId);
         } else {
             onEnd();
         }
-    }, [disconnect, onEnd, onAnalyze, messages]);
+    }, [disconnect, onEnd, onAnalyze, messages, sessionId]);
 
     const parsedResume = parseResumeText(interviewData.resumeText);
 
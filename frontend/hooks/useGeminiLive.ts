@@ -5,6 +5,8 @@ export type GeminiTurn = {
   role: "user" | "model" | "system";
   text?: string;
   timestamp: number;
+  // When the last transcript chunk of the turn arrived (≈ end of speech)
+  endTimestamp?: number;
   turnComplete?: boolean;
 };
 
@@ -39,9 +41,44 @@ CRITICAL RULES — DO NOT VIOLATE:
 6. Your assessment must be based SOLELY on what was actually spoken, never on what could theoretically be inferred from their resume.
 `.trim();
 
+// ==================== INCREMENTAL GRADING ====================
+// Question/answer pairs that a later interviewer turn has closed, built exactly like the
+// backend's question_answer_pairs (fragments stripped and joined with one space), so the
+// grades posted during the interview are found again when the report is requested.
+export function closedQuestionAnswerPairs(
+  turns: GeminiTurn[],
+): { question: string; answer: string }[] {
+  const pairs: { question: string; answer: string }[] = [];
+  let question: string[] = [];
+  let answer: string[] = [];
+  for (const turn of turns) {
+    if (!turn.text) continue;
+    if (turn.role === "model") {
+      if (answer.length) {
+        pairs.push({ question: question.join(" "), answer: answer.join(" ") });
+        question = [];
+        answer = [];
+      }
+      question.push(turn.text.trim());
+    } else if (question.length) {
+      answer.push(turn.text.trim());
+    }
+  }
+  return pairs;
+}
+
+const newSessionId = () =>
+  typeof crypto !== "undefined" && crypto.randomUUID
+    ? `live-${crypto.randomUUID()}`
+    : `live-${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
 export function useGeminiLive() {
   const [isConnected, setIsConnected] = useState(false);
   const [messages, setMessages] = useState<GeminiTurn[]>([]);
+  // Id the backend grades this interview's answers under; sent with /analyze-interview
+  const [sessionId, setSessionId] = useState<string | null>(null);
+  const gradingRoleRef = useRef("Software Engineer");
+  const postedPairsRef = useRef(0);
   const socketRef = useRef<WebSocket | null>(null);
   const audioContextRef = useRef<AudioContext | null>(null);
   const workletNodeRef = useRef<AudioWorkletNode | null>(null);
@@ -188,6 +225,21 @@ export function useGeminiLive() {
       document.removeEventListener("visibilitychange", handleVisibilityChange);
   }, []);
 
+  // Grade each answered question in the background as soon as the next question starts,
+  // so the final report only needs the short aggregation step
+  useEffect(() => {
+    if (!sessionId) return;
+    const pairs = closedQuestionAnswerPairs(messages);
+    for (const pair of pairs.slice(postedPairsRef.current)) {
+      fetch(`${API_BASE_URL}/interview-sessions/${sessionId}/turns`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ ...pair, role: gradingRoleRef.current }),
+      }).catch((e) => console.warn("Incremental grading unavailable:", e));
+    }
+    postedPairsRef.current = Math.max(postedPairsRef.current, pairs.length);
+  }, [messages, sessionId]);
+
   const startAudioInput = useCallback(
     async (ws: WebSocket) => {
       if (audioContextRef.current?.state === "closed") {
@@ -322,6 +374,10 @@ export function useGeminiLive() {
       webcamRef?: React.RefObject<HTMLVideoElement | null>;
     }) => {
       disconnect();
+      setMessages([]);
+      gradingRoleRef.current = role;
+      postedPairsRef.current = 0;
+      setSessionId(newSessionId());
 
       try {
         const authRes = await fetch(`${API_BASE_URL}/auth/token`);
@@ -533,6 +589,7 @@ BEGIN: Introduce yourself and ask your first question now. Do NOT wait for the c
                     {
                       ...lastMsg,
                       text: (lastMsg.text || "") + " " + outputTranscript,
+                      endTimestamp: Date.now(),
                     },
                   ];
                 }
@@ -542,6 +599,7 @@ BEGIN: Introduce yourself and ask your first question now. Do NOT wait for the c
                     role: "model",
                     text: outputTranscript,
                     timestamp: Date.now(),
+                    endTimestamp: Date.now(),
                   },
                 ];
               });
@@ -565,6 +623,7 @@ BEGIN: Introduce yourself and ask your first question now. Do NOT wait for the c
                     {
                       ...lastMsg,
                       text: (lastMsg.text || "") + " " + inputTranscript,
+                      endTimestamp: Date.now(),
                     },
                   ];
                 }
@@ -574,6 +633,7 @@ BEGIN: Introduce yourself and ask your first question now. Do NOT wait for the c
                     role: "user",
                     text: inputTranscript,
                     timestamp: Date.now(),
+                    endTimestamp: Date.now(),
                   },
                 ];
               });
@@ -627,5 +687,5 @@ BEGIN: Introduce yourself and ask your first question now. Do NOT wait for the c
     }
   }, []);
 
-  return { connect, disconnect, isConnected, messages, setMicMuted };
+  return { connect, disconnect, isConnected, messages, sessionId, setMicMuted };
 }
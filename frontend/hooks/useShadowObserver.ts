@@ -8,6 +8,13 @@ export type ShadowFeedback = {
   level: "info" | "warning" | "alert";
 };
 
+export type ShadowControl =
+  | { type: "control"; action: "set_frame_interval"; interval_ms: number }
+  // Sent while the server drains for a deploy: reconnect (to a fresh instance) after the delay
+  | { type: "control"; action: "reconnect"; retry_after_ms: number };
+
+const DEFAULT_FRAME_INTERVAL_MS = 2000;
+
 export function useShadowObserver({
   isConnected,
   videoRef,
@@ -22,6 +29,11 @@ export function useShadowObserver({
   const [feedback, setFeedback] = useState<ShadowFeedback | null>(null);
   const socketRef = useRef<WebSocket | null>(null);
   const lastTranscriptRef = useRef<string>("");
+  // Sampling rate is driven by the server (backs off while everything looks fine)
+  const [frameIntervalMs, setFrameIntervalMs] = useState<number>(
+    DEFAULT_FRAME_INTERVAL_MS,
+  );
+  const [reconnectCount, setReconnectCount] = useState(0);
 
   // Connect to Shadow WebSocket
   useEffect(() => {
@@ -36,6 +48,7 @@ export function useShadowObserver({
     const wsUrl = `${WS_BASE_URL}/ws/shadow?persona=${persona}`;
     const ws = new WebSocket(wsUrl);
     socketRef.current = ws;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
 
     ws.onmessage = (event) => {
       try {
@@ -43,6 +56,18 @@ export function useShadowObserver({
         if (data.type === "feedback") {
           setFeedback(data);
           setTimeout(() => setFeedback(null), 5000);
+        } else if (
+          data.type === "control" &&
+          data.action === "set_frame_interval" &&
+          typeof data.interval_ms === "number"
+        ) {
+          setFrameIntervalMs(data.interval_ms);
+        } else if (data.type === "control" && data.action === "reconnect") {
+          ws.close();
+          reconnectTimer = setTimeout(
+            () => setReconnectCount((n) => n + 1),
+            typeof data.retry_after_ms === "number" ? data.retry_after_ms : 1000,
+          );
         }
       } catch (e) {
         // Ignore parse errors
@@ -50,9 +75,10 @@ export function useShadowObserver({
     };
 
     return () => {
+      clearTimeout(reconnectTimer);
       ws.close();
     };
-  }, [isConnected]);
+  }, [isConnected, reconnectCount]);
 
   // Monitor Transcript Pacing
   useEffect(() => {
@@ -72,7 +98,7 @@ export function useShadowObserver({
     }
   }, [latestTranscript, isConnected]);
 
-  // Monitor Visuals (Eye Contact) — every 2 seconds
+  // Monitor Visuals (Eye Contact) — at the server-controlled interval
   useEffect(() => {
     if (!isConnected || !videoRef.current) return;
 
@@ -90,10 +116,10 @@ export function useShadowObserver({
         const base64 = canvas.toDataURL("image/jpeg", 0.5).split(",")[1];
         socketRef.current.send(JSON.stringify({ type: "frame", data: base64 }));
       }
-    }, 2000);
+    }, frameIntervalMs);
 
     return () => clearInterval(interval);
-  }, [isConnected, videoRef]);
+  }, [isConnected, videoRef, frameIntervalMs]);
 
   return { feedback };
 }
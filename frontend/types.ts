@@ -18,6 +18,7 @@ export type ChatMessage = {
   role: "user" | "interviewer";
   content: string;
   timestamp?: number;
+  endTimestamp?: number;
 };
 
 // ==================== ANALYSIS REPORT TYPES ====================
@@ -28,6 +29,8 @@ export type SpeechAnalysis = {
   stammering_frequency: string;
   filled_pauses_count: number;
   long_pauses_count: number;
+  words_per_minute?: number | null;
+  avg_answer_latency_s?: number | null;
 };
 
 export type ContentAnalysis = {